@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks :func:`pybel_tools.mutation.expand_internal` against the original implementation, which checks every
+ordered pair of the subgraph's nodes, on random universes and query-sized subgraphs.
+
+Run with :code:`python3 scripts/benchmark_expand_internal.py`
+"""
+
+import itertools as itt
+import random
+import time
+from collections import defaultdict
+
+import click
+
+from pybel import BELGraph
+from pybel.constants import RELATION, EVIDENCE, INCREASES, DECREASES, ASSOCIATION
+from pybel_tools.mutation import expand_internal
+
+RELATIONS = [INCREASES, DECREASES, ASSOCIATION]
+
+
+def expand_internal_all_pairs(universe, graph):
+    """The original implementation of :func:`expand_internal`"""
+    for u, v in itt.product(graph.nodes(), repeat=2):
+        if graph.has_edge(u, v) or not universe.has_edge(u, v):
+            continue
+
+        rs = defaultdict(list)
+        for k, d in universe.edge[u][v].items():
+            rs[d[RELATION]].append(d)
+
+        if 1 == len(rs):
+            for d in rs[list(rs)[0]]:
+                graph.add_edge(u, v, attr_dict=d)
+
+
+def make_universe(number_nodes, average_degree, seed):
+    """Builds a random universe
+
+    :param int number_nodes: The number of nodes
+    :param int average_degree: The average number of out-edges of each node
+    :param int seed: The random seed
+    :rtype: pybel.BELGraph
+    """
+    r = random.Random(seed)
+    universe = BELGraph()
+    universe.add_nodes_from(range(number_nodes))
+
+    for _ in range(number_nodes * average_degree):
+        u, v = r.randrange(number_nodes), r.randrange(number_nodes)
+        universe.add_edge(u, v, **{RELATION: r.choice(RELATIONS), EVIDENCE: str(r.random())})
+
+    return universe
+
+
+def make_query(universe, number_nodes, seed):
+    """Makes an edgeless subgraph of random nodes from the universe, like a seeded query result
+
+    :rtype: pybel.BELGraph
+    """
+    graph = BELGraph()
+    graph.add_nodes_from(random.Random(seed).sample(universe.nodes(), number_nodes))
+    return graph
+
+
+def time_expand(function, universe, graph):
+    graph = graph.copy()
+    t = time.time()
+    function(universe, graph)
+    return time.time() - t, graph
+
+
+@click.command()
+@click.option('--universe-nodes', type=int, default=20000, help='Number of nodes in the universe')
+@click.option('--degree', type=int, default=5, help='Average out-degree in the universe')
+@click.option('--seed', type=int, default=0)
+def main(universe_nodes, degree, seed):
+    """Compares the adjacency-driven expand_internal with the all-pairs implementation"""
+    universe = make_universe(universe_nodes, degree, seed)
+
+    click.echo('nodes\tedges added\tall pairs\tadjacency\tspeedup\tsame')
+    for number_nodes in (100, 250, 500, 1000, 2000):
+        graph = make_query(universe, number_nodes, seed)
+
+        all_pairs_time, expected = time_expand(expand_internal_all_pairs, universe, graph)
+        adjacency_time, result = time_expand(expand_internal, universe, graph)
+
+        click.echo('{}\t{}\t{:.3f}\t{:.3f}\t{:.1f}x\t{}'.format(
+            number_nodes,
+            result.number_of_edges(),
+            all_pairs_time,
+            adjacency_time,
+            all_pairs_time / max(adjacency_time, 1e-9),
+            sorted(expected.edges(data=True)) == sorted(result.edges(data=True)),
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks the sweeping and incremental modes of :class:`pybel_tools.analysis.npa.NpaRunner` and the compiled
+:class:`pybel_tools.analysis.npa.NpaEngine` on random candidate mechanisms, from trees to mechanisms with a few cycles
+through each node.
+
+Incremental mode only pays off on mechanisms with many cycles. Sweeping scans the whole graph each time it scores a
+round of leaves or removes an edge to break a cycle, so its cost grows with the number of cycles. A tree is scored in a
+few rounds, so sweeping it is as fast or faster than keeping the counts and heap of incremental mode up to date. With
+400 nodes and the default 20 runs, sweeping took 0.37 s and incremental mode 0.50 s on a tree, but 1.65 s and 0.54 s
+with one extra edge per node. The engine was the fastest in every case.
+
+Run with :code:`python3 scripts/benchmark_npa.py`
+"""
+
+import random
+import time
+
+import click
+
+from pybel import BELGraph
+from pybel.constants import PROTEIN, BIOPROCESS, RELATION, INCREASES, DECREASES
+from pybel_tools.analysis.npa import NpaRunner, NpaEngine
+
+KEY = 'weight'
+
+
+def make_mechanism(number_nodes, number_cycle_edges, seed):
+    """Builds a random mechanism where every node is upstream of the target, with extra edges making cycles
+
+    :param int number_nodes: The number of nodes
+    :param int number_cycle_edges: The number of random edges added on top of the tree
+    :param int seed: The random seed
+    :return: A BEL graph and its target node
+    :rtype: tuple[pybel.BELGraph,tuple]
+    """
+    r = random.Random(seed)
+    graph = BELGraph()
+
+    target = BIOPROCESS, 'GOBP', 'target'
+    graph.add_simple_node(*target)
+
+    nodes = [target]
+    for i in range(1, number_nodes):
+        node = PROTEIN, 'HGNC', str(i)
+        graph.add_simple_node(*node)
+        graph.node[node][KEY] = r.uniform(-1, 1)
+        graph.add_edge(node, nodes[r.randrange(i)], **{RELATION: r.choice([INCREASES, DECREASES])})
+        nodes.append(node)
+
+    for _ in range(number_cycle_edges):
+        u, v = r.sample(nodes[1:], 2)
+        graph.add_edge(u, v, **{RELATION: r.choice([INCREASES, DECREASES])})
+
+    return graph, target
+
+
+def time_runner(graph, target, runs, seed, incremental):
+    random.seed(seed)
+    scores = []
+    t = time.time()
+    for _ in range(runs):
+        runner = NpaRunner(graph, target, KEY, incremental=incremental)
+        try:
+            runner.run()
+            scores.append(runner.get_final_score())
+        except (ValueError, ZeroDivisionError):
+            scores.append(None)
+    return time.time() - t, scores
+
+
+def time_engine(graph, target, runs, seed):
+    random.seed(seed)
+    scores = []
+    t = time.time()
+    engine = NpaEngine(graph, target, KEY)
+    for _ in range(runs):
+        try:
+            scores.append(engine.run())
+        except ValueError:
+            scores.append(None)
+    return time.time() - t, scores
+
+
+def time_mechanism(graph, target, runs, seed):
+    """Times all modes on a mechanism and prints a row of the results"""
+    sweep_time, sweep_scores = time_runner(graph, target, runs, seed, incremental=False)
+    incremental_time, incremental_scores = time_runner(graph, target, runs, seed, incremental=True)
+    engine_time, engine_scores = time_engine(graph, target, runs, seed)
+
+    click.echo('{}\t{}\t{:.3f}\t{:.3f}\t{:.3f}\t{}'.format(
+        graph.number_of_nodes(),
+        graph.number_of_edges(),
+        sweep_time,
+        incremental_time,
+        engine_time,
+        sweep_scores == incremental_scores == engine_scores,
+    ))
+
+
+@click.command()
+@click.option('--runs', type=int, default=20, help='Number of NPA runs per mechanism')
+@click.option('--seed', type=int, default=0)
+def main(runs, seed):
+    """Compares the modes of NpaRunner with NpaEngine"""
+    click.echo('nodes\tedges\tsweep\tincremental\tengine\tsame')
+    for number_nodes in (100, 200, 400, 800):
+        for cycle_edges_per_node in (0, 0.25, 1, 2):
+            graph, target = make_mechanism(number_nodes, int(number_nodes * cycle_edges_per_node), seed)
+            time_mechanism(graph, target, runs, seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks :func:`pybel_tools.selection.get_nodes_in_all_shortest_paths` against the original implementation,
+which calls :func:`networkx.all_shortest_paths` for every ordered pair of seed nodes, on random graphs.
+
+Run with :code:`python3 scripts/benchmark_shortest_paths.py`
+"""
+
+import itertools as itt
+import random
+import time
+
+import click
+import networkx as nx
+
+from pybel import BELGraph
+from pybel.constants import RELATION, INCREASES
+from pybel_tools.selection import get_nodes_in_all_shortest_paths
+
+
+def get_nodes_in_all_shortest_paths_by_pairs(graph, nodes):
+    """The original implementation, skipping the pairs without a path instead of failing"""
+    result = set()
+
+    for u, v in itt.product(nodes, repeat=2):
+        try:
+            for path in nx.all_shortest_paths(graph, u, v):
+                result.update(path)
+        except nx.NetworkXNoPath:
+            continue
+
+    return result
+
+
+def make_graph(number_nodes, average_degree, seed):
+    """Builds a random graph
+
+    :param int number_nodes: The number of nodes
+    :param int average_degree: The average number of out-edges of each node
+    :param int seed: The random seed
+    :rtype: pybel.BELGraph
+    """
+    r = random.Random(seed)
+    graph = BELGraph()
+    graph.add_nodes_from(range(number_nodes))
+
+    for _ in range(number_nodes * average_degree):
+        graph.add_edge(r.randrange(number_nodes), r.randrange(number_nodes), **{RELATION: INCREASES})
+
+    return graph
+
+
+@click.command()
+@click.option('--nodes', 'number_nodes', type=int, default=20000, help='Number of nodes in the graph')
+@click.option('--degree', type=int, default=3, help='Average out-degree in the graph')
+@click.option('--seed', type=int, default=0)
+@click.option('--n-jobs', type=int, help='Number of worker processes for the multi-source search')
+def main(number_nodes, degree, seed, n_jobs):
+    """Compares the multi-source search with the pairwise searches"""
+    graph = make_graph(number_nodes, degree, seed)
+
+    click.echo('seeds\tnodes found\tpairwise\tmulti-source\tspeedup\tsame')
+    for number_seeds in (5, 10, 20, 40):
+        seeds = random.Random(seed).sample(graph.nodes(), number_seeds)
+
+        t = time.time()
+        expected = get_nodes_in_all_shortest_paths_by_pairs(graph, seeds)
+        pairwise_time = time.time() - t
+
+        t = time.time()
+        result = get_nodes_in_all_shortest_paths(graph, seeds, n_jobs=n_jobs)
+        multi_source_time = time.time() - t
+
+        click.echo('{}\t{}\t{:.3f}\t{:.3f}\t{:.1f}x\t{}'.format(
+            number_seeds,
+            len(result),
+            pairwise_time,
+            multi_source_time,
+            pairwise_time / max(multi_source_time, 1e-9),
+            expected == result,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,13 @@
 
 """This submodule contains functions for applying algorithms to BEL graphs"""
 
+from . import mechanism_cache
 from . import mechanisms
 from . import npa
 from . import stability
+from .mechanism_cache import *
 from .mechanisms import *
 from .npa import *
 from .stability import *
 
-__all__ = npa.__all__ + stability.__all__ + mechanisms.__all__
+__all__ = npa.__all__ + stability.__all__ + mechanisms.__all__ + mechanism_cache.__all__
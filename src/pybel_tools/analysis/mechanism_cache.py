@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains an on-disk cache for candidate mechanisms, so networks don't have to be preprocessed again
+every time new data is analyzed on them.
+
+Entries are keyed by the network's identifier and a hash of its serialized content and the preprocessing pipeline.
+The cached mechanisms shouldn't contain any experimental data, which should be overlaid after they're loaded.
+"""
+
+import hashlib
+import logging
+
+from ..disk_cache import DiskCache
+
+__all__ = [
+    'MechanismCache',
+]
+
+log = logging.getLogger(__name__)
+
+#: Bump when the pickled format of the entries changes
+CACHE_FORMAT_VERSION = '1'
+
+EXTENSION = '.mechanisms.pickle'
+
+
+class MechanismCache(DiskCache):
+    """Stores pickled dictionaries of {target node: candidate mechanism} in a directory, with one file per network
+    named by the network's identifier and a content hash. The least recently used files are evicted when the
+    directory gets bigger than the maximum size.
+    """
+
+    def __init__(self, directory, max_size=None):
+        """
+        :param str directory: The directory in which the mechanisms are stored. Is created if it doesn't exist.
+        :param max_size: The maximum size of the cache in bytes. Defaults to 1 GB.
+        :type max_size: int
+        """
+        super(MechanismCache, self).__init__(directory, EXTENSION, max_size=max_size)
+
+    @staticmethod
+    def get_digest(blob, pipeline=None):
+        """Hashes the serialized network and the description of the preprocessing pipeline
+
+        :param bytes blob: The serialized network
+        :param str pipeline: A description of the preprocessing applied to the network before generating the
+                             mechanisms. Change it whenever the preprocessing changes.
+        :rtype: str
+        """
+        h = hashlib.sha1()
+        h.update(CACHE_FORMAT_VERSION.encode('utf-8'))
+        h.update((pipeline or '').encode('utf-8'))
+        h.update(blob)
+        return h.hexdigest()
+
+    def _get_path(self, network_id, digest):
+        return self.get_path('{}-{}'.format(network_id, digest))
+
+    def get(self, network_id, blob, pipeline=None):
+        """Gets the cached mechanisms for the given network
+
+        :param int network_id: The network's database identifier
+        :param bytes blob: The serialized network
+        :param str pipeline: A description of the preprocessing pipeline
+        :return: A dictionary of {tuple node: pybel.BELGraph candidate mechanism} or None if not cached
+        :rtype: Optional[dict[tuple,pybel.BELGraph]]
+        """
+        path = self._get_path(network_id, self.get_digest(blob, pipeline=pipeline))
+
+        mechanisms = self.load(path)
+
+        if mechanisms is None:
+            return
+
+        log.info('loaded cached mechanisms for network %s', network_id)
+        return mechanisms
+
+    def set(self, network_id, blob, mechanisms, pipeline=None):
+        """Stores the mechanisms for the given network, invalidates the entries for older versions of the network,
+        then evicts the least recently used entries if the cache is too big
+
+        :param int network_id: The network's database identifier
+        :param bytes blob: The serialized network
+        :param dict[tuple,pybel.BELGraph] mechanisms: A dictionary of {tuple node: candidate mechanism}
+        :param str pipeline: A description of the preprocessing pipeline
+        """
+        self.invalidate(network_id)
+
+        path = self._get_path(network_id, self.get_digest(blob, pipeline=pipeline))
+
+        self.dump(path, mechanisms)
+
+        log.info('cached mechanisms for network %s', network_id)
+
+    def get_or_build(self, network_id, blob, build, pipeline=None):
+        """Gets the cached mechanisms for the given network, or builds and caches them
+
+        :param int network_id: The network's database identifier
+        :param bytes blob: The serialized network
+        :param build: A function that takes no arguments and returns the mechanisms
+        :type build: types.FunctionType
+        :param str pipeline: A description of the preprocessing pipeline
+        :rtype: dict[tuple,pybel.BELGraph]
+        """
+        mechanisms = self.get(network_id, blob, pipeline=pipeline)
+
+        if mechanisms is None:
+            mechanisms = build()
+            self.set(network_id, blob, mechanisms, pipeline=pipeline)
+
+        return mechanisms
+
+    def invalidate(self, network_id):
+        """Removes all entries for the given network, like when it's dropped or re-uploaded
+
+        :param int network_id: The network's database identifier
+        """
+        self.clear(prefix='{}-'.format(network_id))
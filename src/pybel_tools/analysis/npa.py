@@ -4,8 +4,13 @@
 
 from __future__ import print_function
 
+import hashlib
+import heapq
+import itertools as itt
 import logging
+import multiprocessing
 import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from operator import itemgetter
 
 import numpy as np
@@ -17,11 +22,15 @@ from ..generation import generate_mechanism
 
 __all__ = [
     'NpaRunner',
+    'NpaEngine',
     'multirun',
     'workflow_average',
     'workflow',
+    'workflow_scores',
     'workflow_all',
     'workflow_all_average',
+    'iter_engine_scores',
+    'get_run_seed',
 ]
 
 log = logging.getLogger(__name__)
@@ -34,9 +43,15 @@ DEFAULT_SCORE = 0
 
 
 class NpaRunner:
-    """The NpaRunner class houses the data related to a single run of the NPA analysis"""
+    """The NpaRunner class houses the data related to a single run of the NPA analysis
 
-    def __init__(self, graph, target_node, key, tag=None, default_score=None):
+    By default, finding leaves and choosing which edge to remove sweep over the whole graph at every step. In
+    incremental mode, the runner instead keeps a count of the unscored predecessors of each node, the set of current
+    leaves, and a heap of in/out degree ratios, and updates them whenever a node is scored or an edge is removed. Both
+    modes give the same results for the same random state.
+    """
+
+    def __init__(self, graph, target_node, key, tag=None, default_score=None, incremental=False, rng=None):
         """Initializes the NPA runner class
 
         :param graph: A BEL graph
@@ -49,6 +64,11 @@ class NpaRunner:
         :type tag: str
         :param default_score: The initial NPA score for all nodes. This number can go up or down.
         :type default_score: float
+        :param incremental: Should the leaves and in/out degree ratios be tracked incrementally instead of being
+                            recalculated with a full sweep at each step? Defaults to False.
+        :type incremental: bool
+        :param rng: The random number generator used to pick edges to remove. Defaults to the :mod:`random` module.
+        :type rng: random.Random
         """
 
         self.graph = graph.copy()
@@ -63,6 +83,100 @@ class NpaRunner:
                 self.graph.node[node][self.tag] = data.get(key, 0)
                 log.log(5, 'initializing %s with %s', target_node, self.graph.node[node][self.tag])
 
+        self.incremental = incremental
+        self.rng = random if rng is None else rng
+
+        if self.incremental:
+            self._build_frontier()
+
+    def _build_frontier(self):
+        """Builds the data structures for the incremental mode"""
+        #: The position of each node in the graph's node iteration order, used for breaking ties like a sweep would
+        self._node_order = {node: i for i, node in enumerate(self.graph.nodes_iter())}
+
+        #: A dictionary of {node: number of in-edges from unscored nodes}
+        self._unscored_predecessors = {}
+
+        #: The set of unscored nodes whose predecessors are all scored
+        self._leaves = set()
+
+        #: A heap of (in/out ratio, order, node) for the unscored nodes. Outdated entries are skipped lazily
+        self._ratios = []
+
+        #: The set of unscored nodes (besides the target node) without successors, whose ratios can't be calculated
+        self._sinks = set()
+
+        for node in self.graph.nodes_iter():
+            if self._is_scored(node):
+                continue
+
+            count = sum(1 for u, _ in self.graph.in_edges_iter(node) if not self._is_scored(u))
+            self._unscored_predecessors[node] = count
+
+            if not count:
+                self._leaves.add(node)
+
+            self._push_ratio(node)
+
+        heapq.heapify(self._ratios)
+
+    def _is_scored(self, node):
+        return self.tag in self.graph.node[node]
+
+    def _push_ratio(self, node):
+        """Adds the current in/out ratio of an unscored node to the heap, or marks it as a sink"""
+        if node == self.target_node:
+            return
+
+        if not self.graph.out_degree(node):
+            self._sinks.add(node)
+            return
+
+        heapq.heappush(self._ratios, (self.in_out_ratio(node), self._node_order[node], node))
+
+    def _update_scored_leaf(self, leaf):
+        """Updates the incremental data structures after the given leaf has been scored"""
+        self._leaves.discard(leaf)
+        self._sinks.discard(leaf)
+
+        for _, successor in self.graph.out_edges_iter(leaf):
+            self._unscored_predecessors[successor] -= 1
+
+            if not self._unscored_predecessors[successor] and not self._is_scored(successor):
+                self._leaves.add(successor)
+
+    def _update_removed_edge(self, u, v):
+        """Updates the incremental data structures after the edge from u to v has been removed"""
+        if not self._is_scored(u):
+            self._unscored_predecessors[v] -= 1
+
+            if not self._unscored_predecessors[v] and not self._is_scored(v):
+                self._leaves.add(v)
+
+            self._push_ratio(u)
+
+        if u != v:
+            self._push_ratio(v)
+
+    def _get_lowest_ratio_node(self):
+        """Gets the unscored node with the lowest in/out degree ratio from the heap
+
+        :return: A pair of the node and its in/out ratio
+        :rtype: tuple
+        """
+        if self._sinks:
+            raise ZeroDivisionError('{} has no successors'.format(next(iter(self._sinks))))
+
+        while self._ratios:
+            ratio, _, node = self._ratios[0]
+
+            if not self._is_scored(node) and ratio == self.in_out_ratio(node):
+                return node, ratio
+
+            heapq.heappop(self._ratios)
+
+        raise ValueError('no unscored nodes to remove edges from')
+
     def iter_leaves(self):
         """Returns an iterable over all nodes that are leaves. A node is a leaf if either:
 
@@ -72,6 +186,11 @@ class NpaRunner:
         :return: An iterable over all leaf nodes
         :rtype: iter
         """
+        if self.incremental:
+            for node in sorted(self._leaves, key=self._node_order.get):
+                yield node
+            return
+
         for node in self.graph.nodes_iter():
             if self.tag in self.graph.node[node]:
                 continue
@@ -82,7 +201,7 @@ class NpaRunner:
     def has_leaves(self):
         """Returns if the current graph has any leaves.
 
-        Implementation is not that smart currently, and does a full sweep.
+        Does a full sweep unless the runner is in incremental mode.
 
         :return: Does the current graph have any leaves?
         :rtype: bool
@@ -122,14 +241,18 @@ class NpaRunner:
         :return: A random in-edge to the lowest in/out degree ratio node. This is a 3-tuple of (node, node, key)
         :rtype: tuple
         """
-        nodes = [(n, self.in_out_ratio(n)) for n in self.unscored_nodes_iter() if n != self.target_node]
-        node, deg = min(nodes, key=itemgetter(1))
+        if self.incremental:
+            node, deg = self._get_lowest_ratio_node()
+        else:
+            nodes = [(n, self.in_out_ratio(n)) for n in self.unscored_nodes_iter() if n != self.target_node]
+            node, deg = min(nodes, key=itemgetter(1))
+
         log.log(5, 'checking %s (in/out ratio: %.3f)', node, deg)
 
         possible_edges = self.graph.in_edges(node, keys=True)
         log.log(5, 'possible edges: %s', possible_edges)
 
-        edge_to_remove = random.choice(possible_edges)
+        edge_to_remove = self.rng.choice(possible_edges)
         log.log(5, 'chose: %s', edge_to_remove)
 
         return edge_to_remove
@@ -140,6 +263,9 @@ class NpaRunner:
         log.log(5, 'removing %s, %s (%s)', u, v, k)
         self.graph.remove_edge(u, v, k)
 
+        if self.incremental:
+            self._update_removed_edge(u, v)
+
     def remove_random_edge_until_has_leaves(self):
         """Removes random edges until there is at least one leaf node"""
         while True:
@@ -164,6 +290,9 @@ class NpaRunner:
             self.graph.node[leaf][self.tag] = self.calculate_score(leaf)
             log.log(5, 'chomping %s', leaf)
 
+            if self.incremental:
+                self._update_scored_leaf(leaf)
+
         return leaves
 
     def run(self):
@@ -239,7 +368,290 @@ class NpaRunner:
         return self.graph.subgraph(self.unscored_nodes_iter())
 
 
-def multirun(graph, node, key, tag=None, default_score=None, runs=None):
+def get_run_seed(seed, node, run):
+    """Derives the seed of a single NPA run. This doesn't use :func:`hash`, since it is randomized for strings
+    between processes.
+
+    Each run gets its own independent stream of random numbers, so runs can be split over workers in any order, and
+    the result of a run can be memoized by (graph, node, seed, run).
+
+    :param int seed: The seed of the whole analysis
+    :param tuple node: The BEL node that is the focus of the analysis
+    :param int run: The index of the run
+    :rtype: int
+    """
+    key = '{}|{}|{}'.format(seed, node, run).encode('utf-8')
+    return int(hashlib.sha1(key).hexdigest()[:16], 16)
+
+
+def _get_edge_weight(data):
+    """Gets the sign of a causal edge for the NPA score propagation
+
+    :param dict data: An edge data dictionary
+    :return: 1 for increases, -1 for decreases, and 0 otherwise
+    :rtype: int
+    """
+    if data[RELATION] in CAUSAL_INCREASE_RELATIONS:
+        return 1
+
+    if data[RELATION] in CAUSAL_DECREASE_RELATIONS:
+        return -1
+
+    return 0
+
+
+class NpaEngine:
+    """The NpaEngine class compiles a candidate mechanism once into integer-indexed arrays and runs the NPA algorithm
+    on it as many times as needed without ever copying the graph.
+
+    Nodes are numbered in the order of :meth:`networkx.MultiDiGraph.nodes_iter` and edges are numbered in the order of
+    their targets' in-edges, so each node's in-edges form a contiguous block (CSR layout) in :data:`edge_source`. Each
+    run only keeps an edge mask and a score vector, and keeps track of the number of unscored predecessors of each
+    node and a heap of in/out degree ratios, so no step sweeps over the whole mechanism.
+
+    The scoring, tie breaking, and random edge selection are the same as :class:`NpaRunner`, so given the same state
+    of the random number generator, both give the same final score.
+    """
+
+    def __init__(self, graph, target_node, key, default_score=None):
+        """Compiles the given candidate mechanism
+
+        :param graph: A BEL graph
+        :type graph: pybel.BELGraph
+        :param target_node: The BEL node that is the focus of this analysis
+        :type target_node: tuple
+        :param key: The key for the nodes' data dictionaries that points to their original experimental measurements
+        :type key: str
+        :param default_score: The initial NPA score for all nodes. This number can go up or down.
+        :type default_score: float
+        """
+        self.target_node = target_node
+        self.key = key
+        self.default_score = DEFAULT_SCORE if default_score is None else default_score
+
+        #: The list of nodes. The position of a node in this list is its identifier in the arrays
+        self.nodes = graph.nodes()
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.target = self.node_index[target_node]
+
+        sources, targets, weights = [], [], []
+        for v, node in enumerate(self.nodes):
+            for u, _, data in graph.in_edges_iter(node, data=True):
+                sources.append(self.node_index[u])
+                targets.append(v)
+                weights.append(_get_edge_weight(data))
+
+        number_nodes = len(self.nodes)
+
+        #: The source node of each edge
+        self.edge_source = np.array(sources, dtype=np.int64)
+        #: The target node of each edge. Sorted, since edges are numbered by their targets
+        self.edge_target = np.array(targets, dtype=np.int64)
+        #: The sign of each edge (1 for increases, -1 for decreases)
+        self.edge_weight = np.array(weights, dtype=np.int8)
+
+        self.in_degree = np.bincount(self.edge_target, minlength=number_nodes)
+        self.out_degree = np.bincount(self.edge_source, minlength=number_nodes)
+
+        #: The in-edges of node i are the edges in the range [in_indptr[i], in_indptr[i + 1])
+        self.in_indptr = np.zeros(number_nodes + 1, dtype=np.int64)
+        np.cumsum(self.in_degree, out=self.in_indptr[1:])
+
+        #: The out-edges of node i are out_edges[out_indptr[i]:out_indptr[i + 1]]
+        self.out_edges = np.argsort(self.edge_source, kind='mergesort')
+        self.out_indptr = np.zeros(number_nodes + 1, dtype=np.int64)
+        np.cumsum(self.out_degree, out=self.out_indptr[1:])
+
+        #: Nodes without predecessors start scored with their experimental data
+        self.initial_scored = self.in_degree == 0
+        self.initial_scores = np.array([
+            graph.node[node].get(key, 0) if self.initial_scored[i] else 0.0
+            for i, node in enumerate(self.nodes)
+        ], dtype=float)
+
+        self._build_run_lists()
+
+    def _build_run_lists(self):
+        """Builds the plain list copies of the arrays used by :meth:`run`"""
+        # Element-wise access to numpy arrays is slow, so the run loop works on plain lists
+        self._edge_source = self.edge_source.tolist()
+        self._edge_target = self.edge_target.tolist()
+        self._edge_weight = self.edge_weight.tolist()
+        self._in_indptr = self.in_indptr.tolist()
+        self._out_edges = self.out_edges.tolist()
+        self._out_indptr = self.out_indptr.tolist()
+        self._in_degree = self.in_degree.tolist()
+        self._out_degree = self.out_degree.tolist()
+        self._initial_scored = self.initial_scored.tolist()
+        self._initial_scores = self.initial_scores.tolist()
+        self._initial_pending = np.bincount(
+            self.edge_target[~self.initial_scored[self.edge_source]],
+            minlength=len(self.nodes)
+        ).tolist()
+
+    def __getstate__(self):
+        """Only pickles the compiled arrays, so engines are cheap to send to worker processes"""
+        return {k: v for k, v in self.__dict__.items() if not k.startswith('_')}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_run_lists()
+
+    def number_of_nodes(self):
+        """Returns the number of nodes in the compiled mechanism
+
+        :rtype: int
+        """
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        """Returns the number of edges in the compiled mechanism
+
+        :rtype: int
+        """
+        return len(self._edge_source)
+
+    def run(self, rng=None):
+        """Runs the NPA algorithm once and returns the final score of the target node
+
+        :param rng: The random number generator used to pick edges to remove. Defaults to the :mod:`random` module.
+        :type rng: random.Random
+        :return: The final score for the target node
+        :rtype: float
+        :raises ValueError: if the run gets stuck, like when :class:`NpaRunner` would fail because a node without
+                            successors has to be ranked by its in/out degree ratio
+        """
+        edge_source, edge_target, edge_weight = self._edge_source, self._edge_target, self._edge_weight
+        in_indptr, out_edges, out_indptr = self._in_indptr, self._out_edges, self._out_indptr
+        target = self.target
+        choice = random.choice if rng is None else rng.choice
+
+        active = [True] * len(edge_source)
+        scored = list(self._initial_scored)
+        scores = list(self._initial_scores)
+        in_degree = list(self._in_degree)
+        out_degree = list(self._out_degree)
+        pending = list(self._initial_pending)
+
+        ready = [i for i, p in enumerate(pending) if not p and not scored[i]]
+
+        heap = []
+        stuck = 0  # the number of unscored candidate nodes without successors
+        for i, is_scored in enumerate(scored):
+            if is_scored or i == target:
+                continue
+            if out_degree[i]:
+                heap.append((in_degree[i] / float(out_degree[i]), i))
+            else:
+                stuck += 1
+        heapq.heapify(heap)
+
+        while not scored[target]:
+            if ready:
+                node = ready.pop()
+
+                score = self.default_score
+                for e in range(in_indptr[node], in_indptr[node + 1]):
+                    if active[e]:
+                        score += edge_weight[e] * scores[edge_source[e]]
+
+                scores[node] = score
+                scored[node] = True
+
+                if node != target and not out_degree[node]:
+                    stuck -= 1
+
+                for e in out_edges[out_indptr[node]:out_indptr[node + 1]]:
+                    if not active[e]:
+                        continue
+                    v = edge_target[e]
+                    pending[v] -= 1
+                    if not pending[v] and not scored[v]:
+                        ready.append(v)
+
+                continue
+
+            if stuck:
+                raise ValueError('can not rank node without successors')
+
+            # Lazily drop heap entries for scored nodes and outdated ratios
+            while heap:
+                ratio, node = heap[0]
+                if not scored[node] and ratio == in_degree[node] / float(out_degree[node]):
+                    break
+                heapq.heappop(heap)
+            else:
+                raise ValueError('no candidate edges to remove')
+
+            log.log(5, 'checking %s (in/out ratio: %.3f)', self.nodes[node], ratio)
+
+            possible_edges = [e for e in range(in_indptr[node], in_indptr[node + 1]) if active[e]]
+            e = choice(possible_edges)
+            u = edge_source[e]
+
+            active[e] = False
+            in_degree[node] -= 1
+            out_degree[u] -= 1
+
+            if not scored[u]:
+                pending[node] -= 1
+                if not pending[node]:
+                    ready.append(node)
+
+            if not scored[u] and u != target:
+                if out_degree[u]:
+                    heapq.heappush(heap, (in_degree[u] / float(out_degree[u]), u))
+                else:
+                    stuck += 1
+
+            if u != node and out_degree[node]:
+                heapq.heappush(heap, (in_degree[node] / float(out_degree[node]), node))
+
+        return scores[target]
+
+    def multirun(self, runs=None, seed=None):
+        """Runs NPA multiple times and yields the final score after each successful run
+
+        :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
+        :type runs: int
+        :param seed: If given, each run uses its own random number generator seeded with :func:`get_run_seed`, so
+                     the scores only depend on the seed, the target node, and the run index
+        :type seed: int
+        :return: An iterable over the final scores of the target node
+        :rtype: iter[float]
+        """
+        runs = 1000 if runs is None else runs
+
+        for i in range(runs):
+            rng = None if seed is None else random.Random(get_run_seed(seed, self.target_node, i))
+            try:
+                yield self.run(rng=rng)
+            except ValueError:
+                log.debug('Run %s failed for %s', i, self.target_node)
+
+    def multirun_array(self, runs=None, seed=None):
+        """Runs NPA multiple times and collects the final scores of the successful runs in a preallocated array
+
+        :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
+        :type runs: int
+        :param seed: The seed for reproducible runs. See :meth:`multirun`
+        :type seed: int
+        :return: A 1-dimensional array of the final scores
+        :rtype: numpy.ndarray
+        """
+        runs = 1000 if runs is None else runs
+
+        scores = np.empty(runs, dtype=float)
+        n = 0
+
+        for score in self.multirun(runs=runs, seed=seed):
+            scores[n] = score
+            n += 1
+
+        return scores[:n]
+
+
+def multirun(graph, node, key, tag=None, default_score=None, runs=None, seed=None):
     """Runs NPA multiple times and yields the NpaRunner object after each run has been completed
 
     :param graph: A BEL graph
@@ -254,21 +666,25 @@ def multirun(graph, node, key, tag=None, default_score=None, runs=None):
     :type default_score: float
     :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
     :type runs: int
+    :param seed: If given, each run uses its own random number generator seeded with :func:`get_run_seed`, so
+                 the result of a run only depends on the graph, the node, the seed, and the run index
+    :type seed: int
     :return: An iterable over the runners after each iteration
     :rtype: iter
     """
     runs = 1000 if runs is None else runs
 
     for i in range(runs):
+        rng = None if seed is None else random.Random(get_run_seed(seed, node, i))
         try:
-            runner = NpaRunner(graph, node, key, tag=tag, default_score=default_score)
+            runner = NpaRunner(graph, node, key, tag=tag, default_score=default_score, rng=rng)
             runner.run()
             yield runner
         except:
             log.debug('Run %s failed for %s', i, node)
 
 
-def workflow(graph, node, key, tag=None, default_score=None, runs=None):
+def workflow(graph, node, key, tag=None, default_score=None, runs=None, seed=None):
     """Generates candidate mechanism and runs NPA.
 
     :param graph: A BEL graph
@@ -283,6 +699,8 @@ def workflow(graph, node, key, tag=None, default_score=None, runs=None):
     :type default_score: float
     :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
     :type runs: int
+    :param seed: The seed for reproducible runs. See :func:`multirun`
+    :type seed: int
     :return: A list of runners
     :rtype: list
     """
@@ -291,11 +709,114 @@ def workflow(graph, node, key, tag=None, default_score=None, runs=None):
     if sg.number_of_nodes() <= 1:  # Don't even bother trying to get reasonable scores if it's too small
         return []
 
-    runners = multirun(sg, node, key, tag=tag, default_score=default_score, runs=runs)
+    runners = multirun(sg, node, key, tag=tag, default_score=default_score, runs=runs, seed=seed)
     return list(runners)
 
 
-def workflow_average(graph, node, key, tag=None, default_score=None, runs=None):
+def workflow_scores(graph, node, key, default_score=None, runs=None, seed=None):
+    """Generates candidate mechanism and runs NPA with the compiled :class:`NpaEngine`. Unlike :func:`workflow`, only
+    the final scores are kept.
+
+    :param graph: A BEL graph
+    :type graph: pybel.BELGraph
+    :param node: The BEL node that is the focus of this analysis
+    :type node: tuple
+    :param key: The key in the node data dictionary representing the experimental data
+    :type key: str
+    :param default_score: The initial NPA score for all nodes. This number can go up or down.
+    :type default_score: float
+    :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
+    :type runs: int
+    :param seed: The seed for reproducible runs. See :meth:`NpaEngine.multirun`
+    :type seed: int
+    :return: A list of the final scores of the successful runs
+    :rtype: list[float]
+    """
+    engine = _compile_mechanism(graph, node, key, default_score=default_score)
+
+    if engine is None:
+        return []
+
+    return list(engine.multirun(runs=runs, seed=seed))
+
+
+def _compile_mechanism(graph, node, key, default_score=None):
+    """Generates the candidate mechanism of the given node and compiles it
+
+    :return: An NPA engine, or None if the mechanism is too small to bother scoring
+    :rtype: Optional[NpaEngine]
+    """
+    sg = generate_mechanism(graph, node, key)
+
+    if sg.number_of_nodes() <= 1:  # Don't even bother trying to get reasonable scores if it's too small
+        return
+
+    return NpaEngine(sg, node, key, default_score=default_score)
+
+
+def _run_engines(engines, runs, seed):
+    """Runs each engine in a chunk. This is the task sent to the worker processes.
+
+    :param list[NpaEngine] engines: A list of NPA engines
+    :param int runs: The number of times to run the NPA algorithm
+    :param int seed: The seed for reproducible runs
+    :return: A list of pairs of (target node, array of scores)
+    :rtype: list[tuple[tuple,numpy.ndarray]]
+    """
+    return [
+        (engine.target_node, engine.multirun_array(runs=runs, seed=seed))
+        for engine in engines
+    ]
+
+
+def iter_engine_scores(engines, runs=None, seed=None, n_jobs=None, chunksize=None):
+    """Runs NPA on many compiled mechanisms, optionally over a pool of worker processes
+
+    Each engine is sent to the workers only once, in chunks of ``chunksize`` engines, and the results are yielded as
+    soon as each chunk is done, so they don't come in the same order as the given engines. Since the runs are seeded
+    by :func:`get_run_seed`, the scores don't depend on which worker ran them, and are identical to the serial scores
+    with the same seed.
+
+    :param iter[NpaEngine] engines: An iterable of NPA engines
+    :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
+    :type runs: int
+    :param seed: The seed for reproducible runs. If not given and ``n_jobs`` is more than 1, one is drawn from the
+                 :mod:`random` module.
+    :type seed: int
+    :param n_jobs: The number of worker processes. Defaults to 1, which runs everything in this process. Use -1 for
+                   the number of CPUs.
+    :type n_jobs: int
+    :param chunksize: The number of engines sent to a worker at once. Defaults to 1.
+    :type chunksize: int
+    :return: An iterable of pairs of (target node, array of scores)
+    :rtype: iter[tuple[tuple,numpy.ndarray]]
+    """
+    n_jobs = multiprocessing.cpu_count() if n_jobs is not None and n_jobs < 0 else n_jobs
+
+    if n_jobs is None or n_jobs <= 1:
+        for engine in engines:
+            yield engine.target_node, engine.multirun_array(runs=runs, seed=seed)
+        return
+
+    seed = random.getrandbits(32) if seed is None else seed
+    chunksize = 1 if chunksize is None else chunksize
+    engines = iter(engines)
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = []
+
+        while True:
+            chunk = list(itt.islice(engines, chunksize))
+            if not chunk:
+                break
+            futures.append(executor.submit(_run_engines, chunk, runs, seed))
+
+        for future in as_completed(futures):
+            for node, scores in future.result():
+                yield node, scores
+
+
+def workflow_average(graph, node, key, tag=None, default_score=None, runs=None, seed=None):
     """Gets the average NPA score over multiple runs.
 
     This function is very simple, and can be copied to do more interesting statistics over the :class:`NpaRunner`
@@ -313,20 +834,29 @@ def workflow_average(graph, node, key, tag=None, default_score=None, runs=None):
     :type default_score: float
     :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
     :type runs: int
+    :param seed: The seed for reproducible runs. See :func:`multirun`
+    :type seed: int
     :return: The average score for the target node
     :rtype: float
     """
-    runners = workflow(graph, node, key, tag=tag, default_score=default_score, runs=runs)
-    scores = [runner.get_final_score() for runner in runners]
+    sg = generate_mechanism(graph, node, key)
 
-    if not scores:
+    if sg.number_of_nodes() <= 1:
+        log.warning('Unable to run NPA on %s', node)
+        return None
+
+    # Only keep the scores, so each runner's copy of the graph can be freed as soon as its run is done
+    runners = multirun(sg, node, key, tag=tag, default_score=default_score, runs=runs, seed=seed)
+    scores = np.fromiter((runner.get_final_score() for runner in runners), dtype=float)
+
+    if not len(scores):
         log.warning('Unable to run NPA on %s', node)
         return None
 
     return np.average(scores)
 
 
-def workflow_all(graph, key, tag=None, default_score=None, runs=None):
+def workflow_all(graph, key, tag=None, default_score=None, runs=None, seed=None):
     """Runs NPA and get runners for every possible candidate mechanism
 
     1. Get all biological processes
@@ -344,16 +874,20 @@ def workflow_all(graph, key, tag=None, default_score=None, runs=None):
     :type default_score: float
     :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
     :type runs: int
+    :param seed: The seed for reproducible runs. Since the runs' seeds are derived from the seed and each node,
+                 the runs for each node are independent of each other. See :func:`multirun`
+    :type seed: int
     :return: A dictionary of {node: list of runners}
     :rtype: dict
     """
     results = {}
     for node in get_nodes_by_function(graph, BIOPROCESS):
-        results[node] = workflow(graph, node, key, tag=tag, default_score=default_score, runs=runs)
+        results[node] = workflow(graph, node, key, tag=tag, default_score=default_score, runs=runs, seed=seed)
     return results
 
 
-def workflow_all_average(graph, key, tag=None, default_score=None, runs=None):
+def workflow_all_average(graph, key, tag=None, default_score=None, runs=None, seed=None, n_jobs=None,
+                         chunksize=None):
     """Runs NPA to get average score for every possible candidate mechanism
 
     1. Get all biological processes
@@ -365,23 +899,44 @@ def workflow_all_average(graph, key, tag=None, default_score=None, runs=None):
     :type graph: pybel.BELGraph
     :param key: The key in the node data dictionary representing the experimental data
     :type key: str
-    :param tag: The key for the nodes' data dictionaries where the NPA scores will be put. Defaults to 'score'
+    :param tag: Unused, since the scores are calculated with :class:`NpaEngine` and not stored in the graph. Kept for
+                backwards compatibility.
     :type tag: str
     :param default_score: The initial NPA score for all nodes. This number can go up or down.
     :type default_score: float
     :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
     :type runs: int
-    :return: A dictionary of {node: upstream causal subgraph}
+    :param seed: The seed for reproducible runs. See :func:`iter_engine_scores`
+    :type seed: int
+    :param n_jobs: The number of worker processes. See :func:`iter_engine_scores`
+    :type n_jobs: int
+    :param chunksize: The number of mechanisms sent to a worker at once. See :func:`iter_engine_scores`
+    :type chunksize: int
+    :return: A dictionary of {node: average score}
     :rtype: dict
     """
     results = {}
+    engines = []
 
     for node in get_nodes_by_function(graph, BIOPROCESS):
-        sg = generate_mechanism(graph, node, key)
         try:
-            results[node] = workflow_average(sg, node, key, tag=tag, default_score=default_score, runs=runs)
+            engine = _compile_mechanism(graph, node, key, default_score=default_score)
         except:
-            log.exception('could not run on %', node)
+            log.exception('could not run on %s', node)
+            continue
+
+        if engine is None:
+            log.warning('Unable to run NPA on %s', node)
+            results[node] = None
+        else:
+            engines.append(engine)
+
+    for node, scores in iter_engine_scores(engines, runs=runs, seed=seed, n_jobs=n_jobs, chunksize=chunksize):
+        if not len(scores):
+            log.warning('Unable to run NPA on %s', node)
+            results[node] = None
+        else:
+            results[node] = np.average(scores)
 
     return results
 
@@ -396,19 +951,27 @@ RESULT_LABELS = [
 ]
 
 
-def calculate_average_npa_on_subgraphs(candidate_mechanisms, key, tag=None, default_score=None, runs=None):
+def calculate_average_npa_on_subgraphs(candidate_mechanisms, key, tag=None, default_score=None, runs=None, seed=None,
+                                       n_jobs=None, chunksize=None):
     """Calculates the scores over precomputed candidate mechanisms
     
     :param candidate_mechanisms: A dictionary of {tuple node: pybel.BELGraph candidate mechanism}
     :type dict[tuple, pybel.BELGraph]
     :param key: The key in the node data dictionary representing the experimental data
     :type key: str
-    :param tag: The key for the nodes' data dictionaries where the NPA scores will be put. Defaults to 'score'
+    :param tag: Unused, since the scores are calculated with :class:`NpaEngine` and not stored in the graph. Kept for
+                backwards compatibility.
     :type tag: str
     :param default_score: The initial NPA score for all nodes. This number can go up or down.
     :type default_score: float
     :param runs: The number of times to run the NPA algorithm. Defaults to 1000.
-    :type runs: int 
+    :type runs: int
+    :param seed: The seed for reproducible runs. See :func:`iter_engine_scores`
+    :type seed: int
+    :param n_jobs: The number of worker processes. See :func:`iter_engine_scores`
+    :type n_jobs: int
+    :param chunksize: The number of mechanisms sent to a worker at once. See :func:`iter_engine_scores`
+    :type chunksize: int
     :return: A dictionary of {pybel node tuple: results tuple}
     :rtype: dict[tuple, tuple]
     
@@ -425,14 +988,29 @@ def calculate_average_npa_on_subgraphs(candidate_mechanisms, key, tag=None, defa
     >>> pd.DataFrame.from_items(scores.items(), orient='index', columns=RESULT_LABELS)
     """
     results = {}
+    sizes = {}
+    engines = []
+    too_small = []
 
     for node, subgraph in candidate_mechanisms.items():
         number_first_neighbors = subgraph.in_degree(node)
         number_first_neighbors = 0 if isinstance(number_first_neighbors, dict) else number_first_neighbors
-        mechanism_size = subgraph.number_of_nodes()
+        sizes[node] = number_first_neighbors, subgraph.number_of_nodes()
 
-        runners = workflow(subgraph, node, key, tag=tag, default_score=default_score, runs=runs)
-        scores = [runner.get_final_score() for runner in runners]
+        engine = _compile_mechanism(subgraph, node, key, default_score=default_score)
+
+        if engine is None:
+            too_small.append((node, np.empty(0)))
+        else:
+            engines.append(engine)
+
+    node_scores = itt.chain(
+        too_small,
+        iter_engine_scores(engines, runs=runs, seed=seed, n_jobs=n_jobs, chunksize=chunksize)
+    )
+
+    for node, scores in node_scores:
+        number_first_neighbors, mechanism_size = sizes[node]
 
         if 0 == len(scores):
             results[node] = tuple([
@@ -445,8 +1023,6 @@ def calculate_average_npa_on_subgraphs(candidate_mechanisms, key, tag=None, defa
             ])
             continue
 
-        scores = np.array(scores)
-
         average_score = np.average(scores)
         score_std = np.std(scores)
         med_score = np.median(scores)
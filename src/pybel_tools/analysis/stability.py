@@ -3,10 +3,11 @@
 import itertools as itt
 import logging
 
+import numpy as np
 from networkx import DiGraph, Graph
 
 from pybel.constants import *
-from ..selection import get_causal_subgraph
+from ..selection.motifs import iter_3_cycle_indices, iter_3_cycles, iter_triangle_indices, iter_triangles
 
 __all__ = [
     'get_regulatory_pairs',
@@ -21,7 +22,9 @@ __all__ = [
     'get_increase_mismatch_triplets',
     'get_decrease_mismatch_triplets',
     'get_chaotic_triplets',
-    'get_dampened_triplets'
+    'get_dampened_triplets',
+    'CausalMotifScanner',
+    'get_stability_motifs',
 ]
 
 log = logging.getLogger(__name__)
@@ -35,18 +38,7 @@ def get_regulatory_pairs(graph):
     :return: A set of pairs of nodes with mutual causal edges
     :rtype: set
     """
-    cg = get_causal_subgraph(graph)
-
-    results = set()
-
-    for u, v, d in cg.edges_iter(data=True):
-        if d[RELATION] not in CAUSAL_INCREASE_RELATIONS:
-            continue
-
-        if cg.has_edge(v, u) and any(dd[RELATION] in CAUSAL_DECREASE_RELATIONS for dd in cg.edge[v][u].values()):
-            results.add((u, v))
-
-    return results
+    return CausalMotifScanner(graph).get_regulatory_pairs()
 
 
 def get_chaotic_pairs(graph):
@@ -57,18 +49,7 @@ def get_chaotic_pairs(graph):
     :return: A set of pairs of nodes with mutual causal edges
     :rtype: set
     """
-    cg = get_causal_subgraph(graph)
-
-    results = set()
-
-    for u, v, d in cg.edges_iter(data=True):
-        if d[RELATION] not in CAUSAL_INCREASE_RELATIONS:
-            continue
-
-        if cg.has_edge(v, u) and any(dd[RELATION] in CAUSAL_INCREASE_RELATIONS for dd in cg.edge[v][u].values()):
-            results.add(tuple(sorted([u, v], key=str)))
-
-    return results
+    return CausalMotifScanner(graph).get_chaotic_pairs()
 
 
 def get_dampened_pairs(graph):
@@ -79,18 +60,7 @@ def get_dampened_pairs(graph):
     :return: A set of pairs of nodes with mutual causal edges
     :rtype: set
     """
-    cg = get_causal_subgraph(graph)
-
-    results = set()
-
-    for u, v, d in cg.edges_iter(data=True):
-        if d[RELATION] not in CAUSAL_DECREASE_RELATIONS:
-            continue
-
-        if cg.has_edge(v, u) and any(dd[RELATION] in CAUSAL_DECREASE_RELATIONS for dd in cg.edge[v][u].values()):
-            results.add(tuple(sorted([u, v], key=str)))
-
-    return results
+    return CausalMotifScanner(graph).get_dampened_pairs()
 
 
 def get_correlation_graph(graph):
@@ -123,14 +93,12 @@ def get_correlation_triangles(correlation_graph):
     :param correlation_graph: A correlation graph
     :type correlation_graph: networkx.Graph
     """
-    results = set()
+    sort_keys = _get_sort_keys(correlation_graph)
 
-    for n in correlation_graph.nodes_iter():
-        for u, v in itt.combinations(correlation_graph.edge[n], 2):
-            if correlation_graph.has_edge(u, v):
-                results.add(tuple(sorted([n, u, v], key=str)))
-
-    return results
+    return {
+        tuple(sorted(triangle, key=sort_keys.__getitem__))
+        for triangle in iter_triangles(correlation_graph)
+    }
 
 
 def get_separate_unstable_correlation_triples(graph):
@@ -141,18 +109,7 @@ def get_separate_unstable_correlation_triples(graph):
     :return: An iterator over triples of unstable graphs, where the second two are negative
     :rtype: iter[tuple]
     """
-    cg = get_correlation_graph(graph)
-
-    for a, b, c in get_correlation_triangles(cg):
-        if POSITIVE_CORRELATION in cg.edge[a][b] and POSITIVE_CORRELATION in cg.edge[b][c] and NEGATIVE_CORRELATION in \
-                cg.edge[a][c]:
-            yield b, a, c
-        if POSITIVE_CORRELATION in cg.edge[a][b] and NEGATIVE_CORRELATION in cg.edge[b][c] and POSITIVE_CORRELATION in \
-                cg.edge[a][c]:
-            yield a, b, c
-        if NEGATIVE_CORRELATION in cg.edge[a][b] and POSITIVE_CORRELATION in cg.edge[b][c] and POSITIVE_CORRELATION in \
-                cg.edge[a][c]:
-            yield c, a, b
+    return iter(CausalMotifScanner(graph).get_separate_unstable_correlation_triples())
 
 
 def get_mutually_unstable_correlation_triples(graph):
@@ -163,11 +120,7 @@ def get_mutually_unstable_correlation_triples(graph):
     :return:
     :rtype: iter[tuple]
     """
-    cg = get_correlation_graph(graph)
-
-    for a, b, c in get_correlation_triangles(cg):
-        if all(NEGATIVE_CORRELATION in x for x in (cg.edge[a][b], cg.edge[b][c], cg.edge[a][c])):
-            yield a, b, c
+    return iter(CausalMotifScanner(graph).get_mutually_unstable_correlation_triples())
 
 
 def jens_transformation(graph):
@@ -214,12 +167,12 @@ def find_3_cycles_digraph(graph):
     :param networkx.DiGraph graph: A directional graph
     :rtype: set[tuple]
     """
-    results = set()
-    for a, b in graph.edges_iter():
-        for c in graph.successors(b):
-            if graph.has_edge(c, a):
-                results.add(tuple(sorted([a, b, c], key=str)))
-    return results
+    sort_keys = _get_sort_keys(graph)
+
+    return {
+        tuple(sorted(cycle, key=sort_keys.__getitem__))
+        for cycle in iter_3_cycles(graph)
+    }
 
 
 def get_jens_unstable_alpha(graph):
@@ -230,24 +183,7 @@ def get_jens_unstable_alpha(graph):
     :return: An iterable of triplets of nodes
     :rtype iter[tuple]
     """
-    r = jens_transformation(graph)
-    return find_3_cycles_digraph(r)
-
-
-def _get_mismatch_triplets_helper(graph, relation_set):
-    """Iterates over triples of nodes
-
-    :param pybel.BELGraph graph: 
-    :return: An iterable of mismatch triples
-    :rtype iter[tuple]
-    """
-    for node in graph.nodes_iter():
-        children = {v for _, v, d in graph.out_edges_iter(node, data=True) if d[RELATION] in relation_set}
-        for a, b in itt.combinations(children, 2):
-            if b not in graph.edge[a]:
-                continue
-            if any(d[RELATION] == NEGATIVE_CORRELATION for d in graph.edge[a][b].values()):
-                yield node, a, b
+    return CausalMotifScanner(graph).get_jens_unstable_alpha()
 
 
 def get_increase_mismatch_triplets(graph):
@@ -257,7 +193,7 @@ def get_increase_mismatch_triplets(graph):
     :return: An iterable of triplets of nodes
     :rtype: iter[tuple]
     """
-    return _get_mismatch_triplets_helper(graph, CAUSAL_INCREASE_RELATIONS)
+    return iter(CausalMotifScanner(graph).get_increase_mismatch_triplets())
 
 
 def get_decrease_mismatch_triplets(graph):
@@ -267,23 +203,7 @@ def get_decrease_mismatch_triplets(graph):
     :return: An iterable of triplets of nodes
     :rtype: iter[tuple]
     """
-    return _get_mismatch_triplets_helper(graph, CAUSAL_DECREASE_RELATIONS)
-
-
-def _get_disregulated_triplets_helper(graph, relation_set):
-    """
-    
-    :param pybel.BELGraph graph: A BEL graph 
-    :param set[str] relation_set: A set of relations to keep 
-    :return: 
-    """
-    result = DiGraph()
-    for u, v, d in graph.edges_iter(data=True):
-        if d[RELATION] in relation_set:
-            result.add_edge(u, v)
-    for node in result.nodes_iter():
-        result.node[node].update(graph.node[node])
-    return find_3_cycles_digraph(result)
+    return iter(CausalMotifScanner(graph).get_decrease_mismatch_triplets())
 
 
 def get_chaotic_triplets(graph):
@@ -294,7 +214,7 @@ def get_chaotic_triplets(graph):
     :return: An iterable of triplets of nodes
     :rtype: iter[tuple]
     """
-    return _get_disregulated_triplets_helper(graph, CAUSAL_INCREASE_RELATIONS)
+    return CausalMotifScanner(graph).get_chaotic_triplets()
 
 
 def get_dampened_triplets(graph):
@@ -305,4 +225,270 @@ def get_dampened_triplets(graph):
     :return: An iterable of triplets of nodes
     :rtype: iter[tuple]
     """
-    return _get_disregulated_triplets_helper(graph, CAUSAL_DECREASE_RELATIONS)
+    return CausalMotifScanner(graph).get_dampened_triplets()
+
+
+def _get_sort_keys(nodes):
+    """Gets the position of each node when sorted by its string, so motifs can be sorted like the other stability
+    functions sort them without stringifying their nodes again
+
+    :param iter nodes: An iterable of nodes
+    :rtype: dict
+    """
+    return {node: i for i, node in enumerate(sorted(nodes, key=str))}
+
+
+def _to_edge_arrays(adjacency):
+    """Converts the neighbors of each node to arrays of the sources and targets of the edges
+
+    :param list[set[int]] adjacency: The neighbors of each node
+    :rtype: tuple[numpy.ndarray,numpy.ndarray]
+    """
+    sources = np.repeat(np.arange(len(adjacency), dtype=np.int64), [len(neighbors) for neighbors in adjacency])
+    targets = np.fromiter(itt.chain.from_iterable(adjacency), dtype=np.int64, count=len(sources))
+    return sources, targets
+
+
+def _intersect(a, b):
+    """Intersects two sets by iterating over the smaller one
+
+    :type a: set
+    :type b: set
+    :rtype: set
+    """
+    return a & b if len(a) <= len(b) else b & a
+
+
+class CausalMotifScanner:
+    """Classifies the causal and correlative edges of a graph once into integer adjacency sets, then finds all of the
+    unstable pairs and triplets of the stability module from them without building any intermediate graphs.
+
+    Self-loops don't take part in any of the motifs.
+    """
+
+    def __init__(self, graph):
+        """
+        :param pybel.BELGraph graph: A BEL graph
+        """
+        self.nodes = graph.nodes()
+        index = {node: i for i, node in enumerate(self.nodes)}
+        sort_keys = _get_sort_keys(self.nodes)
+        self._sort_keys = [sort_keys[node] for node in self.nodes]
+
+        number_nodes = len(self.nodes)
+        self.increases = [set() for _ in range(number_nodes)]
+        self.increased_by = [set() for _ in range(number_nodes)]
+        self.decreases = [set() for _ in range(number_nodes)]
+        self.decreased_by = [set() for _ in range(number_nodes)]
+        self.positive = [set() for _ in range(number_nodes)]
+        self.negative = [set() for _ in range(number_nodes)]
+
+        for u, v, d in graph.edges_iter(data=True):
+            if u == v:
+                continue
+
+            relation = d[RELATION]
+            i, j = index[u], index[v]
+
+            if relation in CAUSAL_INCREASE_RELATIONS:
+                self.increases[i].add(j)
+                self.increased_by[j].add(i)
+            elif relation in CAUSAL_DECREASE_RELATIONS:
+                self.decreases[i].add(j)
+                self.decreased_by[j].add(i)
+            elif relation == POSITIVE_CORRELATION:
+                self.positive[i].add(j)
+                self.positive[j].add(i)
+            elif relation == NEGATIVE_CORRELATION:
+                self.negative[i].add(j)
+                self.negative[j].add(i)
+
+    def _sorted_nodes(self, indices):
+        """Converts node indices to a tuple of nodes sorted like the other stability functions sort them
+
+        :rtype: tuple
+        """
+        return tuple(self.nodes[i] for i in sorted(indices, key=self._sort_keys.__getitem__))
+
+    def _iter_mutual_pairs(self, first, second):
+        """Iterates over the pairs of nodes i, j where j is in ``first[i]`` and i is in ``second[j]``"""
+        for i, targets in enumerate(first):
+            for j in targets:
+                if i in second[j]:
+                    yield i, j
+
+    def _get_3_cycles(self, successors):
+        """Finds the sets of nodes forming 3-cycles, with their nodes sorted
+
+        :param list[set[int]] successors: The successors of each node
+        :rtype: set[tuple]
+        """
+        return {
+            self._sorted_nodes(cycle)
+            for cycle in iter_3_cycle_indices(len(self.nodes), *_to_edge_arrays(successors))
+        }
+
+    def get_regulatory_pairs(self):
+        """Finds pairs of nodes (A, B) such that ``A increases B`` and ``B decreases A``
+
+        :rtype: set[tuple]
+        """
+        return {
+            (self.nodes[i], self.nodes[j])
+            for i, j in self._iter_mutual_pairs(self.increases, self.decreases)
+        }
+
+    def get_chaotic_pairs(self):
+        """Finds pairs of nodes that increase each other
+
+        :rtype: set[tuple]
+        """
+        return {
+            self._sorted_nodes((i, j))
+            for i, j in self._iter_mutual_pairs(self.increases, self.increases)
+            if i < j
+        }
+
+    def get_dampened_pairs(self):
+        """Finds pairs of nodes that decrease each other
+
+        :rtype: set[tuple]
+        """
+        return {
+            self._sorted_nodes((i, j))
+            for i, j in self._iter_mutual_pairs(self.decreases, self.decreases)
+            if i < j
+        }
+
+    def _iter_correlation_triangles(self):
+        """Iterates over the triangles of correlations, with their nodes sorted
+
+        :return: An iterable of pairs of (sorted node indices, sorted nodes)
+        :rtype: iter[tuple[tuple[int],tuple]]
+        """
+        correlations = [positive | negative for positive, negative in zip(self.positive, self.negative)]
+
+        for triangle in iter_triangle_indices(len(self.nodes), *_to_edge_arrays(correlations)):
+            a, b, c = sorted(triangle, key=self._sort_keys.__getitem__)
+            yield (a, b, c), (self.nodes[a], self.nodes[b], self.nodes[c])
+
+    def get_separate_unstable_correlation_triples(self):
+        """Finds triples of nodes A, B, C such that ``A pos B``, ``A pos C``, and ``B neg C``
+
+        :rtype: list[tuple]
+        """
+        results = []
+
+        for (a, b, c), (na, nb, nc) in self._iter_correlation_triangles():
+            positive_ab, positive_bc, positive_ac = b in self.positive[a], c in self.positive[b], c in self.positive[a]
+            negative_ab, negative_bc, negative_ac = b in self.negative[a], c in self.negative[b], c in self.negative[a]
+
+            if positive_ab and positive_bc and negative_ac:
+                results.append((nb, na, nc))
+            if positive_ab and negative_bc and positive_ac:
+                results.append((na, nb, nc))
+            if negative_ab and positive_bc and positive_ac:
+                results.append((nc, na, nb))
+
+        return results
+
+    def get_mutually_unstable_correlation_triples(self):
+        """Finds triples of nodes A, B, C such that ``A neg B``, ``B neg C``, and ``C neg A``
+
+        :rtype: list[tuple]
+        """
+        return [
+            nodes
+            for (a, b, c), nodes in self._iter_correlation_triangles()
+            if b in self.negative[a] and c in self.negative[b] and c in self.negative[a]
+        ]
+
+    def get_jens_unstable_alpha(self):
+        """Finds the 3-cycles after Jens' transformation. See :func:`jens_transformation`
+
+        :rtype: set[tuple]
+        """
+        successors = [
+            increases | decreased_by | positive
+            for increases, decreased_by, positive in zip(self.increases, self.decreased_by, self.positive)
+        ]
+
+        return self._get_3_cycles(successors)
+
+    def _get_mismatch_triplets(self, parents):
+        """Finds triples of nodes (A, B, C) where A is in the parents of both B and C and ``B neg C``
+
+        :param list[set[int]] parents: The causal parents of each node
+        :rtype: list[tuple]
+        """
+        results = []
+
+        for b, negative in enumerate(self.negative):
+            for c in negative:
+                if c < b:
+                    continue
+
+                nb, nc = self._sorted_nodes((b, c))
+
+                for a in _intersect(parents[b], parents[c]):
+                    results.append((self.nodes[a], nb, nc))
+
+        return results
+
+    def get_increase_mismatch_triplets(self):
+        """Finds triples of nodes (A, B, C) where ``A increases B``, ``A increases C``, and ``B neg C``
+
+        :rtype: list[tuple]
+        """
+        return self._get_mismatch_triplets(self.increased_by)
+
+    def get_decrease_mismatch_triplets(self):
+        """Finds triples of nodes (A, B, C) where ``A decreases B``, ``A decreases C``, and ``B neg C``
+
+        :rtype: list[tuple]
+        """
+        return self._get_mismatch_triplets(self.decreased_by)
+
+    def get_chaotic_triplets(self):
+        """Finds the 3-cycles of nodes increasing each other
+
+        :rtype: set[tuple]
+        """
+        return self._get_3_cycles(self.increases)
+
+    def get_dampened_triplets(self):
+        """Finds the 3-cycles of nodes decreasing each other
+
+        :rtype: set[tuple]
+        """
+        return self._get_3_cycles(self.decreases)
+
+    def scan(self):
+        """Finds all the unstable pairs and triplets
+
+        :return: A dictionary of {name of the stability function without the get\_ prefix: its results}
+        :rtype: dict[str,iter[tuple]]
+        """
+        return {
+            'regulatory_pairs': self.get_regulatory_pairs(),
+            'chaotic_pairs': self.get_chaotic_pairs(),
+            'dampened_pairs': self.get_dampened_pairs(),
+            'separate_unstable_correlation_triples': self.get_separate_unstable_correlation_triples(),
+            'mutually_unstable_correlation_triples': self.get_mutually_unstable_correlation_triples(),
+            'jens_unstable_alpha': self.get_jens_unstable_alpha(),
+            'increase_mismatch_triplets': self.get_increase_mismatch_triplets(),
+            'decrease_mismatch_triplets': self.get_decrease_mismatch_triplets(),
+            'chaotic_triplets': self.get_chaotic_triplets(),
+            'dampened_triplets': self.get_dampened_triplets(),
+        }
+
+
+def get_stability_motifs(graph):
+    """Finds all the unstable pairs and triplets of a graph while classifying its edges only once. This is faster than
+    calling each of the stability functions.
+
+    :param pybel.BELGraph graph: A BEL graph
+    :return: A dictionary of {name of the stability function without the get\_ prefix: its results}
+    :rtype: dict[str,iter[tuple]]
+    """
+    return CausalMotifScanner(graph).scan()
@@ -5,44 +5,112 @@ This module contains all of the services necessary through the PyBEL API Definit
 """
 
 import logging
+import multiprocessing
+import threading
 import time
-from collections import Counter
-from functools import lru_cache
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import networkx as nx
 from sqlalchemy import func
 
-from pybel import from_bytes, BELGraph
-from pybel.canonicalize import decanonicalize_node, calculate_canonical_name
+from pybel import from_bytes
+from pybel.canonicalize import decanonicalize_node
+from pybel.constants import COMPLEX, FUNCTION, FUSION, NAME, NAMESPACE, VARIANTS
 from pybel.manager.models import Network
+from pybel.utils import get_version as get_pybel_version
 from .constants import CNAME
 from .mutation.expansion import expand_internal
 from .mutation.inference import infer_central_dogma
-from .mutation.merge import left_full_merge
 from .mutation.metadata import parse_authors, add_canonical_names, fix_pubmed_citations
-from .selection.induce_subgraph import get_subgraph
-from .summary.edge_summary import count_diseases, get_tree_annotations
-from .summary.provenance import get_authors, get_pmid_by_keyword, get_authors_by_keyword, get_pubmed_identifiers
-from .utils import calc_betweenness_centality
+from .selection.induce_subgraph import SEED_TYPE_PROVENANCE, get_subgraph, get_subgraph_from_view
+from .selection.paths import get_undirected_adjacency
+from .selection.search import NodeTextIndex
+from .selection.subgraph_view import SubgraphView
+from .query_cache import QueryCache, make_query_key
+from .snapshot import SnapshotError, read_snapshot, write_snapshot
+from .store import MISSING, NetworkStore
+from .summary.edge_summary import count_diseases
+from .summary.graph_summary import summarize_graph
+from .summary.provenance import get_authors, get_pubmed_identifiers
+from .summary.provenance_index import PrefixIndex, ProvenanceIndex
+from .utils import calc_betweenness_centality, get_version
 
 log = logging.getLogger(__name__)
 
 CENTRALITY_SAMPLES = 200
 
+#: The default number of materialized networks kept in memory by the :class:`DatabaseService`
+DEFAULT_GRAPH_CACHE_SIZE = 8
+
+
+def preprocess_network(graph):
+    """Prepares a network for the :class:`DatabaseService` by parsing its authors, inferring the central dogma, and
+    adding canonical names to its nodes
+
+    :param pybel.BELGraph graph: A BEL graph
+    """
+    log.debug('parsing authors')
+    parse_authors(graph)
+
+    log.debug('inferring central dogma')
+    infer_central_dogma(graph)
+
+    log.debug('adding canonical names')
+    add_canonical_names(graph)
+
+
+def _load_network(blob, check_version=True):
+    """Deserializes and preprocesses a network. This is the task run by the worker processes of
+    :meth:`DatabaseService.warm_up`
+
+    :param bytes blob: A pickled BEL graph
+    :param bool check_version: Should the version of the BEL graph be checked?
+    :return: The preprocessed graph and a dictionary of {tuple node: str BEL}
+    :rtype: tuple[pybel.BELGraph,dict[tuple,str]]
+    """
+    graph = from_bytes(blob, check_version=check_version)
+    preprocess_network(graph)
+    node_bel = {node: decanonicalize_node(graph, node) for node in graph.nodes_iter()}
+    return graph, node_bel
+
 
 class DatabaseService:
     """The dictionary service contains functions that implement the PyBEL API with a in-memory backend using 
     dictionaries.
+
+    The networks are kept in a shared :class:`pybel_tools.store.NetworkStore`. They and the universe are only
+    materialized as BEL graphs when requested, and only a few of the most recently used ones are kept.
     """
 
-    def __init__(self, manager):
+    def __init__(self, manager, graph_cache_size=None, query_cache_edges=None, query_cache_ttl=None):
         """
         :param pybel.manager.cache.CacheManager manager: A cache manager
+        :param graph_cache_size: The number of materialized networks to keep in memory. Defaults to 8.
+        :type graph_cache_size: int
+        :param query_cache_edges: The maximum total number of edges in the cached query results. Defaults to one
+                                  million. Set to 0 to disable caching query results.
+        :type query_cache_edges: int
+        :param query_cache_ttl: The number of seconds after which cached query results expire. If none, they don't.
+        :type query_cache_ttl: float
         """
         self.manager = manager
+        self.graph_cache_size = DEFAULT_GRAPH_CACHE_SIZE if graph_cache_size is None else graph_cache_size
 
-        #: dictionary of {int id: BELGraph graph}
-        self.networks = {}
+        #: The results of the most recently used queries. See :meth:`query`
+        self.query_cache = QueryCache(max_edges=query_cache_edges, ttl=query_cache_ttl)
+
+        #: The compact store of all networks' nodes and edges
+        self.store = NetworkStore()
+
+        #: A dictionary of {int id: BELGraph graph} of the most recently used materialized networks
+        self._graphs = OrderedDict()
+
+        #: The materialized universe, if it has been requested since the last network was added
+        self._universe = None
+
+        #: A dictionary of {int network id or None for the universe: AnnotationIndex}, built when first needed
+        self._annotation_indexes = {}
 
         #: dictionary of {tuple node: int id}
         self.node_nid = {}
@@ -54,28 +122,74 @@ class DatabaseService:
         self.bel_id = {}
         self.id_bel = {}
 
-        #: The complete graph of all knowledge stored in the cache
-        self.universe = BELGraph(**{'PYBEL_RELABELED': True})
+        #: The index of the BEL strings and canonical names of the nodes, which is built by :meth:`get_node_index`
+        self._node_index = NodeTextIndex()
 
         self.universe_pmids = set()
         self.universe_authors = set()
 
+        #: Indexes of :data:`universe_pmids` and :data:`universe_authors` for suggesting them as they're typed
+        self.pmid_prefixes = PrefixIndex()
+        self.author_prefixes = PrefixIndex(words=True)
+
+        #: A dictionary of {int network id or None for the universe: ProvenanceIndex}. The edges are identified like
+        #: in the graphs from :meth:`get_network`.
+        self._provenance_indexes = {}
+
         #: A dictionary from {int id: {tuple node: float centrality}}
         self.node_centralities = {}
 
         #: A dictionary from {int id: {tuple node: int degree}}
         self.node_degrees = {}
 
+        #: A dictionary from {int id: dict summary}. See :meth:`get_summary`
+        self.network_summaries = {}
+
+        #: The progress of the last warm-up. See :meth:`warm_up`
+        self.warm_up_status = {'total': 0, 'loaded': 0, 'failed': 0, 'done': True}
+
+        # Guards the indexes and the store, so networks can be added by a warm-up thread while others are served
+        self._lock = threading.RLock()
+
         log.info('initialized dictionary service')
 
     def clear(self):
-        self.__init__(self.manager)
+        self.__init__(
+            self.manager,
+            graph_cache_size=self.graph_cache_size,
+            query_cache_edges=self.query_cache.max_edges,
+            query_cache_ttl=self.query_cache.ttl
+        )
+
+    @property
+    def universe(self):
+        """The complete graph of all knowledge stored in the cache. Is materialized from the store the first time it's
+        used after a network has been added.
 
-    def update_node_indexes(self, graph):
+        :rtype: pybel.BELGraph
+        """
+        with self._lock:
+            if self._universe is None:
+                t = time.time()
+                self._universe = self.store.get_universe()
+                log.info('materialized universe in %.2f seconds', time.time() - t)
+
+            return self._universe
+
+    def _cache_graph(self, network_id, graph):
+        """Keeps a materialized network, and forgets the least recently used ones if there are too many"""
+        self._graphs[network_id] = graph
+        self._graphs.move_to_end(network_id)
+
+        while len(self._graphs) > self.graph_cache_size:
+            self._graphs.popitem(last=False)
+
+    def update_node_indexes(self, graph, node_bel=None):
         """Updates identifiers for nodes based on addition order
 
         :param graph: A BEL Graph
         :type graph: pybel.BELGraph
+        :param dict[tuple,str] node_bel: An optional dictionary of the nodes' precomputed BEL strings
         """
         for node in graph.nodes_iter():
             if isinstance(node, int):
@@ -90,10 +204,13 @@ class DatabaseService:
             self.node_nid[node] = nid
             self.nid_node[nid] = node
 
-            bel = decanonicalize_node(graph, node)
+            bel = node_bel[node] if node_bel is not None else decanonicalize_node(graph, node)
             self.id_bel[nid] = bel
             self.bel_id[bel] = nid
 
+            if self._node_index is not None:
+                self._node_index.add(nid, [bel, graph.node[node].get(CNAME)])
+
     def relabel_nodes_to_identifiers(self, graph):
         """Relabels all nodes by their identifiers, in place. This function is a thin wrapper around
         :func:`networkx.relabel.relabel_nodes` with the module level variable :data:`node_nid` used as the mapping.
@@ -126,15 +243,25 @@ class DatabaseService:
 
         del graph.graph['PYBEL_RELABELED']
 
-    def add_network(self, network_id, graph, force_reload=False, eager=False, maintain_universe=True):
+    def add_network(self, network_id, graph, force_reload=False, eager=False, maintain_universe=True,
+                    preprocessed=False, node_bel=None):
         """Adds a network to the module-level cache from the underlying database
 
         :param int network_id: The identifier for the graph
         :param pybel.BELGraph graph: A BEL Graph
         :param bool force_reload: Should the graphs be reloaded even if it has already been cached?
         :param bool eager: Should data be calculated/loaded eagerly?
+        :param bool maintain_universe: Should the network be included in the universe?
+        :param bool preprocessed: Has :func:`preprocess_network` already been run on the graph?
+        :param dict[tuple,str] node_bel: An optional dictionary of the nodes' precomputed BEL strings
         """
-        if network_id in self.networks and not force_reload:
+        with self._lock:
+            self._add_network(network_id, graph, force_reload=force_reload, eager=eager,
+                              maintain_universe=maintain_universe, preprocessed=preprocessed, node_bel=node_bel)
+
+    def _add_network(self, network_id, graph, force_reload=False, eager=False, maintain_universe=True,
+                     preprocessed=False, node_bel=None):
+        if network_id in self.store and not force_reload:
             log.info('tried re-adding graph [%s] %s', network_id, graph.name)
             return
 
@@ -147,17 +274,11 @@ class DatabaseService:
             graph.version,
         )
 
-        log.debug('parsing authors')
-        parse_authors(graph)
-
-        log.debug('inferring central dogma')
-        infer_central_dogma(graph)
-
-        log.debug('adding canonical names')
-        add_canonical_names(graph)
+        if not preprocessed:
+            preprocess_network(graph)
 
         log.debug('updating node indexes')
-        self.update_node_indexes(graph)
+        self.update_node_indexes(graph, node_bel=node_bel)
 
         log.debug('relabeling nodes by index')
         self.relabel_nodes_to_identifiers(graph)
@@ -166,7 +287,9 @@ class DatabaseService:
         self.node_degrees[network_id] = Counter(graph.degree())
 
         log.debug('caching PubMed identifiers')
-        self.universe_pmids |= get_pubmed_identifiers(graph)
+        pmids = get_pubmed_identifiers(graph)
+        self.universe_pmids |= pmids
+        self.pmid_prefixes.update(pmids)
 
         if eager:
             log.debug('calculating centralities (be patient)')
@@ -181,13 +304,27 @@ class DatabaseService:
             log.debug('done enriching citations in %.2f seconds', time.time() - t)
 
         log.debug('caching authors')
-        self.universe_authors |= get_authors(graph)
+        authors = get_authors(graph)
+        self.universe_authors |= authors
+        self.author_prefixes.update(authors)
+
+        log.debug('adding to the store')
+        self.store.add_network(network_id, graph, in_universe=maintain_universe)
 
         if maintain_universe:
-            log.debug('adding to the universe')
-            left_full_merge(self.universe, graph)
+            self._universe = None
+
+        self.query_cache.invalidate(network_id)
+        self.network_summaries.pop(network_id, None)
+        self._annotation_indexes.pop(network_id, None)
+        self._annotation_indexes.pop(None, None)
 
-        self.networks[network_id] = graph
+        log.debug('indexing provenance')
+        self._provenance_indexes[network_id] = self._build_provenance_index(network_id)
+        self._provenance_indexes.pop(None, None)
+
+        # The graph is materialized again from the store when needed, so its edges are keyed like the store's
+        self._graphs.pop(network_id, None)
 
         log.info(
             'cached (%d nodes, %d edges) in %.2f seconds',
@@ -196,19 +333,69 @@ class DatabaseService:
             time.time() - t
         )
 
-    def cache_networks(self, check_version=True, force_reload=False, eager=False, maintain_universe=True):
+    def remove_network(self, network_id):
+        """Removes a network, like after it's dropped from the database, along with its cached query results
+
+        :param int network_id: The identifier of the network
+        """
+        with self._lock:
+            if network_id in self.store:
+                if network_id in self.store.universe_network_ids:
+                    self._universe = None
+
+                self.store.remove_network(network_id)
+
+            self._graphs.pop(network_id, None)
+            self.node_degrees.pop(network_id, None)
+            self.node_centralities.pop(network_id, None)
+            self.network_summaries.pop(network_id, None)
+            self.query_cache.invalidate(network_id)
+            self._annotation_indexes.pop(network_id, None)
+            self._annotation_indexes.pop(None, None)
+            self._provenance_indexes.pop(network_id, None)
+            self._provenance_indexes.pop(None, None)
+
+    def _get_networks_to_cache(self, force_reload=False):
+        """Gets the most recent version of each network from the database
+
+        :rtype: list[pybel.manager.models.Network]
+        """
+        query = self.manager.session.query(Network).group_by(Network.name)
+
+        if not force_reload:
+            query = query.filter(Network.id not in self.store)
+
+        return query.having(func.max(Network.created)).order_by(Network.created.desc()).all()
+
+    def cache_networks(self, check_version=True, force_reload=False, eager=False, maintain_universe=True, n_jobs=None,
+                       background=False, snapshot_path=None):
         """This function needs to get all networks from the graph cache manager and make a dictionary
 
         :param bool check_version: Should the version of the BELGraphs be checked from the database? Defaults to :code`True`.
         :param bool force_reload: Should all graphs be reloaded even if they have already been cached?
         :param bool eager: Should difficult to preload features be calculated?
+        :param bool maintain_universe: Should the networks be included in the universe?
+        :param int n_jobs: If given, the networks are deserialized and preprocessed by this many worker processes.
+                           See :meth:`warm_up`.
+        :param bool background: Should the networks be loaded by :meth:`warm_up` in a background thread?
+        :param str snapshot_path: If given, a snapshot is written to this path once the networks are loaded. See
+                                  :meth:`dump_snapshot`.
         """
-        query = self.manager.session.query(Network).group_by(Network.name)
+        if n_jobs is not None or background:
+            self.warm_up(
+                check_version=check_version,
+                force_reload=force_reload,
+                eager=eager,
+                maintain_universe=maintain_universe,
+                n_jobs=n_jobs,
+                background=background,
+                snapshot_path=snapshot_path,
+            )
+            return
 
-        if not force_reload:
-            query = query.filter(Network.id not in self.networks)
+        networks = self._get_networks_to_cache(force_reload=force_reload)
 
-        for network in query.having(func.max(Network.created)).order_by(Network.created.desc()).all():
+        for network in networks:
             try:
                 log.debug('getting bytes from [%s]', network.id)
                 graph = from_bytes(network.blob, check_version=check_version)
@@ -224,12 +411,238 @@ class DatabaseService:
                 maintain_universe=maintain_universe
             )
 
-        if maintain_universe:
-            log.info(
-                'universe has (%s nodes, %s edges)',
-                self.universe.number_of_nodes(),
-                self.universe.number_of_edges()
-            )
+        log.info(
+            'store has (%s nodes, %s edges)',
+            self.store.number_of_nodes(),
+            self.store.number_of_edges()
+        )
+
+        if snapshot_path:
+            self._try_dump_snapshot(snapshot_path, [network.id for network in networks])
+
+    def warm_up(self, check_version=True, force_reload=False, eager=False, maintain_universe=True, n_jobs=None,
+                background=True, snapshot_path=None):
+        """Loads the most recent version of each network from the database. Networks are deserialized and preprocessed
+        by a pool of worker processes, then added one at a time, as soon as each is ready, by a single consumer. Each
+        network can be served as soon as it's added. The progress is kept in :data:`warm_up_status`.
+
+        :param bool check_version: Should the version of the BELGraphs be checked from the database?
+        :param bool force_reload: Should all graphs be reloaded even if they have already been cached?
+        :param bool eager: Should difficult to preload features be calculated?
+        :param bool maintain_universe: Should the networks be included in the universe?
+        :param int n_jobs: The number of worker processes. Defaults to the number of CPUs.
+        :param bool background: Should the networks be added by a background thread, so this function returns
+                                immediately? Defaults to true.
+        :param str snapshot_path: If given, a snapshot is written to this path once the networks are loaded. See
+                                  :meth:`dump_snapshot`.
+        :return: The background thread, if one was started
+        :rtype: Optional[threading.Thread]
+        """
+        # The blobs are read here since the database session can't be shared with other threads
+        networks = [
+            (network.id, network.blob)
+            for network in self._get_networks_to_cache(force_reload=force_reload)
+            if force_reload or network.id not in self.store
+        ]
+
+        log.info('warming up %d networks', len(networks))
+
+        kwargs = dict(
+            check_version=check_version,
+            force_reload=force_reload,
+            eager=eager,
+            maintain_universe=maintain_universe,
+            n_jobs=n_jobs,
+            snapshot_path=snapshot_path,
+        )
+
+        if not background:
+            self._warm_up(networks, **kwargs)
+            return
+
+        thread = threading.Thread(target=self._warm_up, args=(networks,), kwargs=kwargs, name='pybel-warm-up')
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _warm_up(self, networks, check_version=True, force_reload=False, eager=False, maintain_universe=True,
+                 n_jobs=None, snapshot_path=None):
+        """Consumes the preprocessed networks from a process pool. See :meth:`warm_up`
+
+        :param list[tuple[int,bytes]] networks: A list of pairs of network identifiers and their blobs
+        """
+        t = time.time()
+        n_jobs = multiprocessing.cpu_count() if n_jobs is None or n_jobs < 1 else n_jobs
+
+        self.warm_up_status = {'total': len(networks), 'loaded': 0, 'failed': 0, 'done': False}
+        network_ids = [network_id for network_id, _ in networks]
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = {
+                executor.submit(_load_network, blob, check_version=check_version): network_id
+                for network_id, blob in networks
+            }
+            del networks
+
+            for future in as_completed(futures):
+                network_id = futures.pop(future)
+
+                try:
+                    graph, node_bel = future.result()
+                    self.add_network(
+                        network_id,
+                        graph,
+                        force_reload=force_reload,
+                        eager=eager,
+                        maintain_universe=maintain_universe,
+                        preprocessed=True,
+                        node_bel=node_bel
+                    )
+                except Exception:
+                    log.exception("couldn't load [%s]", network_id)
+                    self.warm_up_status['failed'] += 1
+                    continue
+
+                self.warm_up_status['loaded'] += 1
+                log.info(
+                    'warmed up [%s] (%d/%d networks)',
+                    network_id,
+                    self.warm_up_status['loaded'] + self.warm_up_status['failed'],
+                    self.warm_up_status['total']
+                )
+
+        log.info('warmed up %d networks in %.2f seconds', self.warm_up_status['loaded'], time.time() - t)
+
+        if snapshot_path:
+            self._try_dump_snapshot(snapshot_path, network_ids)
+
+        self.warm_up_status['done'] = True
+
+    # Snapshot functions
+
+    def dump_snapshot(self, path, network_ids=None):
+        """Writes the prepared state of the service to a snapshot file, so it can be loaded with
+        :meth:`load_snapshot` instead of deserializing and preprocessing all of the networks again. This includes
+        the store, the node identifiers and their BEL, the degrees, the centralities, the PubMed identifiers, and the
+        authors.
+
+        :param str path: The path of the snapshot file
+        :param iter[int] network_ids: The identifiers of the networks from the database the state was built from, which
+                                      are used to check if the snapshot is fresh. Networks that couldn't be loaded
+                                      should be included so they aren't tried again. Defaults to the networks in
+                                      the store.
+        """
+        t = time.time()
+
+        with self._lock:
+            store_meta, arrays = self.store.to_arrays()
+
+            meta = {
+                'pybel_version': get_pybel_version(),
+                'pybel_tools_version': get_version(),
+                'network_ids': sorted(set(self.store.network_edges).union(network_ids or [])),
+                'store': store_meta,
+                'nodes': [self.nid_node[nid] for nid in range(len(self.nid_node))],
+                'bels': [self.id_bel[nid] for nid in range(len(self.id_bel))],
+                'node_degrees': self.node_degrees,
+                'node_centralities': self.node_centralities,
+                'universe_pmids': self.universe_pmids,
+                'universe_authors': self.universe_authors,
+            }
+
+            write_snapshot(path, meta, arrays)
+
+        log.info('dumped snapshot to %s in %.2f seconds', path, time.time() - t)
+
+    def _try_dump_snapshot(self, path, network_ids=None):
+        """Dumps a snapshot, logging instead of raising errors, since the service works without one"""
+        try:
+            self.dump_snapshot(path, network_ids=network_ids)
+        except Exception:
+            log.exception('could not dump snapshot to %s', path)
+
+    @staticmethod
+    def _get_stale_reason(meta, network_ids=None, eager=False):
+        """Checks if a snapshot's metadata matches the installed software and the given networks
+
+        :return: Why the snapshot is stale, or None if it's fresh
+        :rtype: Optional[str]
+        """
+        if meta['pybel_version'] != get_pybel_version():
+            return 'made with PyBEL v{}'.format(meta['pybel_version'])
+
+        if meta['pybel_tools_version'] != get_version():
+            return 'made with PyBEL Tools v{}'.format(meta['pybel_tools_version'])
+
+        if network_ids is not None and meta['network_ids'] != sorted(network_ids):
+            return 'the networks have changed'
+
+        if eager and set(meta['node_centralities']) != set(meta['store']['network_ids']):
+            return 'not eagerly loaded'
+
+    def load_snapshot(self, path, network_ids=None, eager=False):
+        """Replaces the state of the service with a snapshot written by :meth:`dump_snapshot`. The arrays of the
+        store are memory-mapped, so this is fast no matter how big the snapshot is.
+
+        :param str path: The path of the snapshot file
+        :param iter[int] network_ids: If given, the snapshot is only loaded if it was built from exactly these networks
+        :param bool eager: Should the snapshot only be loaded if the centralities of all of its networks were
+                           calculated?
+        :return: Was the snapshot loaded? It's not if it doesn't exist, can't be read, or is stale.
+        :rtype: bool
+        """
+        t = time.time()
+
+        try:
+            meta, arrays = read_snapshot(path)
+        except (IOError, OSError, SnapshotError) as e:
+            log.info('could not read snapshot %s: %s', path, e)
+            return False
+
+        reason = self._get_stale_reason(meta, network_ids=network_ids, eager=eager)
+
+        if reason is not None:
+            log.info('snapshot %s is stale: %s', path, reason)
+            return False
+
+        with self._lock:
+            self.store = NetworkStore.from_arrays(meta['store'], arrays)
+            self._graphs = OrderedDict()
+            self._universe = None
+            self._annotation_indexes = {}
+            self._provenance_indexes = {}
+            self.network_summaries = {}
+            self.query_cache.clear()
+
+            self.nid_node = dict(enumerate(meta['nodes']))
+            self.node_nid = {node: nid for nid, node in self.nid_node.items()}
+            self.id_bel = dict(enumerate(meta['bels']))
+            self.bel_id = {bel: nid for nid, bel in self.id_bel.items()}
+            self._node_index = None
+
+            self.node_degrees = meta['node_degrees']
+            self.node_centralities = meta['node_centralities']
+            self.universe_pmids = meta['universe_pmids']
+            self.universe_authors = meta['universe_authors']
+            self.pmid_prefixes = PrefixIndex(self.universe_pmids)
+            self.author_prefixes = PrefixIndex(self.universe_authors, words=True)
+
+        log.info('loaded snapshot of %d networks from %s in %.2f seconds', len(meta['store']['network_ids']), path,
+                 time.time() - t)
+
+        return True
+
+    def load_fresh_snapshot(self, path, eager=False):
+        """Loads a snapshot if it was built from the most recent version of each network in the database. See
+        :meth:`load_snapshot`.
+
+        :param str path: The path of the snapshot file
+        :param bool eager: Should the snapshot only be loaded if the centralities of all of its networks were
+                           calculated?
+        :rtype: bool
+        """
+        network_ids = [network.id for network in self._get_networks_to_cache(force_reload=True)]
+        return self.load_snapshot(path, network_ids=network_ids, eager=eager)
 
     # Graph selection functions
 
@@ -245,15 +658,100 @@ class DatabaseService:
                       self.universe.number_of_edges())
             return self.universe
 
-        if network_id not in self.networks:
+        if network_id not in self.store:
             network = self.manager.session.query(Network).get(network_id)
             log.debug('getting bytes from [%s]', network_id)
             self.add_network(network_id, from_bytes(network.blob))
 
-        result = self.networks[network_id]
+        with self._lock:
+            if network_id in self._graphs:
+                result = self._graphs[network_id]
+                self._graphs.move_to_end(network_id)
+            else:
+                result = self.store.get_network(network_id)
+                self._cache_graph(network_id, result)
+
         log.debug('got network [%s] (%s nodes, %s edges)', result, result.number_of_nodes(), result.number_of_edges())
         return result
 
+    def get_annotation_index(self, network_id=None):
+        """Gets the index of the annotations of a network's edges or of the universe's edges. Its edges are the
+        identifiers of the edges in the store, which can be looked up in the graphs from :meth:`get_network` with
+        :meth:`pybel_tools.store.NetworkStore.get_edge_key`.
+
+        :param int network_id: The identifier of the network. If none, gets the index of the universe.
+        :rtype: pybel_tools.summary.AnnotationIndex
+        """
+        if network_id is not None and network_id not in self.store:
+            self.get_network(network_id)
+
+        with self._lock:
+            index = self._annotation_indexes.get(network_id)
+
+            if index is None:
+                if network_id is None:
+                    edges = self.store.get_universe_edges()
+                else:
+                    edges = (int(eid) for eid in self.store.network_edges[network_id])
+
+                index = self._annotation_indexes[network_id] = self.store.get_annotation_index().restrict(edges)
+
+            return index
+
+    def count_annotation_values(self, annotation, network_id=None):
+        """Counts in how many of a network's edges each value of the given annotation appears, like
+        :func:`pybel_tools.summary.count_annotation_values`
+
+        :param str annotation: The annotation to count
+        :param int network_id: The identifier of the network. If none, counts in the universe.
+        :rtype: collections.Counter
+        """
+        return self.get_annotation_index(network_id).count_values(annotation)
+
+    def _build_provenance_index(self, network_id):
+        """Indexes the citations of a network's edges in the store
+
+        :param int network_id: The identifier of the network
+        :rtype: pybel_tools.summary.ProvenanceIndex
+        """
+        # Edges with the same citation share a position in the table, so each citation is only read once
+        edges_by_citation = defaultdict(list)
+        for eid in self.store.network_edges[network_id]:
+            idx = self.store.edge_citation[eid]
+            if idx != MISSING:
+                edges_by_citation[int(idx)].append(self.store.get_edge_key(eid))
+
+        index = ProvenanceIndex()
+        for idx, edges in edges_by_citation.items():
+            index.add_many(edges, self.store.citations[idx])
+
+        return index
+
+    def get_provenance_index(self, network_id=None):
+        """Gets the index of the PubMed identifiers and authors of a network's edges or of the universe's edges. Its
+        edges are identified by their source, target, and key in the graphs from :meth:`get_network`.
+
+        :param int network_id: The identifier of the network. If none, gets the index of the universe.
+        :rtype: pybel_tools.summary.ProvenanceIndex
+        """
+        if network_id is not None and network_id not in self.store:
+            self.get_network(network_id)
+
+        with self._lock:
+            index = self._provenance_indexes.get(network_id)
+
+            if index is None:
+                if network_id is None:
+                    index = ProvenanceIndex()
+                    for universe_network_id in self.store.universe_network_ids:
+                        index.update(self.get_provenance_index(universe_network_id))
+                else:
+                    index = self._build_provenance_index(network_id)
+
+                self._provenance_indexes[network_id] = index
+
+            return index
+
     def decode_node(self, node_id):
         """Decodes node from URL format"""
         nid = int(node_id)
@@ -294,6 +792,9 @@ class DatabaseService:
         2. Add canonical names
         3. Relabel nodes to identifiers
 
+        The results are cached in :data:`query_cache`, so the same query isn't computed again until the network is
+        added again or removed.
+
         :param network_id: The identifier of the network in the database. If none, gets all networks merged with
                             :func:`get_super_network`
         :type network_id: int
@@ -311,6 +812,23 @@ class DatabaseService:
         :return: A BEL Graph
         :rtype: pybel.BELGraph
         """
+        key = make_query_key(
+            network_id=network_id,
+            seed_method=seed_method,
+            seed_data=seed_data,
+            expand_nodes=expand_nodes,
+            remove_nodes=remove_nodes,
+            filters=filters,
+            filter_pathologies=filter_pathologies,
+            annotations=annotations,
+        )
+
+        result = self.query_cache.get(key)
+
+        if result is not None:
+            log.debug('query cache hit (%s nodes, %s edges)', result.number_of_nodes(), result.number_of_edges())
+            return result
+
         graph = self.get_network(network_id)
 
         log.debug('query: %s', {
@@ -325,15 +843,28 @@ class DatabaseService:
         if filters:
             log.debug('filtering is not implemented yet, but got: %s', filters)
 
-        result = get_subgraph(
-            graph,
-            seed_method=seed_method,
-            seed_data=seed_data,
-            expand_nodes=expand_nodes,
-            remove_nodes=remove_nodes,
-            filter_pathologies=filter_pathologies,
-            **annotations
-        )
+        if annotations and not seed_method:
+            # Look up the edges matching the annotations in the index instead of checking every edge
+            edges = self.get_annotation_index(network_id).query(annotations)
+            view = SubgraphView(graph, nodes=(), edges=(self.store.get_edge_key(eid) for eid in edges))
+            result = get_subgraph_from_view(
+                view,
+                expand_nodes=expand_nodes,
+                remove_nodes=remove_nodes,
+                filter_pathologies=filter_pathologies
+            )
+        else:
+            result = get_subgraph(
+                graph,
+                seed_method=seed_method,
+                seed_data=seed_data,
+                expand_nodes=expand_nodes,
+                remove_nodes=remove_nodes,
+                filter_pathologies=filter_pathologies,
+                provenance_index=(self.get_provenance_index(network_id)
+                                  if seed_method == SEED_TYPE_PROVENANCE else None),
+                **annotations
+            )
 
         # Only expand on internal edges if we've done some adding
         if seed_method or expand_nodes:
@@ -343,50 +874,134 @@ class DatabaseService:
 
         log.debug('query returned (%s nodes, %s edges)', result.number_of_nodes(), result.number_of_edges())
 
+        self.query_cache.set(key, network_id, result)
+
         return result
 
+    def get_undirected_adjacency(self, network_id=None, seed_method=None, seed_data=None, expand_nodes=None,
+                                 remove_nodes=None, filters=None, filter_pathologies=False, **annotations):
+        """Gets the neighbors of each node of a query's result disregarding the direction of the edges. It's kept
+        next to the result in :data:`query_cache`, so it's computed once per query until the result is evicted or the
+        network is added again or removed. Takes the same arguments as :meth:`query`.
+
+        :return: A dictionary of {node identifier: set of neighboring node identifiers}
+        :rtype: dict
+        """
+        key = make_query_key(
+            network_id=network_id,
+            seed_method=seed_method,
+            seed_data=seed_data,
+            expand_nodes=expand_nodes,
+            remove_nodes=remove_nodes,
+            filters=filters,
+            filter_pathologies=filter_pathologies,
+            annotations=annotations,
+        )
+
+        adjacency = self.query_cache.get_undirected_adjacency(key)
+
+        if adjacency is not None:
+            return adjacency
+
+        # The result isn't cached yet, or is bigger than the cache
+        result = self.query(network_id=network_id, seed_method=seed_method, seed_data=seed_data,
+                            expand_nodes=expand_nodes, remove_nodes=remove_nodes, filters=filters,
+                            filter_pathologies=filter_pathologies, **annotations)
+
+        adjacency = self.query_cache.get_undirected_adjacency(key)
+
+        if adjacency is not None:
+            return adjacency
+
+        return get_undirected_adjacency(result)
+
     def get_edges(self, u, v, both_ways=True):
         """Gets the data dictionaries of all edges between the given nodes"""
-        if u not in self.universe:
+        if not self.store.has_node(u):
             raise ValueError("Network store doesn't have node: {}".format(u))
 
-        if v not in self.universe:
+        if not self.store.has_node(v):
             raise ValueError("Network store doesn't have node: {}".format(v))
 
-        if v not in self.universe.edge[u]:
-            raise ValueError('No edges between {} and {}'.format(u, v))
+        result = self.store.get_edges(u, v)
 
-        result = list(self.universe.edge[u][v].values())
+        if not result:
+            raise ValueError('No edges between {} and {}'.format(u, v))
 
-        if both_ways and v in self.universe.edge and u in self.universe.edge[v]:
-            result.extend(self.universe.edge[v][u].values())
+        if both_ways:
+            result.extend(self.store.get_edges(v, u))
 
         return result
 
-    def get_nodes_containing_keyword(self, keyword):
-        """Gets a list with all cnames that contain a certain keyword adding to the duplicates their function"""
-        return [{"text": bel, "id": str(nid)} for bel, nid in self.bel_id.items() if keyword.lower() in bel.lower()]
+    def get_node_index(self):
+        """Gets the index of the BEL strings and canonical names of all nodes. It's kept up to date as networks are
+        added, and is built the first time it's needed after a snapshot is loaded.
 
-    def get_pubmed_containing_keyword(self, keyword):
-        """Gets a list with pubmed_ids that contain a certain keyword
-        
+        :rtype: pybel_tools.selection.NodeTextIndex
+        """
+        with self._lock:
+            if self._node_index is None:
+                t = time.time()
+                index = NodeTextIndex()
+
+                for nid, bel in self.id_bel.items():
+                    data = self.store.node_data[nid] if self.store.has_node(nid) else {}
+                    index.add(nid, [bel, data.get(CNAME)])
+
+                self._node_index = index
+                log.info('indexed %d nodes in %.2f seconds', len(index), time.time() - t)
+
+            return self._node_index
+
+    def get_nodes_containing_keyword(self, keyword, offset=0, limit=None):
+        """Gets the nodes whose BEL strings or canonical names contain a certain keyword, from the best to the worst
+        match. See :meth:`pybel_tools.selection.NodeTextIndex.search`.
+
+        :param str keyword: The keyword
+        :param int offset: The number of best matching nodes to skip, for pagination
+        :param int limit: The maximum number of nodes to return. If none, returns all of them.
+        :return: A list of dictionaries with the BEL string and the identifier of each node
+        :rtype: list[dict]
+        """
+        return [
+            {"text": self.id_bel[nid], "id": str(nid)}
+            for nid in self.get_node_index().search(keyword, offset=offset, limit=limit)
+        ]
+
+    def get_pubmed_containing_keyword(self, keyword, limit=None):
+        """Gets a sorted list of the PubMed identifiers in the universe starting with a certain keyword
+
+        :param str keyword: The beginning of a PubMed identifier
+        :param int limit: The maximum number of PubMed identifiers to return. If none, returns all of them.
         :rtype: list[str]
         """
-        return list(get_pmid_by_keyword(keyword, pubmed_identifiers=self.universe_pmids))
+        return self.pmid_prefixes.search(keyword, limit=limit)
 
-    def get_authors_containing_keyword(self, keyword):
-        """Gets a list with authors that contain a certain keyword
-        
+    def get_authors_containing_keyword(self, keyword, limit=None):
+        """Gets a list of the authors in the universe with a word in their name starting with a certain keyword
+
+        :param str keyword: The beginning of an author's name or of a word in it
+        :param int limit: The maximum number of authors to return. If none, returns all of them.
         :rtype: list[str]
         """
-        return get_authors_by_keyword(keyword, authors=self.universe_authors)
+        return self.author_prefixes.search(keyword, limit=limit)
 
     def get_cname(self, node):
-        if CNAME in self.universe.node[node]:
-            return self.universe.node[node][CNAME]
+        """Gets the canonical name of a node. Nodes get one when their networks are added, and the others are named
+        like by :func:`pybel.canonicalize.calculate_canonical_name`, from their data and their BEL strings.
 
-        self.universe.node[node][CNAME] = calculate_canonical_name(self.universe, node)
-        return self.universe.node[node][CNAME]
+        :param int node: A node identifier
+        :rtype: str
+        """
+        data = self.store.node_data[node]
+
+        if CNAME in data:
+            return data[CNAME]
+
+        if NAMESPACE in data and (data[FUNCTION] == COMPLEX or (VARIANTS not in data and FUSION not in data)):
+            return data[NAME]
+
+        return self.id_bel[node]
 
     def get_top_centrality(self, network_id, count=20):
         if network_id not in self.node_centralities:
@@ -405,6 +1020,34 @@ class DatabaseService:
             self.node_degrees[network_id] = Counter(graph.degree())
         return {self.get_cname(node): v for node, v in self.node_degrees[network_id].most_common(count)}
 
+    def get_summary(self, network_id, graph=None):
+        """Gets the summary statistics of a network, like on its summary page, calculating them in one pass with
+        :func:`pybel_tools.summary.summarize_graph` the first time. They describe the network as it was stored in
+        the database, with its compilation warnings and before it was preprocessed for the store.
+
+        :param int network_id: The identifier of the network
+        :param pybel.BELGraph graph: The network from the database, if it's already been loaded
+        :return: A dictionary of {visitor name: result}. It's shared, so it shouldn't be modified.
+        :rtype: dict
+        """
+        with self._lock:
+            if network_id in self.network_summaries:
+                return self.network_summaries[network_id]
+
+        if graph is None:
+            network = self.manager.session.query(Network).get(network_id)
+            log.debug('getting bytes from [%s]', network_id)
+            graph = from_bytes(network.blob)
+
+        t = time.time()
+        summary = summarize_graph(graph)
+        log.info('summarized network [%s] in %.2f seconds', network_id, time.time() - t)
+
+        with self._lock:
+            self.network_summaries[network_id] = summary
+
+        return summary
+
     def get_top_comorbidities(self, network_id, count=20):
         graph = self.get_network(network_id)
         cm = count_diseases(graph)
@@ -631,9 +1274,12 @@ class DatabaseService:
 
         return result
 
-    @lru_cache(maxsize=32)
-    def get_tree_annotations(self, graph_id):
-        """Gets tree annotations for the given graph"""
-        graph = self.get_network(graph_id)
-        tree = get_tree_annotations(graph)
-        return tree
+    def get_tree_annotations(self, graph_id=None):
+        """Gets tree annotations for the given graph, like :func:`pybel_tools.summary.get_tree_annotations`
+
+        :param graph_id: The identifier of the network. If none, gets the tree of the universe.
+        :type graph_id: int or str
+        :rtype: list[dict]
+        """
+        network_id = int(graph_id) if graph_id else None
+        return self.get_annotation_index(network_id).get_tree()
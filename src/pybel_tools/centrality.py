@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a service for calculating the betweenness centralities of the nodes in a graph, so the
+summary pages, the explorer and the analyses can share the results instead of each calculating them again.
+
+The centralities are calculated with Brandes' algorithm, in which each source node's contributions are independent,
+so the sources can be split in chunks over a pool of worker processes. They can also be estimated from a seeded sample
+of the sources, whose size can be chosen to bound the error with :func:`get_sample_size`.
+
+Results are kept in memory and optionally in a directory, keyed by a hash of the graph's structure from
+:func:`get_graph_digest` and the parameters of the calculation.
+"""
+
+import hashlib
+import logging
+import math
+import multiprocessing
+import random
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .disk_cache import DiskCache
+
+__all__ = [
+    'get_graph_digest',
+    'get_sample_size',
+    'betweenness_centrality',
+    'CentralityService',
+    'get_default_centrality_service',
+    'set_default_centrality_service',
+]
+
+log = logging.getLogger(__name__)
+
+#: The default maximum number of results kept in memory
+DEFAULT_MAX_ENTRIES = 64
+
+#: The default seed for sampling the sources, so sampled results are reproducible and can be cached
+DEFAULT_SEED = 0
+
+#: The default number of chunks of sources given to each worker process
+CHUNKS_PER_JOB = 4
+
+#: Bump when the pickled format of the entries or the calculation changes
+CACHE_FORMAT_VERSION = '1'
+
+EXTENSION = '.centrality.pickle'
+
+
+def _get_canonical_nodes(graph):
+    """Gets the nodes of a graph in an order that doesn't depend on the order in which they were added
+
+    :rtype: list
+    """
+    return sorted(graph.nodes_iter(), key=repr)
+
+
+def _get_adjacency(graph, nodes):
+    """Gets the indices of the neighbors of each node, following the direction of the edges if the graph is directed.
+    Multiple edges between two nodes only count once, like in :func:`networkx.betweenness_centrality`.
+
+    :param networkx.Graph graph: A graph
+    :param list nodes: The nodes of the graph from :func:`_get_canonical_nodes`
+    :rtype: list[list[int]]
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+
+    return [
+        sorted(index[neighbor] for neighbor in graph.adj[node])
+        for node in nodes
+    ]
+
+
+def get_graph_digest(graph):
+    """Hashes the structure of a graph, which is all the betweenness centralities depend on. Graphs with the same
+    nodes and the same pairs of adjacent nodes have the same digest, regardless of their data.
+
+    :param networkx.Graph graph: A graph
+    :rtype: str
+    """
+    nodes = _get_canonical_nodes(graph)
+
+    h = hashlib.sha1()
+    h.update(CACHE_FORMAT_VERSION.encode('utf-8'))
+    h.update(b'directed' if graph.is_directed() else b'undirected')
+
+    for node in nodes:
+        h.update(repr(node).encode('utf-8'))
+        h.update(b'\0')
+
+    for neighbors in _get_adjacency(graph, nodes):
+        h.update(','.join(map(str, neighbors)).encode('utf-8'))
+        h.update(b'\0')
+
+    return h.hexdigest()
+
+
+def get_sample_size(number_nodes, epsilon, delta=0.1):
+    """Calculates the number of sources to sample so that, with probability at least ``1 - delta``, every node's
+    estimated normalized betweenness centrality is within ``epsilon`` of the exact one.
+
+    Each sampled source gives an independent estimate of a node's centrality between 0 and ``n / (n - 1)``, so this
+    follows from Hoeffding's inequality and the union bound over the nodes.
+
+    :param int number_nodes: The number of nodes in the graph
+    :param float epsilon: The maximum error
+    :param float delta: The probability that the error is bigger than ``epsilon`` for any node
+    :return: The number of sources to sample. If it's not less than the number of nodes, the exact calculation
+             should be used instead.
+    :rtype: int
+    """
+    if number_nodes <= 2:
+        return number_nodes
+
+    value_range = number_nodes / (number_nodes - 1)
+    return int(math.ceil(value_range ** 2 * math.log(2 * number_nodes / delta) / (2 * epsilon ** 2)))
+
+
+def _accumulate(adjacency, sources):
+    """Runs the single source stage of Brandes' algorithm from each source and sums the dependencies. This is the
+    task sent to the worker processes.
+
+    :param list[list[int]] adjacency: The indices of the neighbors of each node
+    :param iter[int] sources: The indices of the source nodes
+    :return: The unscaled betweenness centrality of each node
+    :rtype: list[float]
+    """
+    betweenness = [0.0] * len(adjacency)
+
+    for source in sources:
+        stack = []
+        predecessors = {source: []}
+        sigma = {source: 1}
+        distance = {source: 0}
+        queue = deque([source])
+
+        while queue:
+            v = queue.popleft()
+            stack.append(v)
+            next_distance = distance[v] + 1
+            sigma_v = sigma[v]
+
+            for w in adjacency[v]:
+                if w not in distance:
+                    distance[w] = next_distance
+                    sigma[w] = 0
+                    predecessors[w] = []
+                    queue.append(w)
+
+                if distance[w] == next_distance:
+                    sigma[w] += sigma_v
+                    predecessors[w].append(v)
+
+        dependency = dict.fromkeys(stack, 0.0)
+
+        while stack:
+            w = stack.pop()
+            coefficient = (1.0 + dependency[w]) / sigma[w]
+
+            for v in predecessors[w]:
+                dependency[v] += sigma[v] * coefficient
+
+            if w != source:
+                betweenness[w] += dependency[w]
+
+    return betweenness
+
+
+def _rescale(betweenness, number_nodes, directed, normalized, k=None):
+    """Scales the betweenness centralities in place like :func:`networkx.betweenness_centrality`"""
+    if normalized:
+        scale = None if number_nodes <= 2 else 1.0 / ((number_nodes - 1) * (number_nodes - 2))
+    else:
+        scale = None if directed else 0.5
+
+    if scale is None:
+        return
+
+    if k is not None:
+        scale *= number_nodes / k
+
+    for i, value in enumerate(betweenness):
+        betweenness[i] = value * scale
+
+
+def betweenness_centrality(graph, k=None, normalized=True, seed=None, n_jobs=None):
+    """Calculates the betweenness centralities of the nodes in a graph, optionally from a sample of the sources and
+    over a pool of worker processes. The exact results are the same as from :func:`networkx.betweenness_centrality`.
+
+    :param networkx.Graph graph: A graph
+    :param int k: The number of sources to sample. If none, or not less than the number of nodes, uses all of them.
+    :param bool normalized: Should the centralities be normalized by the number of pairs of other nodes?
+    :param int seed: The seed for sampling the sources. Since they are sampled from the nodes sorted by their
+                     representations, the same graph and seed always give the same sample.
+    :param int n_jobs: The number of worker processes. Defaults to 1, which runs everything in this process. Use -1
+                       for the number of CPUs.
+    :return: A dictionary of {node: betweenness centrality}
+    :rtype: dict
+    """
+    nodes = _get_canonical_nodes(graph)
+    adjacency = _get_adjacency(graph, nodes)
+    number_nodes = len(nodes)
+
+    if k is not None and k >= number_nodes:
+        k = None
+
+    if k is None:
+        sources = list(range(number_nodes))
+    else:
+        sources = sorted(random.Random(seed).sample(range(number_nodes), k))
+
+    n_jobs = multiprocessing.cpu_count() if n_jobs is not None and n_jobs < 0 else n_jobs
+
+    if n_jobs is None or n_jobs <= 1 or len(sources) < 2:
+        betweenness = _accumulate(adjacency, sources)
+    else:
+        number_chunks = min(len(sources), n_jobs * CHUNKS_PER_JOB)
+        chunks = [sources[i::number_chunks] for i in range(number_chunks)]
+        betweenness = [0.0] * number_nodes
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            for partial in executor.map(_accumulate, [adjacency] * number_chunks, chunks):
+                for i, value in enumerate(partial):
+                    betweenness[i] += value
+
+    _rescale(betweenness, number_nodes, graph.is_directed(), normalized, k=k)
+
+    return dict(zip(nodes, betweenness))
+
+
+class CentralityService:
+    """Calculates betweenness centralities with :func:`betweenness_centrality` and keeps the results of the most
+    recently used graphs in memory, and optionally all of them in a directory, so they're shared between requests and
+    processes. The least recently used files are evicted when the directory gets bigger than its maximum size.
+    """
+
+    def __init__(self, directory=None, max_entries=None, max_size=None, n_jobs=None):
+        """
+        :param str directory: The directory in which the results are stored. Is created if it doesn't exist. If none,
+                              results are only kept in memory.
+        :param int max_entries: The maximum number of results kept in memory. Defaults to 64.
+        :param int max_size: The maximum size of the directory in bytes. Defaults to 1 GB.
+        :param int n_jobs: The number of worker processes. See :func:`betweenness_centrality`
+        """
+        self.directory = directory
+        self.max_entries = DEFAULT_MAX_ENTRIES if max_entries is None else max_entries
+        self.n_jobs = n_jobs
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_cache = None if directory is None else DiskCache(directory, EXTENSION, max_size=max_size)
+
+    @staticmethod
+    def get_key(digest, k=None, normalized=True, seed=None):
+        """Makes the key of a result from the graph's digest and the parameters of the calculation
+
+        :param str digest: The digest of the graph from :func:`get_graph_digest`
+        :rtype: str
+        """
+        parameters = 'exact' if k is None else 'k={};seed={}'.format(k, seed)
+        return '{}-{}-{}'.format(digest, parameters, 'normalized' if normalized else 'raw')
+
+    def _get_path(self, key):
+        return self._disk_cache.get_path(hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _load(self, key):
+        """Loads a result from the directory
+
+        :rtype: Optional[dict]
+        """
+        if self._disk_cache is None:
+            return
+
+        return self._disk_cache.load(self._get_path(key))
+
+    def _dump(self, key, result):
+        """Stores a result in the directory, then evicts the least recently used ones if it's too big"""
+        if self._disk_cache is None:
+            return
+
+        self._disk_cache.dump(self._get_path(key), result)
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_betweenness_centrality(self, graph, k=None, epsilon=None, delta=0.1, normalized=True, seed=DEFAULT_SEED):
+        """Gets the betweenness centralities of the nodes in a graph from the cache, or calculates and caches them
+
+        :param networkx.Graph graph: A graph
+        :param int k: The number of sources to sample. If none and no ``epsilon`` is given, uses all of them.
+        :param float epsilon: The maximum error of the sampled centralities. If given, ``k`` is calculated with
+                              :func:`get_sample_size`.
+        :param float delta: The probability that the error is bigger than ``epsilon``
+        :param bool normalized: Should the centralities be normalized by the number of pairs of other nodes?
+        :param int seed: The seed for sampling the sources
+        :return: A counter of {node: betweenness centrality}
+        :rtype: collections.Counter
+        """
+        number_nodes = graph.number_of_nodes()
+
+        if epsilon is not None:
+            k = get_sample_size(number_nodes, epsilon, delta=delta)
+
+        if k is not None and k >= number_nodes:
+            k = None
+
+        key = self.get_key(get_graph_digest(graph), k=k, normalized=normalized, seed=seed)
+
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+
+        if result is None:
+            result = self._load(key)
+
+            if result is None:
+                log.debug('calculating betweenness centralities of %d nodes with %s sources', number_nodes,
+                          'all' if k is None else k)
+                result = betweenness_centrality(graph, k=k, normalized=normalized, seed=seed, n_jobs=self.n_jobs)
+                self._dump(key, result)
+
+            self._remember(key, result)
+
+        return Counter(result)
+
+    def clear(self):
+        """Removes all results from memory and from the directory"""
+        with self._lock:
+            self._entries.clear()
+
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+
+
+_default_service = CentralityService()
+
+
+def get_default_centrality_service():
+    """Gets the centrality service used by :func:`pybel_tools.utils.calc_betweenness_centality` and the summaries
+
+    :rtype: CentralityService
+    """
+    return _default_service
+
+
+def set_default_centrality_service(service):
+    """Sets the centrality service used by :func:`pybel_tools.utils.calc_betweenness_centality` and the summaries,
+    like one that stores its results in a directory
+
+    :param CentralityService service: A centrality service
+    """
+    global _default_service
+    _default_service = service
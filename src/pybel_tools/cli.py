@@ -24,7 +24,7 @@ import click
 from flask_security import SQLAlchemyUserDatastore
 
 from pybel import from_pickle, to_database, from_lines, from_url
-from pybel.constants import PYBEL_LOG_DIR, SMALL_CORPUS_URL, LARGE_CORPUS_URL, get_cache_connection
+from pybel.constants import PYBEL_DIR, PYBEL_LOG_DIR, SMALL_CORPUS_URL, LARGE_CORPUS_URL, get_cache_connection
 from pybel.manager.cache import build_manager
 from pybel.manager.models import Base
 from pybel.utils import get_version as pybel_version
@@ -52,6 +52,9 @@ from .web.upload_service import upload_blueprint
 
 log = logging.getLogger(__name__)
 
+#: The default path of the snapshot of the preloaded networks used by the web application
+DEFAULT_SNAPSHOT_PATH = os.path.join(PYBEL_DIR, 'pybel_tools_snapshot.bin')
+
 datefmt = '%H:%M:%S'
 fmt = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
@@ -98,9 +101,13 @@ def main():
 @click.option('-a', '--run-all', is_flag=True, help="Enable *all* services")
 @click.option('--secret-key', help='Set the CSRF secret key')
 @click.option('--no-preload', is_flag=True, help='Do not preload cache')
+@click.option('--snapshot', type=click.Path(dir_okay=False),
+              help='Snapshot of the preloaded networks. Is used when it is up to date and rebuilt otherwise. Defaults '
+                   'to the PYBEL_DS_SNAPSHOT config or {}'.format(DEFAULT_SNAPSHOT_PATH))
+@click.option('--no-snapshot', is_flag=True, help='Do not use a snapshot of the preloaded networks')
 @click.option('--config', help='A config JSON file')
 def web(connection, host, port, debug, flask_debug, skip_check_version, eager, run_database_service, run_parser_service,
-        run_receiver_service, run_all, secret_key, no_preload, config):
+        run_receiver_service, run_all, secret_key, no_preload, snapshot, no_snapshot, config):
     """Runs PyBEL Web"""
     set_debug_param(debug)
     if debug < 3:
@@ -119,6 +126,11 @@ def web(connection, host, port, debug, flask_debug, skip_check_version, eager, r
 
     app = create_application()
 
+    if no_snapshot:
+        app.config['PYBEL_DS_SNAPSHOT'] = None
+    elif snapshot is not None or not app.config.get('PYBEL_DS_SNAPSHOT'):
+        app.config['PYBEL_DS_SNAPSHOT'] = snapshot or DEFAULT_SNAPSHOT_PATH
+
     build_security_service(app)
     build_main_service(app)
     build_admin_service(app)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains an on-disk least recently used cache of pickled values, which is shared by the caches that
+keep expensive results between processes, like :class:`pybel_tools.analysis.mechanism_cache.MechanismCache` and
+:class:`pybel_tools.centrality.CentralityService`.
+"""
+
+import logging
+import os
+import pickle
+import tempfile
+
+__all__ = [
+    'DiskCache',
+]
+
+log = logging.getLogger(__name__)
+
+#: The default maximum size of the cache directory in bytes (1 GB)
+DEFAULT_MAX_SIZE = 2 ** 30
+
+
+class DiskCache:
+    """Stores pickled values in a directory, with one file per entry. Files are written atomically so other
+    processes never read a partial entry, and the least recently used ones are evicted when the directory gets bigger
+    than the maximum size.
+    """
+
+    def __init__(self, directory, extension, max_size=None):
+        """
+        :param str directory: The directory in which the entries are stored. Is created if it doesn't exist.
+        :param str extension: The extension of the files of the entries. Other files in the directory are ignored.
+        :param max_size: The maximum size of the cache in bytes. Defaults to 1 GB.
+        :type max_size: int
+        """
+        self.directory = directory
+        self.extension = extension
+        self.max_size = DEFAULT_MAX_SIZE if max_size is None else max_size
+
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def get_path(self, name):
+        """Gets the path of the entry with the given name
+
+        :param str name: The name of the entry, without the extension
+        :rtype: str
+        """
+        return os.path.join(self.directory, '{}{}'.format(name, self.extension))
+
+    def iter_paths(self, prefix=None):
+        """Iterates over the paths of the entries, optionally only the ones whose names start with the given prefix
+
+        :param str prefix: The prefix of the names of the entries
+        :rtype: iter[str]
+        """
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.extension):
+                continue
+
+            if prefix is not None and not name.startswith(prefix):
+                continue
+
+            yield os.path.join(self.directory, name)
+
+    def load(self, path):
+        """Loads an entry and marks it as recently used. Entries that can't be unpickled are removed.
+
+        :param str path: The path of the entry
+        :return: The value of the entry, or None if it isn't cached
+        """
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (IOError, OSError):
+            return
+        except Exception:
+            log.exception('could not load cached entry from %s', path)
+            self.remove(path)
+            return
+
+        os.utime(path, None)  # marks as recently used for eviction
+
+        return value
+
+    def dump(self, path, value):
+        """Stores an entry, then evicts the least recently used ones if the cache is too big
+
+        :param str path: The path of the entry
+        :param value: A picklable value
+        """
+        # Writes to a temporary file first so other processes never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_path, path)
+
+        self.evict()
+
+    @staticmethod
+    def remove(path):
+        """Removes an entry, if it still exists
+
+        :param str path: The path of the entry
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self, prefix=None):
+        """Removes all entries, optionally only the ones whose names start with the given prefix
+
+        :param str prefix: The prefix of the names of the entries
+        """
+        for path in list(self.iter_paths(prefix=prefix)):
+            self.remove(path)
+
+    def size(self):
+        """Returns the total size of the entries in bytes
+
+        :rtype: int
+        """
+        return sum(os.path.getsize(path) for path in self.iter_paths())
+
+    def evict(self):
+        """Removes the least recently used entries until the cache is no bigger than its maximum size"""
+        entries = []
+        for path in self.iter_paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+
+            log.info('evicting %s', path)
+            self.remove(path)
+            total -= size
@@ -9,18 +9,23 @@ and provide an even more rich mechanism inventory.
 
 """
 
-from pybel.constants import BIOPROCESS
+from pybel import BELGraph
+from pybel.constants import BIOPROCESS, RELATION, CAUSAL_RELATIONS
 from . import pipeline
 from .mutation.deletion import remove_inconsistent_edges
 from .mutation.expansion import get_upstream_causal_subgraph, expand_upstream_causal_subgraph
 from .mutation.merge import collapse_consistent_edges
 from .selection.leaves import get_unweighted_upstream_leaves
+from .summary.pair_relations import PairRelationTable
 from .filters.node_selection import get_nodes_by_function
 
 __all__ = [
     'remove_unweighted_leaves',
     'remove_unweighted_sources',
     'generate_mechanism',
+    'get_causal_in_edge_index',
+    'generate_mechanism_from_index',
+    'generate_mechanisms',
     'generate_bioprocess_mechanisms',
 ]
 
@@ -115,8 +120,9 @@ def generate_mechanism(graph, node, key=None):
     """
     subgraph = get_upstream_causal_subgraph(graph, node)
     expand_upstream_causal_subgraph(graph, subgraph)
-    remove_inconsistent_edges(subgraph)
-    collapse_consistent_edges(subgraph)
+    table = PairRelationTable(subgraph)
+    remove_inconsistent_edges(subgraph, table=table)
+    collapse_consistent_edges(subgraph, table=table)
 
     if key is not None:
         prune_mechanism_by_data(subgraph, key)
@@ -124,8 +130,107 @@ def generate_mechanism(graph, node, key=None):
     return subgraph
 
 
+def get_causal_in_edge_index(graph):
+    """Indexes the causal in-edges of every node and resolves their consistency, so many mechanisms can be generated
+    without going back over the whole graph
+
+    :param pybel.BELGraph graph: A BEL Graph
+    :return: A dictionary of {target node: {source node: relation}}, in the order of the graph's in-edges. The relation
+             is None if the causal edges between the pair of nodes are inconsistent.
+    :rtype: dict[tuple,dict[tuple,Optional[str]]]
+    """
+    index = {}
+
+    for v in graph.nodes_iter():
+        relations = {}
+
+        for u, _, d in graph.in_edges_iter(v, data=True):
+            if d[RELATION] not in CAUSAL_RELATIONS:
+                continue
+
+            if u not in relations:
+                relations[u] = d[RELATION]
+            elif relations[u] != d[RELATION]:
+                relations[u] = None
+
+        if relations:
+            index[v] = relations
+
+    return index
+
+
+def generate_mechanism_from_index(graph, index, node, key=None):
+    """Generates the same mechanistic subgraph as :func:`generate_mechanism` using a precomputed index from
+    :func:`get_causal_in_edge_index`
+
+    The mechanism contains the target node, its causal predecessors, and their causal predecessors, with one edge for
+    each pair of nodes whose causal edges are consistent, where the target of the edge is the target node or one of its
+    causal predecessors.
+
+    :param pybel.BELGraph graph: The BEL Graph used to build the index
+    :param dict index: The causal in-edge index from :func:`get_causal_in_edge_index`
+    :param tuple node: The target BEL node for generation
+    :param key: The key in the node data dictionary representing the experimental data. If none, does not prune
+                unannotated nodes after generation
+    :type key: str
+    :return: A subgraph grown around the target BEL node
+    :rtype: pybel.BELGraph
+    """
+    result = BELGraph()
+
+    if node not in index:
+        return result
+
+    # Nodes are added in the same order as generate_mechanism adds them
+    nodes = []
+    seen = set()
+
+    for u in index[node]:
+        for n in (u, node):
+            if n not in seen:
+                seen.add(n)
+                nodes.append(n)
+
+    first_level = list(nodes)
+
+    for v in first_level:
+        for u in index.get(v, ()):
+            if u not in seen:
+                seen.add(u)
+                nodes.append(u)
+
+    for u in nodes:
+        result.add_node(u, attr_dict=graph.node[u].copy())
+
+    for v in first_level:
+        for u, relation in index.get(v, {}).items():
+            if relation is not None:
+                result.add_edge(u, v, attr_dict={RELATION: relation})
+
+    if key is not None:
+        prune_mechanism_by_data(result, key)
+
+    return result
+
+
+def generate_mechanisms(graph, nodes, key=None):
+    """Generates a mechanistic subgraph for each of the given nodes with :func:`generate_mechanism_from_index`, so the
+    causal in-edges of the graph are only indexed once
+
+    :param pybel.BELGraph graph: A BEL Graph
+    :param iter[tuple] nodes: An iterable of target BEL nodes
+    :param key: The key in the node data dictionary representing the experimental data. If none, does not prune
+                unannotated nodes after generation
+    :type key: str
+    :return: A dictionary from {tuple node: BELGraph candidate mechanism}
+    :rtype: dict[tuple, pybel.BELGraph]
+    """
+    index = get_causal_in_edge_index(graph)
+    return {node: generate_mechanism_from_index(graph, index, node, key=key) for node in nodes}
+
+
 def generate_bioprocess_mechanisms(graph, key=None):
-    """Generates a mechanistic subgraph for each biological process in the graph using :func:`generate_mechanism`
+    """Generates a mechanistic subgraph for each biological process in the graph using :func:`generate_mechanisms`
 
     :param graph: A BEL Graph
     :type graph: pybel.BELGraph
@@ -135,4 +240,4 @@ def generate_bioprocess_mechanisms(graph, key=None):
     :return: A dictionary from {str bioprocess node: BELGraph candidate mechanism}
     :rtype: dict[tuple, pybel.BELGraph]
     """
-    return {bp: generate_mechanism(graph, bp, key=key) for bp in get_nodes_by_function(graph, BIOPROCESS)}
+    return generate_mechanisms(graph, get_nodes_by_function(graph, BIOPROCESS), key=key)
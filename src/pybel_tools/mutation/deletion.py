@@ -6,7 +6,7 @@ from .. import pipeline
 from ..filters.edge_filters import filter_edges
 from ..selection.leaves import get_gene_leaves, get_rna_leaves
 from ..selection.utils import get_leaves_by_type
-from ..summary.edge_summary import get_inconsistent_edges
+from ..summary.pair_relations import PairRelationTable
 from ..utils import all_edges_iter
 
 __all__ = [
@@ -62,14 +62,20 @@ def prune_central_dogma(graph):
 
 
 @pipeline.in_place_mutator
-def remove_inconsistent_edges(graph):
+def remove_inconsistent_edges(graph, table=None):
     """Remove all edges between node paris with consistent edges.
 
     This is the all-or-nothing approach. It would be better to do more careful investigation of the evidences during
     curation.
 
     :param pybel.BELGraph graph: A BEL graph
+    :param pybel_tools.summary.PairRelationTable table: The pair relation table of the graph, if one is already up to
+                                                        date. The removed pairs are removed from it too.
     """
-    for u, v in get_inconsistent_edges(graph):
+    if table is None:
+        table = PairRelationTable(graph)
+
+    for u, v in table.iter_inconsistent_pairs():
         edges = list(all_edges_iter(graph, u, v))
         graph.remove_edges_from(edges)
+        table.remove_pair(u, v)
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-import itertools as itt
 import logging
 from collections import Counter, defaultdict
 
@@ -9,11 +8,11 @@ from pybel.constants import *
 from .merge import left_full_merge
 from .utils import ensure_node_from_universe
 from .. import pipeline
-from ..filters.edge_filters import keep_edge_permissive, concatenate_edge_filters, edge_is_causal
+from ..filters.edge_filters import concatenate_edge_filters, edge_is_causal
 from ..filters.node_filters import keep_node_permissive, concatenate_node_filters, exclude_pathology_filter
 from ..filters.node_selection import get_nodes_by_function
 from ..summary.edge_summary import count_annotation_values
-from ..utils import check_has_annotation, safe_add_edge
+from ..utils import check_has_annotation, get_consistent_pair_edges, safe_add_edge
 
 __all__ = [
     'get_upstream_causal_subgraph',
@@ -407,10 +406,11 @@ def enrich_unqualified(universe, graph):
     enrich_variants(universe, graph)
 
 
-# TODO should this bother checking multiple relationship types?
 @pipeline.uni_in_place_mutator
 def expand_internal(universe, graph, edge_filters=None):
-    """Edges between entities in the subgraph that pass the given filters
+    """Adds the edges from the universe between entities in the subgraph that pass the given filters. Only the universe
+    out-edges of the subgraph's nodes are checked, so this scales with the number of edges touched instead of with the
+    number of pairs of nodes. Pairs of nodes whose edges have multiple relations are skipped.
 
     :param pybel.BELGraph universe: The full graph
     :param graph: A subgraph to find the upstream information
@@ -418,25 +418,23 @@ def expand_internal(universe, graph, edge_filters=None):
     :param edge_filters: Optional list of edge filter functions (graph, node, node, key, data) -> bool
     :type edge_filters: list or lambda
     """
-    edge_filter = concatenate_edge_filters(*edge_filters) if edge_filters else keep_edge_permissive
+    edge_filter = concatenate_edge_filters(edge_filters) if edge_filters else None
 
-    for u, v in itt.product(graph.nodes_iter(), repeat=2):
-        if graph.has_edge(u, v) or not universe.has_edge(u, v):
-            continue
+    pairs = [
+        (u, v)
+        for u in graph.nodes_iter()
+        if u in universe
+        for v in universe.edge[u]
+        if v in graph and not graph.has_edge(u, v)
+    ]
 
-        rs = defaultdict(list)
-        for k, d in universe.edge[u][v].items():
-            if not edge_filter(universe, u, v, k, d):
-                continue
+    consistent_edges = get_consistent_pair_edges(universe, pairs, edge_filter=edge_filter)
 
-            rs[d[RELATION]].append(d)
+    log.debug('adding %d of %d internal pairs with consistent relations', len(consistent_edges), len(pairs))
 
-        if 1 == len(rs):
-            relation = list(rs)[0]
-            for d in rs[relation]:
-                graph.add_edge(u, v, attr_dict=d)
-        else:
-            log.debug('Multiple relationship types found between %s and %s', u, v)
+    for (u, v), edges in consistent_edges.items():
+        for d in edges:
+            graph.add_edge(u, v, attr_dict=d)
 
 
 @pipeline.uni_in_place_mutator
@@ -4,7 +4,7 @@
 
 from pybel.constants import RELATION
 from .. import pipeline
-from ..summary.edge_summary import get_consistent_edges
+from ..summary.pair_relations import PairRelationTable
 from ..utils import all_edges_iter
 
 __all__ = [
@@ -46,14 +46,20 @@ def right_full_merge(g, h):
 
 
 @pipeline.in_place_mutator
-def collapse_consistent_edges(graph):
+def collapse_consistent_edges(graph, table=None):
     """Collapses consistent edges together
 
     .. warning:: This operation doesn't preserve evidences or other annotations
 
     :param pybel.BELGraph graph: A BEL Graph
+    :param pybel_tools.summary.PairRelationTable table: The pair relation table of the graph, if one is already up to
+                                                        date. It stays up to date, since the pairs keep their
+                                                        relations.
     """
-    for u, v in get_consistent_edges(graph):
+    if table is None:
+        table = PairRelationTable(graph)
+
+    for u, v in table.iter_consistent_pairs():
         rel = [d[RELATION] for d in graph.edge[u][v].values()][0]
         edges = list(all_edges_iter(graph, u, v))
         graph.remove_edges_from(edges)
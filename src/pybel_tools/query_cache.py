@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains an in-memory cache for the results of :meth:`pybel_tools.api.DatabaseService.query`, so
+the same query sent again by the explorer or by the endpoints that build on it isn't computed from scratch.
+
+Queries are identified by a normalized signature from :func:`make_query_key`, in which the order of the seed nodes,
+the expanded and removed nodes, and the annotation filters doesn't matter. The cache is bounded by the total number of
+edges in the stored results, and entries can expire after a given time. Structures derived from a result, like its
+undirected adjacency, are kept next to it and dropped along with it.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from pybel import BELGraph
+from .selection.paths import get_undirected_adjacency
+from .utils import copy_nested
+
+__all__ = [
+    'make_query_key',
+    'QueryCache',
+]
+
+log = logging.getLogger(__name__)
+
+#: The default maximum total number of edges in the cached query results
+DEFAULT_MAX_EDGES = 10 ** 6
+
+
+def _normalize(value):
+    """Converts a (nested) query parameter to a hashable value in which the order of collections doesn't matter
+
+    :rtype: collections.abc.Hashable
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(((k, _normalize(v)) for k, v in value.items()), key=repr))
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted((_normalize(v) for v in value), key=repr))
+
+    return value
+
+
+def make_query_key(network_id=None, seed_method=None, seed_data=None, expand_nodes=None, remove_nodes=None,
+                   filters=None, filter_pathologies=False, annotations=None):
+    """Makes the signature of a query. See :meth:`pybel_tools.api.DatabaseService.query` for the parameters.
+
+    :rtype: tuple
+    """
+    return (
+        network_id,
+        seed_method or None,
+        _normalize(seed_data) or None,
+        _normalize(expand_nodes) or None,
+        _normalize(remove_nodes) or None,
+        _normalize(filters) or None,
+        bool(filter_pathologies),
+        _normalize(annotations) or None,
+    )
+
+
+def _copy_graph(graph):
+    """Makes a copy of a graph and of its graph, node, and edge data, so the copy can be changed in any way, like by
+    :func:`pybel_tools.mutation.serialize_authors`, without changing the original
+
+    :param pybel.BELGraph graph: A BEL graph
+    :rtype: pybel.BELGraph
+    """
+    result = BELGraph()
+    result.graph = copy_nested(graph.graph)
+
+    for node, data in graph.nodes_iter(data=True):
+        result.add_node(node, attr_dict=copy_nested(data))
+
+    for u, v, k, data in graph.edges_iter(keys=True, data=True):
+        result.add_edge(u, v, key=k, attr_dict=copy_nested(data))
+
+    return result
+
+
+class QueryCache:
+    """Keeps the results of the most recently used queries. Results are returned as copies, so the callers can modify
+    them. The least recently used results are evicted when the total number of edges gets bigger than the maximum.
+    """
+
+    def __init__(self, max_edges=None, ttl=None):
+        """
+        :param max_edges: The maximum total number of edges in the cached results. Defaults to one million. Results
+                          bigger than this aren't cached. If 0, nothing is cached.
+        :type max_edges: int
+        :param ttl: The number of seconds after which an entry expires. If none, entries don't expire.
+        :type ttl: float
+        """
+        self.max_edges = DEFAULT_MAX_EDGES if max_edges is None else max_edges
+        self.ttl = ttl
+
+        #: A dictionary of {query key: (network id, result graph, number of edges, time added)}
+        self._entries = OrderedDict()
+        self._edges = 0
+
+        #: A dictionary of {query key: undirected adjacency of the result}, filled as they're needed
+        self._adjacencies = {}
+
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def number_of_edges(self):
+        """Returns the total number of edges in the cached results
+
+        :rtype: int
+        """
+        return self._edges
+
+    def _remove(self, key):
+        _, _, edges, _ = self._entries.pop(key)
+        self._edges -= edges
+        self._adjacencies.pop(key, None)
+
+    def _get_entry(self, key):
+        """Gets an entry, removing it if it has expired. Has to be called while holding the lock.
+
+        :rtype: Optional[tuple]
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None and self.ttl is not None and time.time() - entry[3] > self.ttl:
+            self._remove(key)
+            return
+
+        return entry
+
+    def get(self, key):
+        """Gets a copy of a cached query result
+
+        :param tuple key: A query key from :func:`make_query_key`
+        :return: A copy of the result, or None if it isn't cached or has expired
+        :rtype: Optional[pybel.BELGraph]
+        """
+        with self._lock:
+            entry = self._get_entry(key)
+
+            if entry is None:
+                self.misses += 1
+                return
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return _copy_graph(entry[1])
+
+    def get_undirected_adjacency(self, key):
+        """Gets the neighbors of each node of a cached query result disregarding the direction of the edges, from
+        :func:`pybel_tools.selection.get_undirected_adjacency`. It's built the first time it's needed and kept until
+        the result is evicted or invalidated.
+
+        :param tuple key: A query key from :func:`make_query_key`
+        :return: A dictionary of {node: set of neighboring nodes}, or None if the result isn't cached or has expired
+        :rtype: Optional[dict]
+        """
+        with self._lock:
+            entry = self._get_entry(key)
+
+            if entry is None:
+                return
+
+            adjacency = self._adjacencies.get(key)
+
+            if adjacency is not None:
+                return adjacency
+
+        # The cached graph is never changed, since callers only get copies of it
+        adjacency = get_undirected_adjacency(entry[1])
+
+        with self._lock:
+            if self._entries.get(key) is entry:
+                self._adjacencies[key] = adjacency
+
+        return adjacency
+
+    def set(self, key, network_id, graph):
+        """Caches a copy of a query result, then evicts the least recently used results if there are too many edges
+
+        :param tuple key: A query key from :func:`make_query_key`
+        :param int network_id: The identifier of the network that was queried, or None for the universe
+        :param pybel.BELGraph graph: The query result
+        """
+        edges = graph.number_of_edges()
+
+        if edges > self.max_edges:
+            return
+
+        graph = _copy_graph(graph)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = network_id, graph, edges, time.time()
+            self._edges += edges
+
+            while self._edges > self.max_edges:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, network_id=None):
+        """Removes the results of queries on the given network and on the universe, which includes it
+
+        :param int network_id: A network's identifier. If none, only removes the results of queries on the universe.
+        """
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0] in {network_id, None}]:
+                self._remove(key)
+
+    def clear(self):
+        """Removes all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._adjacencies.clear()
+            self._edges = 0
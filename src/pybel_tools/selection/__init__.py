@@ -5,21 +5,27 @@
 from . import group_nodes
 from . import induce_subgraph
 from . import leaves
+from . import motifs
 from . import paths
 from . import search
+from . import subgraph_view
 from . import utils
 from .group_nodes import *
 from .induce_subgraph import *
 from .leaves import *
+from .motifs import *
 from .paths import *
 from .search import *
+from .subgraph_view import *
 from .utils import *
 
 __all__ = (
     group_nodes.__all__ +
     induce_subgraph.__all__ +
     leaves.__all__ +
+    motifs.__all__ +
     utils.__all__ +
     paths.__all__ +
-    search.__all__
+    search.__all__ +
+    subgraph_view.__all__
 )
@@ -5,6 +5,7 @@ import logging
 from pybel import BELGraph
 from pybel.constants import ANNOTATIONS, PATHOLOGY
 from .paths import get_nodes_in_all_shortest_paths
+from .subgraph_view import SubgraphView
 from .. import pipeline
 from ..filters.edge_filters import filter_edges, build_pmid_inclusion_filter, build_author_inclusion_filter, \
     edge_is_causal, build_annotation_value_filter, build_annotation_dict_filter
@@ -15,12 +16,12 @@ from ..mutation.expansion import expand_node_neighborhood, expand_all_node_neigh
 from ..mutation.highlight import highlight_nodes, highlight_edges
 from ..mutation.merge import left_full_merge
 from ..mutation.utils import remove_isolated_nodes
-from ..summary.edge_summary import get_annotation_values
 
 log = logging.getLogger(__name__)
 
 __all__ = [
     'get_subgraph_by_induction',
+    'get_subgraph_by_edges',
     'get_subgraph_by_edge_filter',
     'get_subgraph_by_node_filter',
     'get_subgraph_by_neighborhood',
@@ -34,6 +35,7 @@ __all__ = [
     'get_subgraph_by_provenance_helper',
     'get_causal_subgraph',
     'get_subgraph',
+    'get_subgraph_from_view',
     'get_subgraphs_by_annotation',
     'get_multi_causal_upstream',
     'get_multi_causal_downstream',
@@ -129,17 +131,38 @@ def get_subgraph_by_second_neighbors(graph, nodes, filter_pathologies=False):
 
 
 @pipeline.mutator
-def get_subgraph_by_all_shortest_paths(graph, nodes, cutoff=None, weight=None):
+def get_subgraph_by_all_shortest_paths(graph, nodes, cutoff=None, weight=None, n_jobs=None):
     """Induces a subgraph over the nodes in the pairwise shortest paths between all of the nodes in the given list
 
     :param pybel.BELGraph graph: A BEL graph
     :param set[tuple] nodes: A set of nodes over which to calculate shortest paths
     :param int cutoff:  Depth to stop the shortest path search. Only paths of length <= cutoff are returned.
     :param str weight: Edge data key corresponding to the edge weight. If None, performs unweighted search
+    :param int n_jobs: The number of worker processes. See :func:`get_nodes_in_all_shortest_paths`
     :return: A BEL graph induced over the nodes appearing in the shortest paths between the given nodes
     :rtype: pybel.BELGraph
     """
-    return graph.subgraph(get_nodes_in_all_shortest_paths(graph, nodes, weight=weight))
+    return graph.subgraph(get_nodes_in_all_shortest_paths(graph, nodes, weight=weight, n_jobs=n_jobs))
+
+
+@pipeline.mutator
+def get_subgraph_by_edges(graph, edges):
+    """Induces a subgraph on the given edges
+
+    :param pybel.BELGraph graph: A BEL graph
+    :param iter[tuple] edges: An iterable of (source, target, key) edges of the graph
+    :return: A BEL subgraph induced over the given edges
+    :rtype: pybel.BELGraph
+    """
+    result = BELGraph()
+
+    for u, v, k in edges:
+        result.add_edge(u, v, key=k, attr_dict=graph.edge[u][v][k])
+
+    for node in result.nodes_iter():
+        result.node[node].update(graph.node[node])
+
+    return result
 
 
 @pipeline.mutator
@@ -188,19 +211,32 @@ def get_subgraph_by_data(graph, annotations):
     return get_subgraph_by_edge_filter(graph, build_annotation_dict_filter(annotations))
 
 
-# FIXME this is currently O(M^2) and can be easily done in O(M)
 def get_subgraphs_by_annotation(graph, annotation='Subgraph'):
-    """Builds a new subgraph induced over all edges for each value in the given annotation.
+    """Builds a new subgraph induced over all edges for each value in the given annotation, in one pass over the edges.
 
     :param pybel.BELGraph graph: A BEL graph
     :param str annotation: The annotation to group by
     :return: A dictionary of {str value: BELGraph subgraph}
     :rtype: dict[str, pybel.BELGraph]
     """
-    return {
-        value: get_subgraph_by_annotation_value(graph, value, annotation=annotation)
-        for value in get_annotation_values(graph, annotation)
-    }
+    result = {}
+
+    for u, v, k, d in graph.edges_iter(keys=True, data=True):
+        if annotation not in d.get(ANNOTATIONS, {}):
+            continue
+
+        value = d[ANNOTATIONS][annotation]
+
+        if value not in result:
+            result[value] = BELGraph()
+
+        result[value].add_edge(u, v, key=k, attr_dict=d)
+
+    for subgraph in result.values():
+        for node in subgraph.nodes_iter():
+            subgraph.node[node].update(graph.node[node])
+
+    return result
 
 
 @pipeline.mutator
@@ -244,11 +280,11 @@ def get_multi_causal_downstream(graph, nbunch):
 
 @pipeline.mutator
 def get_subgraph(graph, seed_method=None, seed_data=None, expand_nodes=None, remove_nodes=None,
-                 filter_pathologies=False, **annotations):
+                 filter_pathologies=False, provenance_index=None, **annotations):
     """Runs pipeline query on graph with multiple subgraph filters and expanders.
 
     Order of Operations:
-    
+
     1. Seeding by given function name and data
     2. Filter by annotations
     3. Add nodes
@@ -262,29 +298,39 @@ def get_subgraph(graph, seed_method=None, seed_data=None, expand_nodes=None, rem
     :param list[tuple] expand_nodes: Add the neighborhoods around all of these nodes
     :param list[tuple] remove_nodes: Remove these nodes and all of their in/out edges
     :param bool filter_pathologies: Should pathology nodes be removed?
+    :param provenance_index: An optional index of the graph's edges used to seed by provenance
+    :type provenance_index: pybel_tools.summary.ProvenanceIndex
     :param dict annotations: Annotation filters (match all with :func:`pybel.utils.subdict_matches`)
     :return: A BEL Graph
     :rtype: pybel.BELGraph
     """
 
-    # Seed by the given function
-    if seed_method == SEED_TYPE_INDUCTION:
-        result = get_subgraph_by_induction(graph, seed_data)
+    # Seeds that only select nodes and edges of the graph are kept as a view, which is materialized once at the end
+    if not seed_method:
+        view = SubgraphView(graph)
+        log.debug('no seed function - using full network: %s', graph.name)
+    elif seed_method == SEED_TYPE_INDUCTION:
+        view = SubgraphView(graph, nodes=seed_data)
     elif seed_method == SEED_TYPE_PATHS:
-        result = get_subgraph_by_all_shortest_paths(graph, seed_data)
+        view = SubgraphView(graph, nodes=get_nodes_in_all_shortest_paths(graph, seed_data))
     elif seed_method == SEED_TYPE_NEIGHBORS:
-        result = get_subgraph_by_neighborhood(graph, seed_data)
-    elif seed_method == SEED_TYPE_PROVENANCE:
-        result = get_subgraph_by_provenance(graph, seed_data)
+        view = SubgraphView.from_neighborhoods(graph, seed_data)
+    else:
+        view = None
+
+    if view is not None:
+        return get_subgraph_from_view(view, expand_nodes=expand_nodes, remove_nodes=remove_nodes,
+                                       filter_pathologies=filter_pathologies, **annotations)
+
+    # Seed by the given function
+    if seed_method == SEED_TYPE_PROVENANCE:
+        result = get_subgraph_by_provenance_helper(graph, provenance_index=provenance_index, **seed_data)
     elif seed_method == SEED_TYPE_DOUBLE_NEIGHBORS:
         result = get_subgraph_by_second_neighbors(graph, seed_data)
     elif seed_method == SEED_TYPE_UPSTREAM:
         result = get_multi_causal_upstream(graph, seed_data)
     elif seed_method == SEED_TYPE_DOWNSTREAM:
         result = get_multi_causal_downstream(graph, seed_data)
-    elif not seed_method:  # Otherwise, don't seed a subgraph
-        result = graph.copy()
-        log.debug('no seed function - using full network: %s', result.name)
     else:
         raise ValueError('Invalid seed method: {}'.format(seed_method))
 
@@ -317,25 +363,72 @@ def get_subgraph(graph, seed_method=None, seed_data=None, expand_nodes=None, rem
     return result
 
 
+def get_subgraph_from_view(view, expand_nodes=None, remove_nodes=None, filter_pathologies=False, **annotations):
+    """Applies the steps of :func:`get_subgraph` after seeding to a view, then materializes it
+
+    :param SubgraphView view: A view of the seeded subgraph
+    :param list[tuple] expand_nodes: Add the neighborhoods around all of these nodes
+    :param list[tuple] remove_nodes: Remove these nodes and all of their in/out edges
+    :param bool filter_pathologies: Should pathology nodes be removed?
+    :param dict annotations: Annotation filters (match all with :func:`pybel.utils.subdict_matches`)
+    :rtype: pybel.BELGraph
+    """
+    if annotations:
+        view.filter_edges(build_annotation_dict_filter({ANNOTATIONS: annotations}))
+        log.debug('view filtered to %s nodes', view.number_of_nodes())
+
+    if expand_nodes:
+        for node in expand_nodes:
+            view.expand_node_neighborhood(node)
+        log.debug('view expanded to %s nodes', view.number_of_nodes())
+
+    if remove_nodes:
+        for node in remove_nodes:
+            if node not in view:
+                log.warning('%s is not in graph %s', node, view.graph.name)
+                continue
+            view.remove_node(node)
+        log.debug('view contracted to %s nodes', view.number_of_nodes())
+
+    if filter_pathologies:
+        log.debug('filtering pathologies + removing isolated nodes')
+        view.remove_nodes_by_function(PATHOLOGY)
+        view.remove_isolated_nodes()
+
+    return view.to_graph()
+
+
 @pipeline.mutator
-def get_subgraph_by_pubmed(graph, pmids):
+def get_subgraph_by_pubmed(graph, pmids, provenance_index=None):
     """Induces a subgraph over the edges retrieved from the given PubMed identifier(s)
 
     :param pybel.BELGraph graph: A BEL graph
     :param str or list[str] pmids: A PubMed identifier or list of PubMed identifiers
+    :param provenance_index: An optional index of the graph's edges. If given, the edges are looked up in it instead
+                             of checking every edge in the graph.
+    :type provenance_index: pybel_tools.summary.ProvenanceIndex
     :rtype: pybel.BELGraph
     """
+    if provenance_index is not None:
+        return get_subgraph_by_edges(graph, provenance_index.get_pmid_edges(pmids))
+
     return get_subgraph_by_edge_filter(graph, build_pmid_inclusion_filter(pmids))
 
 
 @pipeline.mutator
-def get_subgraph_by_authors(graph, authors):
+def get_subgraph_by_authors(graph, authors, provenance_index=None):
     """Induces a subgraph over the edges retrieved publications by the given author(s)
 
     :param pybel.BELGraph graph: A BEL graph
     :param str or list[str] authors: An author or list of authors
+    :param provenance_index: An optional index of the graph's edges. If given, the edges are looked up in it instead
+                             of checking every edge in the graph.
+    :type provenance_index: pybel_tools.summary.ProvenanceIndex
     :rtype: pybel.BELGraph
     """
+    if provenance_index is not None:
+        return get_subgraph_by_edges(graph, provenance_index.get_author_edges(authors))
+
     return get_subgraph_by_edge_filter(graph, build_author_inclusion_filter(authors))
 
 
@@ -353,7 +446,7 @@ def get_subgraph_by_provenance(graph, kwargs):
 
 @pipeline.mutator
 def get_subgraph_by_provenance_helper(graph, pmids=None, authors=None, expand_neighborhoods=True,
-                                      filter_pathologies=False):
+                                      filter_pathologies=False, provenance_index=None):
     """Gets all edges of given provenance and expands around their nodes' neighborhoods
     
     :param pybel.BELGraph graph: A BEL graph
@@ -361,6 +454,8 @@ def get_subgraph_by_provenance_helper(graph, pmids=None, authors=None, expand_ne
     :param str or list[str] authors: An author or list of authors
     :param bool expand_neighborhoods: Should the neighborhoods around all nodes be expanded? Defaults to ``True``
     :param bool filter_pathologies: Should expansion take place around pathologies?
+    :param provenance_index: An optional index of the graph's edges used to look up the edges of the given provenance
+    :type provenance_index: pybel_tools.summary.ProvenanceIndex
     :return: An induced graph
     :rtype: pybel.BELGraph
     """
@@ -370,10 +465,10 @@ def get_subgraph_by_provenance_helper(graph, pmids=None, authors=None, expand_ne
     result = BELGraph()
 
     if pmids:
-        left_full_merge(result, get_subgraph_by_pubmed(graph, pmids))
+        left_full_merge(result, get_subgraph_by_pubmed(graph, pmids, provenance_index=provenance_index))
 
     if authors:
-        left_full_merge(result, get_subgraph_by_authors(graph, authors))
+        left_full_merge(result, get_subgraph_by_authors(graph, authors, provenance_index=provenance_index))
 
     highlight_nodes(result)
     highlight_edges(result)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains functions for enumerating the triangles of undirected graphs and the 3-cycles of directed
+graphs, like the correlation triangles and the causal cycles in :mod:`pybel_tools.analysis.stability`.
+
+The nodes are ranked by their degree and each edge is oriented from its lower to its higher ranked node. Each motif is
+then found exactly once from its lowest ranked node by intersecting sorted arrays of higher ranked neighbors, so the
+neighbors of hubs are never paired up. The adjacency is kept in flat integer arrays and the motifs are streamed, so
+graphs with millions of edges can be scanned without building their results in memory.
+"""
+
+import numpy as np
+
+__all__ = [
+    'iter_triangle_indices',
+    'iter_3_cycle_indices',
+    'iter_triangles',
+    'iter_3_cycles',
+]
+
+
+def _get_unique_edges(number_nodes, sources, targets):
+    """Removes the self-loops and the duplicate edges
+
+    :param int number_nodes: The number of nodes
+    :param numpy.ndarray sources: The indices of the source node of each edge
+    :param numpy.ndarray targets: The indices of the target node of each edge
+    :return: The sources and targets of the unique edges, sorted by source then target
+    :rtype: tuple[numpy.ndarray,numpy.ndarray]
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+
+    mask = sources != targets
+    keys = np.unique(sources[mask] * number_nodes + targets[mask])
+
+    return keys // number_nodes, keys % number_nodes
+
+
+def _rank_by_degree(number_nodes, sources, targets):
+    """Relabels the nodes by their rank in the order of their degrees
+
+    :return: The ranks of the sources, the ranks of the targets, and the index of the node with each rank
+    :rtype: tuple[numpy.ndarray,numpy.ndarray,numpy.ndarray]
+    """
+    degrees = np.bincount(sources, minlength=number_nodes) + np.bincount(targets, minlength=number_nodes)
+    order = np.argsort(degrees, kind='mergesort')
+
+    ranks = np.empty(number_nodes, dtype=np.int64)
+    ranks[order] = np.arange(number_nodes, dtype=np.int64)
+
+    return ranks[sources], ranks[targets], order
+
+
+def _to_csr(number_nodes, sources, targets):
+    """Builds the sorted arrays of the targets of each source
+
+    :return: The offsets of each source's targets and the targets
+    :rtype: tuple[numpy.ndarray,numpy.ndarray]
+    """
+    keys = np.unique(sources * number_nodes + targets)
+
+    indptr = np.zeros(number_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // number_nodes, minlength=number_nodes), out=indptr[1:])
+
+    return indptr, keys % number_nodes
+
+
+def _intersect_sorted(a, b):
+    """Intersects two sorted arrays of unique integers by searching for the elements of the shorter one in the longer
+    one
+
+    :type a: numpy.ndarray
+    :type b: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+    if len(a) > len(b):
+        a, b = b, a
+
+    if not len(a):
+        return a
+
+    positions = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[positions] == a]
+
+
+def iter_triangle_indices(number_nodes, sources, targets):
+    """Iterates over the triangles of an undirected graph given by the indices of its nodes. The direction of the
+    edges, self-loops, and duplicate edges are disregarded.
+
+    :param int number_nodes: The number of nodes
+    :param sources: The index of the source node of each edge
+    :type sources: iter[int] or numpy.ndarray
+    :param targets: The index of the target node of each edge
+    :type targets: iter[int] or numpy.ndarray
+    :return: An iterable of triples of node indices. Each triangle is yielded once.
+    :rtype: iter[tuple[int,int,int]]
+    """
+    if number_nodes < 3:
+        return
+
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    sources, targets = _get_unique_edges(number_nodes, np.minimum(sources, targets), np.maximum(sources, targets))
+
+    source_ranks, target_ranks, order = _rank_by_degree(number_nodes, sources, targets)
+    indptr, forward = _to_csr(
+        number_nodes,
+        np.minimum(source_ranks, target_ranks),
+        np.maximum(source_ranks, target_ranks)
+    )
+    order = order.tolist()
+
+    for a in range(number_nodes):
+        a_forward = forward[indptr[a]:indptr[a + 1]]
+
+        if len(a_forward) < 2:
+            continue
+
+        for b in a_forward[:-1].tolist():
+            for c in _intersect_sorted(a_forward, forward[indptr[b]:indptr[b + 1]]).tolist():
+                yield order[a], order[b], order[c]
+
+
+def iter_3_cycle_indices(number_nodes, sources, targets):
+    """Iterates over the 3-cycles of a directed graph given by the indices of its nodes. Self-loops and duplicate
+    edges are disregarded.
+
+    :param int number_nodes: The number of nodes
+    :param sources: The index of the source node of each edge
+    :type sources: iter[int] or numpy.ndarray
+    :param targets: The index of the target node of each edge
+    :type targets: iter[int] or numpy.ndarray
+    :return: An iterable of triples of node indices (A, B, C) where A points to B, B to C, and C to A. Each set of
+             nodes is yielded once, even if it forms cycles in both directions.
+    :rtype: iter[tuple[int,int,int]]
+    """
+    if number_nodes < 3:
+        return
+
+    sources, targets = _get_unique_edges(number_nodes, sources, targets)
+    source_ranks, target_ranks, order = _rank_by_degree(number_nodes, sources, targets)
+
+    successor_indptr, successors = _to_csr(number_nodes, source_ranks, target_ranks)
+    predecessor_indptr, predecessors = _to_csr(number_nodes, target_ranks, source_ranks)
+    order = order.tolist()
+
+    for a in range(number_nodes):
+        a_successors = successors[successor_indptr[a]:successor_indptr[a + 1]]
+        a_predecessors = predecessors[predecessor_indptr[a]:predecessor_indptr[a + 1]]
+
+        # Only looks for cycles in which this node has the lowest rank
+        a_successors = a_successors[np.searchsorted(a_successors, a, side='right'):]
+        a_predecessors = a_predecessors[np.searchsorted(a_predecessors, a, side='right'):]
+
+        if not len(a_successors) or not len(a_predecessors):
+            continue
+
+        seen = set()
+
+        for b in a_successors.tolist():
+            b_successors = successors[successor_indptr[b]:successor_indptr[b + 1]]
+
+            for c in _intersect_sorted(b_successors, a_predecessors).tolist():
+                key = (b, c) if b < c else (c, b)
+
+                if key in seen:
+                    continue
+
+                seen.add(key)
+                yield order[a], order[b], order[c]
+
+
+def _index_edges(graph):
+    """Gets the nodes of a graph and the indices of the nodes of each edge
+
+    :param networkx.Graph graph: A graph
+    :rtype: tuple[list,numpy.ndarray,numpy.ndarray]
+    """
+    nodes = graph.nodes()
+    index = {node: i for i, node in enumerate(nodes)}
+    number_edges = graph.number_of_edges()
+
+    sources = np.fromiter((index[u] for u, _ in graph.edges_iter()), dtype=np.int64, count=number_edges)
+    targets = np.fromiter((index[v] for _, v in graph.edges_iter()), dtype=np.int64, count=number_edges)
+
+    return nodes, sources, targets
+
+
+def iter_triangles(graph):
+    """Iterates over the triangles of a graph, disregarding the direction of its edges
+
+    :param networkx.Graph graph: A graph
+    :return: An iterable of triples of nodes. Each triangle is yielded once.
+    :rtype: iter[tuple]
+    """
+    nodes, sources, targets = _index_edges(graph)
+
+    for a, b, c in iter_triangle_indices(len(nodes), sources, targets):
+        yield nodes[a], nodes[b], nodes[c]
+
+
+def iter_3_cycles(graph):
+    """Iterates over the 3-cycles of a directed graph
+
+    :param networkx.DiGraph graph: A directed graph
+    :return: An iterable of triples of nodes (A, B, C) where A points to B, B to C, and C to A. Each set of nodes is
+             yielded once.
+    :rtype: iter[tuple]
+    """
+    nodes, sources, targets = _index_edges(graph)
+
+    for a, b, c in iter_3_cycle_indices(len(nodes), sources, targets):
+        yield nodes[a], nodes[b], nodes[c]
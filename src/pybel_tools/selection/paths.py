@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
-
 import itertools as itt
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 from itertools import product, tee
+from operator import itemgetter
 
 import networkx as nx
 from networkx import all_shortest_paths
@@ -11,10 +15,16 @@ from pybel.constants import *
 
 __all__ = [
     'get_nodes_in_all_shortest_paths',
+    'get_shortest_paths_between_node_sets',
     'get_shortest_directed_path_between_subgraphs',
     'get_shortest_undirected_path_between_subgraphs',
+    'get_undirected_adjacency',
+    'iter_simple_paths',
+    'get_ranked_paths',
 ]
 
+log = logging.getLogger(__name__)
+
 default_edge_ranking = {
     INCREASES: 2,
     DIRECTLY_INCREASES: 3,
@@ -48,67 +58,301 @@ def pairwise(iterable):
     return zip(a, b)
 
 
-def rank_path(graph, path, edge_ranking=None):
+def _iter_edge_data(graph, u, v, undirected=False):
+    """Iterates over the data dictionaries of the edges from u to v, and from v to u too if undirected
+
+    :rtype: iter[dict]
+    """
+    if v in graph.edge[u]:
+        yield from graph.edge[u][v].values()
+
+    if undirected and u in graph.edge[v]:
+        yield from graph.edge[v][u].values()
+
+
+def rank_path(graph, path, edge_ranking=None, undirected=False):
     """Takes in a path (a list of nodes in the graph) and calculates a score
 
     :param pybel.BELGraph graph: A BEL graph
     :param list[tuple] path: A list of nodes in the path (includes terminal nodes)
-    :param dict edge_ranking: A dictionary of {relationship: score}
+    :param dict edge_ranking: A dictionary of {relationship: score}. Relationships not in it score 0.
+    :param bool undirected: Can the path go against the direction of the edges, like the paths from
+                            :func:`iter_simple_paths` over :func:`get_undirected_adjacency`?
     :return: The score for the edge
     :rtype: int
     """
     edge_ranking = default_edge_ranking if edge_ranking is None else edge_ranking
 
-    return sum(max(edge_ranking[d[RELATION]] for d in graph.edge[u][v].values()) for u, v in pairwise(path))
+    return sum(
+        max(edge_ranking.get(d[RELATION], 0) for d in _iter_edge_data(graph, u, v, undirected=undirected))
+        for u, v in pairwise(path)
+    )
+
+
+def _get_shortest_path_predecessors(graph, source, targets):
+    """Runs a breadth-first search from the source and records the predecessors of each node on the shortest paths
+    to it. The search stops after the level at which the last reachable target was found.
+
+    :param networkx.Graph graph: A graph
+    :param tuple source: The node to search from
+    :param set[tuple] targets: The nodes to search for
+    :return: A dictionary of {node: list of its predecessors on the shortest paths from the source}
+    :rtype: dict[tuple,list[tuple]]
+    """
+    predecessors = {source: []}
+    remaining = set(targets)
+    remaining.discard(source)
+
+    level = [source]
+
+    while level and remaining:
+        next_level = set()
 
+        for u in level:
+            for v in graph.edge[u]:
+                if v not in predecessors:
+                    predecessors[v] = [u]
+                    next_level.add(v)
+                elif v in next_level:
+                    predecessors[v].append(u)
+
+        remaining -= next_level
+        level = next_level
+
+    return predecessors
+
+
+def _get_nodes_on_paths_to(predecessors, targets):
+    """Walks the predecessors back from the reachable targets to find all nodes on the shortest paths to them
+
+    :param dict[tuple,list[tuple]] predecessors: The predecessors from :func:`_get_shortest_path_predecessors`
+    :param iter[tuple] targets: The nodes the paths lead to
+    :rtype: set[tuple]
+    """
+    stack = [target for target in targets if target in predecessors]
+    result = set(stack)
+
+    while stack:
+        for u in predecessors[stack.pop()]:
+            if u not in result:
+                result.add(u)
+                stack.append(u)
+
+    return result
+
+
+def _get_nodes_in_shortest_paths_from_sources(graph, sources, targets):
+    """Gets the nodes on all shortest paths from each of the sources to any of the targets. This is the task run by
+    the worker processes of :func:`get_nodes_in_all_shortest_paths`.
+
+    :param networkx.Graph graph: A graph
+    :param list[tuple] sources: The nodes to search from
+    :param set[tuple] targets: The nodes to search for
+    :rtype: set[tuple]
+    """
+    result = set()
 
-def get_nodes_in_all_shortest_paths(graph, nodes, weight=None):
-    """Gets all shortest paths from all nodes to all other nodes in the given list and returns the set of all nodes 
-    contained in those paths using :func:`networkx.all_shortest_paths`.
+    for source in sources:
+        predecessors = _get_shortest_path_predecessors(graph, source, targets)
+        result |= _get_nodes_on_paths_to(predecessors, targets)
+
+    return result
+
+
+def get_nodes_in_all_shortest_paths(graph, nodes, weight=None, n_jobs=None):
+    """Gets all shortest paths from all nodes to all other nodes in the given list and returns the set of all nodes
+    contained in those paths. Pairs of nodes without a path between them and nodes that aren't in the graph are
+    skipped.
+
+    Without weights, a single breadth-first search is run from each node, which records the predecessors of the nodes
+    on the shortest paths from it. All nodes on the shortest paths to the other nodes are then collected by one
+    backwards pass over the predecessors. With weights, :func:`networkx.all_shortest_paths` is used for each pair.
 
     :param pybel.BELGraph graph: A BEL graph
     :param iter[tuple] nodes: The list of nodes to use to use to find all shortest paths
-    :param int cutoff:  Depth to stop the search. Only paths of length <= cutoff are returned.
     :param str weight: Edge data key corresponding to the edge weight. If none, uses unweighted search.
+    :param n_jobs: The number of worker processes to split the unweighted searches over. Defaults to 1, which runs
+                   everything in this process. Use -1 for the number of CPUs.
+    :type n_jobs: int
     :return: A set of nodes appearing in the shortest paths between nodes in the BEL graph
     :rtype: set
+    """
+    nodes = [node for node in set(nodes) if node in graph]
+
+    if weight is not None:
+        return _get_nodes_in_all_weighted_shortest_paths(graph, nodes, weight)
+
+    targets = set(nodes)
+    n_jobs = multiprocessing.cpu_count() if n_jobs is not None and n_jobs < 0 else n_jobs
+
+    if n_jobs is None or n_jobs <= 1 or len(nodes) <= 1:
+        return _get_nodes_in_shortest_paths_from_sources(graph, nodes, targets)
+
+    # The graph is sent once with each chunk of sources, so there are only as many chunks as workers
+    chunks = [nodes[i::n_jobs] for i in range(n_jobs) if nodes[i::n_jobs]]
+
+    result = set()
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        futures = [
+            executor.submit(_get_nodes_in_shortest_paths_from_sources, graph, chunk, targets)
+            for chunk in chunks
+        ]
+
+        for future in futures:
+            result |= future.result()
+
+    return result
+
+
+def _get_nodes_in_all_weighted_shortest_paths(graph, nodes, weight):
+    """Gets the nodes in the weighted shortest paths between all pairs of the given nodes with
+    :func:`networkx.all_shortest_paths`, skipping pairs without a path
+
+    :rtype: set
+    """
+    result = set()
+
+    for u, v in product(nodes, repeat=2):
+        try:
+            for path in all_shortest_paths(graph, u, v, weight=weight):
+                result.update(path)
+        except nx.NetworkXNoPath:
+            continue
 
-    .. note:: This can be trivially parallelized using :func:`networkx.single_source_shortest_path`
+    return result
+
+
+def _iter_neighbors(graph, node, undirected=False):
+    """Iterates over the successors of a node, and over its predecessors too if undirected, without copying the graph
+
+    :param networkx.DiGraph graph: A directed graph
+    :param tuple node: A node in the graph
+    :param bool undirected: Should the predecessors be included?
+    :rtype: iter[tuple]
     """
-    return {node
-            for u, v in product(nodes, repeat=2)
-            for path in all_shortest_paths(graph, u, v, weight=weight)
-            for node in path}
+    if not undirected:
+        return iter(graph.edge[node])
 
+    return itt.chain(graph.edge[node], (u for u in graph.pred[node] if u not in graph.edge[node]))
 
-# TODO consider all shortest paths?
-def _get_shortest__path_between_subgraphs_helper(graph, a, b):
-    """Calculate the shortest path that occurs between two disconnected subgraphs A and B going through nodes in
-    the source graph
 
-    :param graph: A graph
-    :type graph: nx.MultiGraph
+def _get_multi_source_predecessors(graph, sources, targets, undirected=False, all_paths=False):
+    """Runs one breadth-first search from all sources at once, like from a super-source connected to each of them, and
+    stops at the first level containing any target, like at a super-sink connected to each of them
+
+    :param networkx.DiGraph graph: A directed graph
+    :param set[tuple] sources: The nodes to search from
+    :param set[tuple] targets: The nodes to search for. Should be disjoint from the sources.
+    :param bool undirected: Should edges be followed in both directions?
+    :param bool all_paths: Should all predecessors on the shortest paths be kept, instead of only the first one found?
+    :return: The predecessors of the visited nodes and the targets reached at the minimal distance
+    :rtype: tuple[dict[tuple,list[tuple]],list[tuple]]
+    """
+    predecessors = {source: [] for source in sources}
+    level = list(sources)
+
+    while level:
+        next_level = []
+        next_level_set = set()
+
+        for u in level:
+            for v in _iter_neighbors(graph, u, undirected=undirected):
+                if v not in predecessors:
+                    predecessors[v] = [u]
+                    next_level.append(v)
+                    next_level_set.add(v)
+                elif all_paths and v in next_level_set:
+                    predecessors[v].append(u)
+
+        found = [v for v in next_level if v in targets]
+
+        if found:
+            return predecessors, found
+
+        level = next_level
+
+    return predecessors, []
+
+
+def _iter_paths_to(predecessors, target):
+    """Iterates over the paths to the given target along the predecessors, from the sources they start at
+
+    :param dict[tuple,list[tuple]] predecessors: The predecessors from :func:`_get_multi_source_predecessors`
+    :param tuple target: A reached target
+    :rtype: iter[list[tuple]]
+    """
+    stack = [[target]]
+
+    while stack:
+        reversed_path = stack.pop()
+        node_predecessors = predecessors[reversed_path[-1]]
+
+        if not node_predecessors:
+            yield reversed_path[::-1]
+            continue
+
+        for u in node_predecessors:
+            stack.append(reversed_path + [u])
+
+
+def get_shortest_paths_between_node_sets(graph, sources, targets, undirected=False, all_paths=False):
+    """Gets the shortest paths from any of the sources to any of the targets with a single breadth-first search
+
+    :param networkx.DiGraph graph: A directed graph
+    :param iter[tuple] sources: The nodes to search from
+    :param iter[tuple] targets: The nodes to search for. Should be disjoint from the sources.
+    :param bool undirected: Should the directionality of the edges be disregarded?
+    :param bool all_paths: Should all shortest paths be returned? If false, returns one path for each target reached
+                           at the minimal distance.
+    :return: A list of the shortest paths, which all have the same length, or an empty list if no target is reachable
+    :rtype: list[list[tuple]]
+    """
+    sources = {node for node in sources if node in graph}
+    targets = {node for node in targets if node in graph}
+
+    predecessors, found = _get_multi_source_predecessors(graph, sources, targets, undirected=undirected,
+                                                         all_paths=all_paths)
+
+    if all_paths:
+        return [path for target in found for path in _iter_paths_to(predecessors, target)]
+
+    return [next(_iter_paths_to(predecessors, target)) for target in found]
+
+
+def _get_shortest_path_between_subgraphs_helper(graph, a, b, undirected=False, all_paths=False):
+    """Calculate the shortest paths that occur between two disconnected subgraphs A and B going through nodes in
+    the source graph, with one search from A to B and one from B to A
+
+    :param networkx.DiGraph graph: A directed graph
     :param a: A subgraph of :code:`graph`, disjoint from :code:`b`
     :type a: nx.MultiGraph
     :param b: A subgraph of :code:`graph`, disjoint from :code:`a`
     :type b: nx.MultiGraph
+    :param bool undirected: Should the directionality of the edges be disregarded?
+    :param bool all_paths: Should all shortest paths be returned?
     :return: A list of the shortest paths between the two subgraphs
     :rtype: list
     """
-    shortest_paths = []
+    a_b_shortest_paths = get_shortest_paths_between_node_sets(graph, a.nodes_iter(), b.nodes_iter(),
+                                                              undirected=undirected, all_paths=all_paths)
 
-    for na, nb in itt.product(a.nodes_iter(), b.nodes_iter()):
-        a_b_shortest_path = nx.shortest_path(graph, na, nb)
-        shortest_paths.append(a_b_shortest_path)
+    if undirected:
+        # Without directions, the paths from B to A are the paths from A to B in reverse
+        b_a_shortest_paths = [path[::-1] for path in a_b_shortest_paths]
+    else:
+        b_a_shortest_paths = get_shortest_paths_between_node_sets(graph, b.nodes_iter(), a.nodes_iter(),
+                                                                  all_paths=all_paths)
 
-        b_a_shortest_path = nx.shortest_path(graph, nb, na)
-        shortest_paths.append(b_a_shortest_path)
+    shortest_paths = a_b_shortest_paths + b_a_shortest_paths
+
+    if not shortest_paths:
+        return []
 
     min_len = min(map(len, shortest_paths))
     return [p for p in shortest_paths if len(p) == min_len]
 
 
-def get_shortest_directed_path_between_subgraphs(graph, a, b):
+def get_shortest_directed_path_between_subgraphs(graph, a, b, all_paths=False):
     """Calculate the shortest path that occurs between two disconnected subgraphs A and B going through nodes in
     the source graph
 
@@ -117,13 +361,15 @@ def get_shortest_directed_path_between_subgraphs(graph, a, b):
     :type a: pybel.BELGraph
     :param b: A subgraph of :code:`graph`, disjoint from :code:`a`
     :type b: pybel.BELGraph
+    :param bool all_paths: Should all shortest paths be returned? If false, returns one for each node reached at the
+                           minimal distance.
     :return: A list of the shortest paths between the two subgraphs
     :rtype: list
     """
-    return _get_shortest__path_between_subgraphs_helper(graph, a, b)
+    return _get_shortest_path_between_subgraphs_helper(graph, a, b, all_paths=all_paths)
 
 
-def get_shortest_undirected_path_between_subgraphs(graph, a, b):
+def get_shortest_undirected_path_between_subgraphs(graph, a, b, all_paths=False):
     """Get the shortest path between two disconnected subgraphs A and B, disregarding directionality of edges in graph
 
     :param pybel.BELGraph graph: A BEL graph
@@ -131,11 +377,125 @@ def get_shortest_undirected_path_between_subgraphs(graph, a, b):
     :type a: pybel.BELGraph
     :param b: A subgraph of :code:`graph`, disjoint from :code:`a`
     :type b: pybel.BELGraph
+    :param bool all_paths: Should all shortest paths be returned? If false, returns one for each node reached at the
+                           minimal distance.
     :return: A list of the shortest paths between the two subgraphs
     :rtype: list
     """
-    ug = graph.to_undirected()
-    return _get_shortest__path_between_subgraphs_helper(ug, a, b)
+    return _get_shortest_path_between_subgraphs_helper(graph, a, b, undirected=True, all_paths=all_paths)
+
+
+def get_undirected_adjacency(graph):
+    """Builds the neighbors of each node disregarding the direction of the edges. Unlike
+    :meth:`networkx.DiGraph.to_undirected`, it doesn't copy the nodes' and edges' data, so it can be precomputed and
+    kept alongside the graph for undirected searches.
+
+    :param networkx.DiGraph graph: A directed graph
+    :return: A dictionary of {node: set of neighboring nodes}
+    :rtype: dict[tuple,set[tuple]]
+    """
+    return {
+        node: set(graph.edge[node]).union(graph.pred[node])
+        for node in graph.nodes_iter()
+    }
+
+
+def iter_simple_paths(adjacency, source, target, cutoff=None, max_paths=None, time_budget=None):
+    """Iterates over the simple paths from the source to the target in depth-first order, like
+    :func:`networkx.all_simple_paths`, but stops after a given number of paths or a given time so that hub-rich graphs
+    can't make it run away.
+
+    :param dict adjacency: A dictionary of {node: iterable of neighbors}, like :code:`graph.edge` for following the
+                           direction of the edges or the result of :func:`get_undirected_adjacency` for disregarding it
+    :param tuple source: The node to start from
+    :param tuple target: The node to end at
+    :param int cutoff: The maximum number of edges in a path. If none, paths can have any length.
+    :param int max_paths: The maximum number of paths to yield. If none, yields all of them.
+    :param float time_budget: The number of seconds after which to stop looking for more paths. If none, doesn't stop.
+    :rtype: iter[list[tuple]]
+    """
+    if source == target or source not in adjacency or target not in adjacency:
+        return
+
+    cutoff = len(adjacency) - 1 if cutoff is None else cutoff
+
+    if cutoff < 1 or (max_paths is not None and max_paths < 1):
+        return
+
+    deadline = None if time_budget is None else time.time() + time_budget
+
+    visited = [source]
+    on_path = {source}
+    stack = [iter(adjacency[source])]
+    count = 0
+    steps = 0
+
+    while stack:
+        steps += 1
+        if deadline is not None and steps % 1000 == 0 and time.time() > deadline:
+            log.info('stopped looking for paths from %s to %s after %s seconds', source, target, time_budget)
+            return
+
+        child = next(stack[-1], None)
+
+        if child is None:
+            stack.pop()
+            on_path.discard(visited.pop())
+            continue
+
+        if child == target:
+            yield visited + [target]
+        elif child in on_path or len(visited) >= cutoff:
+            continue
+        elif len(visited) + 1 == cutoff:
+            # Only the target can end a path from here, so check for it instead of going deeper
+            if target not in adjacency[child]:
+                continue
+
+            yield visited + [child, target]
+        else:
+            visited.append(child)
+            on_path.add(child)
+            stack.append(iter(adjacency[child]))
+            continue
+
+        count += 1
+        if max_paths is not None and count >= max_paths:
+            return
+
+
+def get_ranked_paths(graph, source, target, cutoff=None, max_paths=None, time_budget=None, undirected=False,
+                     adjacency=None, edge_ranking=None):
+    """Gets a bounded number of simple paths from the source to the target with :func:`iter_simple_paths`, from the
+    highest to the lowest score from :func:`rank_path`. Paths with the same score are ordered by their length.
+
+    :param pybel.BELGraph graph: A BEL graph
+    :param tuple source: The node to start from
+    :param tuple target: The node to end at
+    :param int cutoff: The maximum number of edges in a path. If none, paths can have any length.
+    :param int max_paths: The maximum number of paths to find. If none, finds all of them.
+    :param float time_budget: The number of seconds after which to stop looking for more paths. If none, doesn't stop.
+    :param bool undirected: Should the directionality of the edges be disregarded?
+    :param dict adjacency: The precomputed result of :func:`get_undirected_adjacency` for the graph. Only used if
+                           undirected. If none, it's computed.
+    :param dict edge_ranking: A dictionary of {relationship: score} for :func:`rank_path`
+    :rtype: list[list[tuple]]
+    """
+    if not undirected:
+        adjacency = graph.edge
+    elif adjacency is None:
+        adjacency = get_undirected_adjacency(graph)
+
+    paths = iter_simple_paths(adjacency, source, target, cutoff=cutoff, max_paths=max_paths,
+                              time_budget=time_budget)
+
+    scored_paths = [
+        (-rank_path(graph, path, edge_ranking=edge_ranking, undirected=undirected), len(path), path)
+        for path in paths
+    ]
+    scored_paths.sort(key=itemgetter(0, 1))
+
+    return [path for _, _, path in scored_paths]
 
 
 def find_root_in_path(graph, path_nodes):
@@ -25,7 +25,7 @@ def all_edges_consistent(graph):
 
 
 @pipeline.mutator
-def rewire_targets(graph, p):
+def rewire_targets(graph, p, seed=None):
     """Rewires a graph's edges' target nodes
 
 
@@ -34,23 +34,29 @@ def rewire_targets(graph, p):
 
     :param pybel.BELGraph graph: A BEL graph
     :param p: The probability of rewiring
+    :param seed: The seed for a reproducible rewiring. To make many independent permutations, use a different seed for
+                 each, like the ones from :func:`pybel_tools.analysis.npa.get_run_seed`. Defaults to using the
+                 :mod:`random` module.
+    :type seed: int
     :return: A rewired BEL graph
     """
 
     if not all_edges_consistent(graph):
         raise ValueError('{} is not consistent'.format(graph))
 
+    rng = random if seed is None else random.Random(seed)
+
     result = graph.copy()
     nodes = result.nodes()
 
     for u, v in result.edges():
-        if random.random() < p:
+        if rng.random() < p:
             continue
 
-        w = random.choice(nodes)
+        w = rng.choice(nodes)
 
         while w == u or result.has_edge(u, w):
-            w = random.choice(nodes)
+            w = rng.choice(nodes)
 
         result.add_edge(w, v)
         result.remove_edge(u, v)
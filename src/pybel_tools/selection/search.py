@@ -1,33 +1,266 @@
 # -*- coding: utf-8 -*-
 
+import heapq
+import threading
+from operator import itemgetter
+
+from pybel.constants import NAME
 from ..filters.node_filters import filter_nodes, build_node_name_search, build_node_cname_search
+from ..summary.provenance_index import PrefixIndex
 
 __all__ = [
+    'NodeTextIndex',
     'search_node_names',
     'search_node_cnames'
 ]
 
+#: Queries shorter than this are looked up by the beginning of the words of the texts instead of by trigrams
+TRIGRAM_LENGTH = 3
+
+
+def _iter_trigrams(text):
+    """Iterates over the substrings of length three of a string
+
+    :param str text: A string
+    :rtype: iter[str]
+    """
+    for i in range(len(text) - TRIGRAM_LENGTH + 1):
+        yield text[i:i + TRIGRAM_LENGTH]
+
+
+class NodeTextIndex:
+    """An index of texts describing nodes, like their names, canonical names, or BEL strings, for finding the nodes
+    whose texts contain a given string without checking every node.
+
+    Each text's lowercase trigrams are kept in postings of {trigram: set of nodes}, so the nodes containing a string of
+    three or more characters are found by intersecting the postings of its trigrams and checking the few remaining
+    candidates. Shorter strings are looked up by the beginning of the texts' words in a :class:`PrefixIndex`. Nodes
+    and texts can be added at any time, including while another thread searches the index.
+    """
+
+    def __init__(self):
+        #: A dictionary of {node: list of lowercase texts}
+        self.node_texts = {}
+
+        #: A dictionary of {str trigram: set of nodes}
+        self.trigram_nodes = {}
+
+        self._prefixes = PrefixIndex(words=True)
+
+        #: A dictionary of {str lowercase text: set of nodes}, used to look up the results of the prefix index
+        self._text_nodes = {}
+
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_graph(cls, graph, key=NAME):
+        """Indexes the given entry of each node's data dictionary
+
+        :param pybel.BELGraph graph: A BEL graph
+        :param str key: The key for the node data dictionary. Should refer only to entries that have str values
+        :rtype: NodeTextIndex
+        """
+        index = cls()
+
+        for node, data in graph.nodes_iter(data=True):
+            if key in data:
+                index.add(node, [data[key]])
+
+        return index
+
+    def __len__(self):
+        return len(self.node_texts)
+
+    def add(self, node, texts):
+        """Adds texts describing a node to the index
+
+        :param node: A node or node identifier
+        :param iter[str] texts: An iterable of texts, like the node's name and its BEL string
+        """
+        with self._lock:
+            self._add(node, texts)
+
+    def _add(self, node, texts):
+        node_texts = self.node_texts.setdefault(node, [])
+
+        for text in texts:
+            if not text:
+                continue
+
+            text = text.lower()
+
+            if text in node_texts:
+                continue
+
+            node_texts.append(text)
+
+            for trigram in _iter_trigrams(text):
+                self.trigram_nodes.setdefault(trigram, set()).add(node)
+
+            self._prefixes.add(text)
+            self._text_nodes.setdefault(text, set()).add(node)
+
+    def _get_candidates(self, query):
+        """Gets the nodes having all trigrams of a query of at least three characters
+
+        :param str query: A lowercase query
+        :rtype: set
+        """
+        postings = []
+
+        for trigram in set(_iter_trigrams(query)):
+            nodes = self.trigram_nodes.get(trigram)
 
-def search_node_names(graph, query):
+            if not nodes:
+                return set()
+
+            postings.append(nodes)
+
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def find(self, query):
+        """Finds the nodes with a text containing the given string, like :func:`search_node_names`. Strings shorter than
+        three characters are checked against every text.
+
+        :param query: The search query, or an iterable of queries of which any has to match
+        :type query: str or iter[str]
+        :rtype: set
+        """
+        queries = [query] if isinstance(query, str) else query
+
+        with self._lock:
+            result = set()
+            for q in queries:
+                result |= self._find(q)
+            return result
+
+    def _find(self, query):
+        query = query.lower()
+
+        if len(query) < TRIGRAM_LENGTH:
+            candidates = self.node_texts
+        else:
+            candidates = self._get_candidates(query)
+
+        return {
+            node
+            for node in candidates
+            if any(query in text for text in self.node_texts[node])
+        }
+
+    @staticmethod
+    def _rank(query, texts):
+        """Ranks how well a node's texts match a query, where smaller is better. Texts equal to the query come first,
+        then texts starting with it, then texts with a word starting with it, then texts containing it. Ties are
+        broken by the length of the text.
+
+        :rtype: tuple[int,int]
+        """
+        best = None
+
+        for text in texts:
+            position = text.find(query)
+
+            if position == -1:
+                continue
+
+            if text == query:
+                rank = 0
+            elif position == 0:
+                rank = 1
+            elif not text[position - 1].isalnum():
+                rank = 2
+            else:
+                rank = 3
+
+            if best is None or (rank, len(text)) < best:
+                best = rank, len(text)
+
+        return best
+
+    def search(self, query, offset=0, limit=None):
+        """Finds the nodes matching the given string and ranks them, for suggesting nodes as a query is typed.
+
+        Strings of three or more characters match nodes with a text containing them. Shorter strings only match nodes
+        with a word in a text starting with them, since almost every text contains them.
+
+        :param str query: The search query
+        :param int offset: The number of best matching nodes to skip, for pagination
+        :param int limit: The maximum number of nodes to return. If none, returns all of them.
+        :return: A list of nodes, from the best to the worst match
+        :rtype: list
+        """
+        query = query.lower()
+
+        if not query:
+            return []
+
+        with self._lock:
+            ranked = self._get_ranked(query)
+
+        key = itemgetter(0, 1)
+
+        if limit is None:
+            ranked.sort(key=key)
+            return [node for _, _, node in ranked[offset:]]
+
+        return [node for _, _, node in heapq.nsmallest(offset + limit, ranked, key=key)[offset:]]
+
+    def _get_ranked(self, query):
+        """Gets the (rank, first text, node) tuples of the nodes matching a lowercase query
+
+        :param str query: A lowercase query
+        :rtype: list[tuple]
+        """
+        if len(query) < TRIGRAM_LENGTH:
+            candidates = {
+                node
+                for text in self._prefixes.search(query)
+                for node in self._text_nodes[text]
+            }
+        else:
+            candidates = self._get_candidates(query)
+
+        ranked = []
+        for node in candidates:
+            rank = self._rank(query, self.node_texts[node])
+            if rank is not None:
+                ranked.append((rank, min(self.node_texts[node]), node))
+
+        return ranked
+
+
+def search_node_names(graph, query, node_index=None):
     """Searches for nodes containing a given string
 
     :param pybel.BELGraph graph: A BEL graph
     :param query: The search query
     :type query: str or iter[str]
+    :param NodeTextIndex node_index: An optional index of the names of the graph's nodes, from
+                                     :meth:`NodeTextIndex.from_graph`. If given, the nodes are looked up in it instead
+                                     of checking every node.
     :return: An iterator over nodes whose names match the search query
     :rtype: iter
     """
+    if node_index is not None:
+        return iter(node_index.find(query))
 
     return filter_nodes(graph, build_node_name_search(query))
 
 
-def search_node_cnames(graph, query):
+def search_node_cnames(graph, query, node_index=None):
     """Searches for nodes whose canonical names contain a given string(s)
 
     :param pybel.BELGraph graph: A BEL graph
     :param query: The search query
     :type query: str or iter[str]
+    :param NodeTextIndex node_index: An optional index of the canonical names of the graph's nodes, from
+                                     :meth:`NodeTextIndex.from_graph` with :data:`pybel_tools.constants.CNAME`
     :return: An iterator over nodes whose canonical names match the search query
     :rtype: iter
     """
+    if node_index is not None:
+        return iter(node_index.find(query))
+
     return filter_nodes(graph, build_node_cname_search(query))
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a lazy view of a subgraph, which keeps masks of the nodes and edges of a parent graph
+instead of copying them. The steps of :func:`pybel_tools.selection.get_subgraph` are applied to the masks, and the
+subgraph is only materialized as a :class:`pybel.BELGraph` once, at the end.
+"""
+
+import logging
+from copy import deepcopy
+
+from pybel import BELGraph
+from ..filters.node_filters import function_inclusion_filter_builder
+
+__all__ = [
+    'SubgraphView',
+]
+
+log = logging.getLogger(__name__)
+
+
+class SubgraphView:
+    """A subgraph of a BEL graph, stored as a set of nodes and a set of edges of the parent graph.
+
+    While no edges have been filtered or added, the edges are implicitly all of the parent's edges between the nodes,
+    like in an induced subgraph, and no set of edges is built at all. Edges are identified by their source, target,
+    and key in the parent graph.
+    """
+
+    def __init__(self, graph, nodes=None, edges=None):
+        """
+        :param pybel.BELGraph graph: The parent graph
+        :param iter[tuple] nodes: The nodes of the view. If none, uses all nodes in the parent graph.
+        :param iter[tuple] edges: An optional iterable of (source, target, key) edges of the parent graph. If given,
+                                  the view has exactly these edges and their nodes are added to the view's nodes.
+                                  If none, the view has all edges between its nodes.
+        """
+        self.graph = graph
+
+        #: The set of nodes in the view
+        self.nodes = set(graph.nodes_iter() if nodes is None else (node for node in nodes if node in graph))
+
+        #: The set of (source, target, key) edges in the view, or None if it has all edges between its nodes
+        self.edges = None
+
+        if edges is not None:
+            self.edges = set(edges)
+            for u, v, _ in self.edges:
+                self.nodes.add(u)
+                self.nodes.add(v)
+
+    @classmethod
+    def from_neighborhoods(cls, graph, nodes):
+        """Builds a view of the in- and out-edges of the given nodes, like
+        :func:`pybel_tools.selection.get_subgraph_by_neighborhood`
+
+        :param pybel.BELGraph graph: The parent graph
+        :param iter[tuple] nodes: An iterable of nodes in the parent graph
+        :rtype: SubgraphView
+        :raises ValueError: if any of the nodes isn't in the parent graph
+        """
+        nodes = set(nodes)
+
+        for node in nodes:
+            if node not in graph:
+                raise ValueError('{} not in graph'.format(node))
+
+        edges = set()
+        for node in nodes:
+            edges.update(_iter_in_edges(graph, node))
+            edges.update(_iter_out_edges(graph, node))
+
+        return cls(graph, nodes=(), edges=edges)
+
+    def __contains__(self, node):
+        return node in self.nodes
+
+    def number_of_nodes(self):
+        """Returns the number of nodes in the view
+
+        :rtype: int
+        """
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        """Returns the number of edges in the view
+
+        :rtype: int
+        """
+        return sum(1 for _ in self.edges_iter())
+
+    def edges_iter(self):
+        """Iterates over the edges in the view
+
+        :return: An iterable of (source, target, key) edges of the parent graph
+        :rtype: iter[tuple[tuple,tuple,int]]
+        """
+        if self.edges is not None:
+            return iter(self.edges)
+
+        return self._iter_induced_edges()
+
+    def _iter_induced_edges(self):
+        nodes = self.nodes
+        for u in nodes:
+            for v, keydict in self.graph.edge[u].items():
+                if v in nodes:
+                    for k in keydict:
+                        yield u, v, k
+
+    def _ensure_edges(self):
+        """Builds the explicit set of edges before edges are filtered or added"""
+        if self.edges is None:
+            self.edges = set(self._iter_induced_edges())
+
+    def filter_edges(self, edge_filter):
+        """Keeps only the edges that pass the filter and the nodes incident to them, like
+        :func:`pybel_tools.selection.get_subgraph_by_edge_filter`
+
+        :param edge_filter: An edge filter (graph, node, node, key, data) -> bool. The parent graph is passed.
+        :type edge_filter: types.FunctionType
+        """
+        graph = self.graph
+        self.edges = {
+            (u, v, k)
+            for u, v, k in self.edges_iter()
+            if edge_filter(graph, u, v, k, graph.edge[u][v][k])
+        }
+        self.nodes = {node for edge in self.edges for node in edge[:2]}
+
+    def expand_node_neighborhood(self, node):
+        """Adds the neighbors of the given node in the parent graph that aren't in the view yet, along with their
+        edges to and from the node, like :func:`pybel_tools.mutation.expand_node_neighborhood`
+
+        :param tuple node: A node in the parent graph
+        """
+        self._ensure_edges()
+        self.nodes.add(node)
+
+        graph = self.graph
+
+        new_successors = [v for v in graph.edge[node] if v not in self.nodes]
+        self.nodes.update(new_successors)
+        for v in new_successors:
+            self.edges.update((node, v, k) for k in graph.edge[node][v])
+
+        new_predecessors = [u for u in graph.pred[node] if u not in self.nodes]
+        self.nodes.update(new_predecessors)
+        for u in new_predecessors:
+            self.edges.update((u, node, k) for k in graph.edge[u][node])
+
+    def remove_node(self, node):
+        """Removes a node and its edges from the view
+
+        :param tuple node: A node in the view
+        """
+        self.nodes.remove(node)
+
+        if self.edges is not None:
+            self.edges.difference_update(_iter_in_edges(self.graph, node))
+            self.edges.difference_update(_iter_out_edges(self.graph, node))
+
+    def remove_filtered_nodes(self, node_filter):
+        """Removes the nodes that pass the given filter
+
+        :param node_filter: A node filter (graph, node) -> bool. The parent graph is passed.
+        :type node_filter: types.FunctionType
+        """
+        for node in [node for node in self.nodes if node_filter(self.graph, node)]:
+            self.remove_node(node)
+
+    def remove_nodes_by_function(self, function):
+        """Removes the nodes with the given function, like :func:`pybel_tools.filters.remove_nodes_by_function`
+
+        :param str function: A BEL function, like :data:`pybel.constants.PATHOLOGY`
+        """
+        self.remove_filtered_nodes(function_inclusion_filter_builder(function))
+
+    def remove_isolated_nodes(self):
+        """Removes the nodes without any edges in the view"""
+        connected = {node for edge in self.edges_iter() for node in edge[:2]}
+        self.nodes &= connected
+
+    def to_graph(self):
+        """Materializes the view. The graph, node, and edge data are deep copied, like by
+        :meth:`networkx.MultiDiGraph.copy`, so changing the result, like its citations, doesn't change the parent.
+
+        :rtype: pybel.BELGraph
+        """
+        graph = self.graph
+        result = BELGraph()
+        result.graph.update(deepcopy(graph.graph))
+
+        for node in self.nodes:
+            result.add_node(node, attr_dict=deepcopy(graph.node[node]))
+
+        for u, v, k in self.edges_iter():
+            result.add_edge(u, v, key=k, attr_dict=deepcopy(graph.edge[u][v][k]))
+
+        return result
+
+
+def _iter_in_edges(graph, node):
+    for u, keydict in graph.pred[node].items():
+        for k in keydict:
+            yield u, node, k
+
+
+def _iter_out_edges(graph, node):
+    for v, keydict in graph.edge[node].items():
+        for k in keydict:
+            yield node, v, k
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""This module reads and writes snapshot files, which hold a picklable header and a set of numpy arrays. The arrays
+are stored uncompressed after the header, so they can be memory-mapped when the file is read instead of being
+loaded, and the pages that are never touched are never read from the disk.
+
+The layout of a snapshot file is:
+
+1. The magic bytes :data:`MAGIC`
+2. The length of the pickled header, as an unsigned 64-bit little-endian integer
+3. The pickled header, which contains the format version, the metadata, and the dtype, shape, and offset of each array
+4. The arrays, each aligned to :data:`ALIGNMENT` bytes
+"""
+
+import logging
+import os
+import pickle
+import struct
+import tempfile
+
+import numpy as np
+
+__all__ = [
+    'SNAPSHOT_FORMAT_VERSION',
+    'SnapshotError',
+    'write_snapshot',
+    'read_snapshot',
+]
+
+log = logging.getLogger(__name__)
+
+#: The bytes every snapshot file starts with
+MAGIC = b'PBTSNAP\x00'
+
+#: Bump when the layout of the snapshot files or of their headers changes
+SNAPSHOT_FORMAT_VERSION = 2
+
+#: The alignment of the arrays in bytes
+ALIGNMENT = 8
+
+_LENGTH = struct.Struct('<Q')
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file can't be read, like when it's truncated or was written in an older format"""
+
+
+def _pad(size):
+    """Returns the number of bytes needed to align the given size
+
+    :param int size: A number of bytes
+    :rtype: int
+    """
+    return -size % ALIGNMENT
+
+
+def write_snapshot(path, meta, arrays):
+    """Writes a snapshot file. It's written to a temporary file first, then renamed, so readers never see a partial
+    snapshot.
+
+    :param str path: The path of the snapshot file
+    :param meta: Any picklable metadata
+    :param dict[str,numpy.ndarray] arrays: A dictionary of {str name: array}
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = array.dtype.str, array.shape, offset
+        offset += array.nbytes + _pad(array.nbytes)
+
+    header = pickle.dumps(
+        {'version': SNAPSHOT_FORMAT_VERSION, 'meta': meta, 'layout': layout},
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(b'\x00' * _pad(len(MAGIC) + _LENGTH.size + len(header)))
+
+            for name, array in arrays.items():
+                f.write(array.tobytes())
+                f.write(b'\x00' * _pad(array.nbytes))
+
+        os.rename(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    log.info('wrote snapshot with %d arrays to %s', len(arrays), path)
+
+
+def read_snapshot(path, mmap=True):
+    """Reads a snapshot file
+
+    :param str path: The path of the snapshot file
+    :param bool mmap: Should the arrays be memory-mapped read-only instead of loaded? Defaults to true.
+    :return: The metadata and a dictionary of {str name: array}
+    :rtype: tuple[object,dict[str,numpy.ndarray]]
+    :raises SnapshotError: if the file isn't a snapshot or was written in another format version
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise SnapshotError('{} is not a snapshot'.format(path))
+
+        length = f.read(_LENGTH.size)
+        if len(length) != _LENGTH.size:
+            raise SnapshotError('{} is truncated'.format(path))
+
+        length, = _LENGTH.unpack(length)
+
+        try:
+            header = pickle.loads(f.read(length))
+        except Exception as e:
+            raise SnapshotError('could not read the header of {}: {}'.format(path, e))
+
+        if header.get('version') != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError('{} has format version {}, not {}'.format(
+                path, header.get('version'), SNAPSHOT_FORMAT_VERSION))
+
+        base = len(MAGIC) + _LENGTH.size + length
+        base += _pad(base)
+
+        size = os.fstat(f.fileno()).st_size
+
+        arrays = {}
+        for name, (dtype, shape, offset) in header['layout'].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+
+            if base + offset + count * dtype.itemsize > size:
+                raise SnapshotError('{} is truncated'.format(path))
+
+            if count == 0:  # empty regions can't be memory-mapped
+                arrays[name] = np.empty(shape, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=base + offset, shape=shape)
+            else:
+                f.seek(base + offset)
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+
+    return header['meta'], arrays
@@ -0,0 +1,585 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a compact, integer-indexed store for many BEL graphs whose nodes have already been relabeled
+to integer identifiers, like by :meth:`pybel_tools.api.DatabaseService.relabel_nodes_to_identifiers`.
+
+Each distinct edge is stored once, no matter how many networks it appears in. Its attributes are kept in columns of
+integers that point into deduplicated tables of relations, citations, evidences, and annotations, so the same
+citation dictionary is stored once for all of the edges that cite it. Networks are stored as arrays of node and edge
+identifiers, and are only materialized as :class:`pybel.BELGraph` instances when needed. Materialized graphs get their
+own copies of the node and edge data, so they can be changed without changing the store.
+
+A store can be exported to numpy arrays with :meth:`NetworkStore.to_arrays` and rebuilt from them with
+:meth:`NetworkStore.from_arrays`. The rebuilt store reads the arrays directly, so they can be memory-mapped from a
+snapshot file, and only copies them once a network is added.
+"""
+
+import logging
+import time
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+from pybel import BELGraph
+from pybel.constants import RELATION, CITATION, EVIDENCE, ANNOTATIONS
+from .summary.annotation_index import AnnotationIndex
+from .utils import copy_nested
+
+__all__ = [
+    'InternTable',
+    'CompressedRows',
+    'NetworkStore',
+]
+
+log = logging.getLogger(__name__)
+
+#: The position in the edge columns of edges that don't have a given attribute
+MISSING = -1
+
+#: The names of the edge columns, in the order of :meth:`NetworkStore._edge_columns`
+EDGE_COLUMNS = (
+    'edge_source',
+    'edge_target',
+    'edge_key',
+    'edge_relation',
+    'edge_citation',
+    'edge_evidence',
+    'edge_annotations',
+    'edge_extra',
+)
+
+#: The names of the tables of the :class:`NetworkStore`
+TABLES = (
+    'relations',
+    'citations',
+    'evidences',
+    'annotations',
+    'extras',
+)
+
+
+def _freeze(value):
+    """Converts a (nested) value to a hashable one
+
+    :rtype: collections.abc.Hashable
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+
+    return value
+
+
+class InternTable:
+    """A table of deduplicated values, like citation dictionaries. Each distinct value is stored once and is identified
+    by its position in the table.
+
+    Values are copied when they're added, so the table doesn't share them with the graph they came from.
+
+    .. warning:: Values are shared by all edges referring to them, so modifying one in place modifies it for all of
+                 them. Use :meth:`NetworkStore.get_edge_data` to get copies.
+    """
+
+    def __init__(self):
+        #: The list of values. The position of a value in this list is its identifier
+        self.values = []
+        self._index = {}
+
+    def add(self, value):
+        """Adds a value to the table if it's not already present
+
+        :return: The value's identifier
+        :rtype: int
+        """
+        if self._index is None:
+            self._index = {_freeze(v): i for i, v in enumerate(self.values)}
+
+        key = _freeze(value)
+        idx = self._index.get(key)
+
+        if idx is None:
+            idx = self._index[key] = len(self.values)
+            self.values.append(copy_nested(value))
+
+        return idx
+
+    def __getitem__(self, idx):
+        return self.values[idx]
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def from_values(cls, values):
+        """Builds a table from a list of distinct values. The index is only built when a value is added.
+
+        :param list values: A list of distinct values
+        :rtype: InternTable
+        """
+        table = cls()
+        table.values = values
+        table._index = None
+        return table
+
+
+def _to_csr(rows):
+    """Concatenates a list of arrays of integers like the rows of a sparse matrix in the compressed sparse row format
+
+    :param list rows: A list of arrays of integers
+    :return: The offsets of the rows and the concatenated values
+    :rtype: tuple[numpy.ndarray,numpy.ndarray]
+    """
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+
+    if not rows:
+        return indptr, np.empty(0, dtype=np.int64)
+
+    return indptr, np.concatenate([np.asarray(row, dtype=np.int64) for row in rows])
+
+
+class CompressedRows:
+    """A read-only list of arrays of integers that are concatenated in one array, like the rows of a sparse matrix in
+    the compressed sparse row format. Is used for the adjacency of a :class:`NetworkStore` rebuilt from arrays."""
+
+    def __init__(self, indptr, indices):
+        """
+        :param numpy.ndarray indptr: The offsets of the rows in the values, with one more entry than there are rows
+        :param numpy.ndarray indices: The concatenated values of the rows
+        """
+        self.indptr = indptr
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class NetworkStore:
+    """Stores many BEL graphs with integer nodes in shared, array-backed structures"""
+
+    def __init__(self):
+        #: The data dictionary of each node. Nodes are identified by their position in this list.
+        self.node_data = []
+
+        #: The out-edges of each node, as arrays of edge identifiers
+        self.out_edges = []
+        #: The in-edges of each node, as arrays of edge identifiers
+        self.in_edges = []
+
+        #: The source node of each edge. Edges are identified by their position in the columns.
+        self.edge_source = array('l')
+        #: The target node of each edge
+        self.edge_target = array('l')
+        #: The key of each unqualified edge (which are negative in PyBEL), or 0 for qualified edges
+        self.edge_key = array('l')
+        #: The position of each edge's relation in :data:`relations`
+        self.edge_relation = array('l')
+        #: The position of each edge's citation in :data:`citations`, or -1
+        self.edge_citation = array('l')
+        #: The position of each edge's evidence in :data:`evidences`, or -1
+        self.edge_evidence = array('l')
+        #: The position of each edge's annotations in :data:`annotations`, or -1
+        self.edge_annotations = array('l')
+        #: The position of the rest of each edge's data (like subject and object modifiers) in :data:`extras`, or -1
+        self.edge_extra = array('l')
+
+        self.relations = InternTable()
+        self.citations = InternTable()
+        self.evidences = InternTable()
+        self.annotations = InternTable()
+        self.extras = InternTable()
+
+        #: A dictionary of {edge columns: edge identifier} used to deduplicate edges
+        self._edge_index = {}
+
+        #: The index of the annotations of all edges, which is built by :meth:`get_annotation_index`
+        self._annotation_index = None
+
+        #: A dictionary of {int network id: array of node identifiers}
+        self.network_nodes = {}
+        #: A dictionary of {int network id: array of edge identifiers}
+        self.network_edges = {}
+        #: A dictionary of {int network id: dict graph data}, like the network's metadata
+        self.network_data = {}
+        #: A dictionary of {int network id: list of compilation warnings}, like :data:`pybel.BELGraph.warnings`
+        self.network_warnings = {}
+        #: The identifiers of the networks included in the universe, in the order they were added
+        self.universe_network_ids = []
+
+    def __contains__(self, network_id):
+        return network_id in self.network_edges
+
+    def number_of_nodes(self):
+        """Returns the number of nodes in the store
+
+        :rtype: int
+        """
+        return sum(1 for data in self.node_data if data is not None)
+
+    def number_of_edges(self):
+        """Returns the number of distinct edges in the store
+
+        :rtype: int
+        """
+        return len(self.edge_source)
+
+    def has_node(self, node):
+        """Checks if the store has the given node
+
+        :param int node: A node identifier
+        :rtype: bool
+        """
+        return 0 <= node < len(self.node_data) and self.node_data[node] is not None
+
+    def _add_node(self, node, data):
+        """Adds a node and its data dictionary if it's not already stored
+
+        :param int node: A node identifier
+        :param dict data: The node's data dictionary
+        """
+        if node >= len(self.node_data):
+            missing = node + 1 - len(self.node_data)
+            self.node_data.extend([None] * missing)
+            self.out_edges.extend(array('l') for _ in range(missing))
+            self.in_edges.extend(array('l') for _ in range(missing))
+
+        if self.node_data[node] is None:
+            self.node_data[node] = copy_nested(data)
+
+    def _add_edge(self, u, v, k, data):
+        """Adds an edge if an equal one isn't already stored
+
+        :return: The edge's identifier
+        :rtype: int
+        """
+        data = data.copy()
+
+        columns = (
+            u,
+            v,
+            k if isinstance(k, int) and k < 0 else 0,
+            self.relations.add(data.pop(RELATION)),
+            self.citations.add(data.pop(CITATION)) if CITATION in data else MISSING,
+            self.evidences.add(data.pop(EVIDENCE)) if EVIDENCE in data else MISSING,
+            self.annotations.add(data.pop(ANNOTATIONS)) if ANNOTATIONS in data else MISSING,
+            self.extras.add(data) if data else MISSING,
+        )
+
+        eid = self._edge_index.get(columns)
+
+        if eid is not None:
+            return eid
+
+        eid = self._edge_index[columns] = len(self.edge_source)
+
+        for column, value in zip(self._edge_columns(), columns):
+            column.append(value)
+
+        self.out_edges[u].append(eid)
+        self.in_edges[v].append(eid)
+
+        if self._annotation_index is not None and columns[6] != MISSING:
+            self._annotation_index.add(eid, self.annotations[columns[6]])
+
+        return eid
+
+    def _edge_columns(self):
+        return (
+            self.edge_source,
+            self.edge_target,
+            self.edge_key,
+            self.edge_relation,
+            self.edge_citation,
+            self.edge_evidence,
+            self.edge_annotations,
+            self.edge_extra,
+        )
+
+    def _ensure_writable(self):
+        """Copies the columns and adjacency of a store rebuilt by :meth:`from_arrays` into growable arrays and
+        rebuilds the index of the edges, so more networks can be added"""
+        if isinstance(self.edge_source, array):
+            return
+
+        t = time.time()
+
+        for name in EDGE_COLUMNS:
+            setattr(self, name, array('l', getattr(self, name).tolist()))
+
+        self.out_edges = [array('l', row.tolist()) for row in self.out_edges]
+        self.in_edges = [array('l', row.tolist()) for row in self.in_edges]
+
+        self._edge_index = {
+            columns: eid
+            for eid, columns in enumerate(zip(*self._edge_columns()))
+        }
+
+        log.info('copied %d edges from arrays in %.2f seconds', len(self.edge_source), time.time() - t)
+
+    def add_network(self, network_id, graph, in_universe=True):
+        """Adds a graph whose nodes are integer identifiers to the store. If a network with the same identifier was
+        already added, it is replaced.
+
+        :param int network_id: The network's identifier
+        :param pybel.BELGraph graph: A BEL graph with integer nodes
+        :param bool in_universe: Should the network be included in the universe?
+        """
+        self._ensure_writable()
+
+        for node, data in graph.nodes_iter(data=True):
+            self._add_node(node, data)
+
+        self.network_nodes[network_id] = array('l', graph.nodes_iter())
+        self.network_edges[network_id] = array('l', (
+            self._add_edge(u, v, k, data)
+            for u, v, k, data in graph.edges_iter(keys=True, data=True)
+        ))
+        self.network_data[network_id] = copy_nested(graph.graph)
+        self.network_warnings[network_id] = list(graph.warnings)
+
+        if in_universe and network_id not in self.universe_network_ids:
+            self.universe_network_ids.append(network_id)
+
+    def remove_network(self, network_id):
+        """Removes a network from the store. Its nodes and edges stay in the shared tables.
+
+        :param int network_id: The network's identifier
+        """
+        del self.network_nodes[network_id]
+        del self.network_edges[network_id]
+        del self.network_data[network_id]
+        del self.network_warnings[network_id]
+
+        if network_id in self.universe_network_ids:
+            self.universe_network_ids.remove(network_id)
+
+    def get_annotation_index(self):
+        """Gets the index of the annotations of all edges in the store. It's built the first time it's needed, then
+        kept up to date as edges are added.
+
+        :return: An index whose edges are edge identifiers
+        :rtype: pybel_tools.summary.AnnotationIndex
+        """
+        if self._annotation_index is None:
+            t = time.time()
+
+            # Edges with the same annotations share a position in the table, so each dictionary is only read once
+            edges_by_annotations = defaultdict(list)
+            for eid, idx in enumerate(self.edge_annotations):
+                if idx != MISSING:
+                    edges_by_annotations[int(idx)].append(eid)
+
+            index = AnnotationIndex()
+            for idx, eids in edges_by_annotations.items():
+                for annotation, value in self.annotations[idx].items():
+                    index.index.setdefault(annotation, {}).setdefault(value, set()).update(eids)
+
+            self._annotation_index = index
+            log.info('indexed annotations of %d edges in %.2f seconds', len(self.edge_source), time.time() - t)
+
+        return self._annotation_index
+
+    def get_edge_key(self, eid):
+        """Gets the source, target, and key of an edge in the graphs materialized by :meth:`to_graph`, in which the
+        key of a qualified edge is its identifier
+
+        :param int eid: An edge identifier
+        :rtype: tuple[int,int,int]
+        """
+        k = int(self.edge_key[eid])
+        return int(self.edge_source[eid]), int(self.edge_target[eid]), (k if k < 0 else int(eid))
+
+    def get_edge_data(self, eid):
+        """Builds the data dictionary of an edge. The citation, annotations, and other nested values are copied, so
+        they can be changed without changing the store.
+
+        :param int eid: An edge identifier
+        :rtype: dict
+        """
+        data = {RELATION: self.relations[self.edge_relation[eid]]}
+
+        for column, table, key in (
+                (self.edge_citation, self.citations, CITATION),
+                (self.edge_evidence, self.evidences, EVIDENCE),
+                (self.edge_annotations, self.annotations, ANNOTATIONS),
+        ):
+            idx = column[eid]
+            if idx != MISSING:
+                data[key] = copy_nested(table[idx])
+
+        if self.edge_extra[eid] != MISSING:
+            data.update(copy_nested(self.extras[self.edge_extra[eid]]))
+
+        return data
+
+    def get_edges(self, u, v):
+        """Gets the data dictionaries of the distinct edges from one node to another
+
+        :param int u: The source node identifier
+        :param int v: The target node identifier
+        :rtype: list[dict]
+        """
+        return [
+            self.get_edge_data(eid)
+            for eid in self.out_edges[u]
+            if self.edge_target[eid] == v
+        ]
+
+    def has_edge(self, u, v):
+        """Checks if there are any edges from one node to another
+
+        :param int u: The source node identifier
+        :param int v: The target node identifier
+        :rtype: bool
+        """
+        return self.has_node(u) and any(self.edge_target[eid] == v for eid in self.out_edges[u])
+
+    def get_universe_edges(self):
+        """Gets the distinct edges of all networks in the universe
+
+        :return: A sorted list of edge identifiers
+        :rtype: list[int]
+        """
+        result = set()
+        for network_id in self.universe_network_ids:
+            result.update(self.network_edges[network_id])
+        return sorted(int(eid) for eid in result)
+
+    def get_universe_nodes(self):
+        """Gets the nodes of all networks in the universe
+
+        :return: A sorted list of node identifiers
+        :rtype: list[int]
+        """
+        result = set()
+        for network_id in self.universe_network_ids:
+            result.update(self.network_nodes[network_id])
+        return sorted(int(node) for node in result)
+
+    def to_graph(self, nodes, edges, graph_data=None, warnings=None):
+        """Materializes a BEL graph from the store. Unqualified edges keep their keys, and qualified edges are keyed
+        by their identifiers, so edges can be looked up with :meth:`get_edge_key`.
+
+        :param iter[int] nodes: An iterable of node identifiers
+        :param iter[int] edges: An iterable of edge identifiers
+        :param dict graph_data: The graph-level data, like the metadata
+        :param list warnings: The compilation warnings
+        :rtype: pybel.BELGraph
+        """
+        graph = BELGraph(**copy_nested(graph_data or {}))
+
+        if warnings:
+            graph.warnings.extend(warnings)
+
+        # Identifiers are converted with int() since they're numpy integers when read from arrays. The node data is
+        # copied so changing it in the graph doesn't change the store.
+        node_data = self.node_data
+        for node in nodes:
+            graph.add_node(int(node), attr_dict=copy_nested(node_data[node]))
+
+        for eid in edges:
+            u, v, k = self.get_edge_key(eid)
+            graph.add_edge(u, v, key=k, attr_dict=self.get_edge_data(eid))
+
+        return graph
+
+    def get_network(self, network_id):
+        """Materializes a network
+
+        :param int network_id: The network's identifier
+        :rtype: pybel.BELGraph
+        """
+        return self.to_graph(
+            self.network_nodes[network_id],
+            self.network_edges[network_id],
+            graph_data=self.network_data[network_id],
+            warnings=self.network_warnings[network_id]
+        )
+
+    def get_universe(self):
+        """Materializes the union of all networks in the universe
+
+        :rtype: pybel.BELGraph
+        """
+        return self.to_graph(self.get_universe_nodes(), self.get_universe_edges(), graph_data={'PYBEL_RELABELED': True})
+
+    def to_arrays(self):
+        """Exports the store to a picklable dictionary of metadata and a dictionary of numpy arrays, which can be
+        written with :func:`pybel_tools.snapshot.write_snapshot`
+
+        :return: The metadata and a dictionary of {str name: array}
+        :rtype: tuple[dict,dict[str,numpy.ndarray]]
+        """
+        arrays = {
+            name: np.asarray(column, dtype=np.int64)
+            for name, column in zip(EDGE_COLUMNS, self._edge_columns())
+        }
+
+        arrays['out_indptr'], arrays['out_indices'] = _to_csr(list(self.out_edges))
+        arrays['in_indptr'], arrays['in_indices'] = _to_csr(list(self.in_edges))
+
+        network_ids = sorted(self.network_edges)
+        arrays['network_nodes_indptr'], arrays['network_nodes'] = _to_csr(
+            [self.network_nodes[network_id] for network_id in network_ids])
+        arrays['network_edges_indptr'], arrays['network_edges'] = _to_csr(
+            [self.network_edges[network_id] for network_id in network_ids])
+
+        meta = {
+            'node_data': self.node_data,
+            'tables': {name: getattr(self, name).values for name in TABLES},
+            'network_ids': network_ids,
+            'network_data': self.network_data,
+            'network_warnings': self.network_warnings,
+            'universe_network_ids': self.universe_network_ids,
+        }
+
+        return meta, arrays
+
+    @classmethod
+    def from_arrays(cls, meta, arrays):
+        """Rebuilds a store exported by :meth:`to_arrays`. The arrays are used directly, so memory-mapped arrays are
+        only read from the disk when needed. They're copied the first time a network is added.
+
+        :param dict meta: The metadata from :meth:`to_arrays`
+        :param dict[str,numpy.ndarray] arrays: The arrays from :meth:`to_arrays`
+        :rtype: NetworkStore
+        """
+        store = cls()
+
+        store.node_data = meta['node_data']
+
+        for name in TABLES:
+            setattr(store, name, InternTable.from_values(meta['tables'][name]))
+
+        for name in EDGE_COLUMNS:
+            setattr(store, name, arrays[name])
+
+        store.out_edges = CompressedRows(arrays['out_indptr'], arrays['out_indices'])
+        store.in_edges = CompressedRows(arrays['in_indptr'], arrays['in_indices'])
+        store._edge_index = None
+
+        network_nodes = CompressedRows(arrays['network_nodes_indptr'], arrays['network_nodes'])
+        network_edges = CompressedRows(arrays['network_edges_indptr'], arrays['network_edges'])
+
+        for i, network_id in enumerate(meta['network_ids']):
+            store.network_nodes[network_id] = network_nodes[i]
+            store.network_edges[network_id] = network_edges[i]
+
+        store.network_data = meta['network_data']
+        store.network_warnings = meta['network_warnings']
+        store.universe_network_ids = meta['universe_network_ids']
+
+        return store
@@ -7,19 +7,27 @@ and provide some suggestions for fixes.
 
 """
 
+from . import annotation_index
 from . import edge_summary
 from . import error_summary
 from . import export
+from . import graph_summary
 from . import node_properties
 from . import node_summary
+from . import pair_relations
 from . import provenance
+from . import provenance_index
 from . import subgraph_summary
+from .annotation_index import *
 from .edge_summary import *
 from .error_summary import *
 from .export import *
+from .graph_summary import *
 from .node_properties import *
 from .node_summary import *
+from .pair_relations import *
 from .provenance import *
+from .provenance_index import *
 from .subgraph_summary import *
 
-__all__ = edge_summary.__all__ + error_summary.__all__ + export.__all__ + node_properties.__all__ + node_summary.__all__ + subgraph_summary.__all__ + provenance.__all__
+__all__ = annotation_index.__all__ + edge_summary.__all__ + error_summary.__all__ + export.__all__ + graph_summary.__all__ + node_properties.__all__ + node_summary.__all__ + pair_relations.__all__ + subgraph_summary.__all__ + provenance.__all__ + provenance_index.__all__
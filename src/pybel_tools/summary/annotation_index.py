@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains an inverted index from annotations and their values to the edges that have them, so
+annotation-filtered queries become set intersections instead of scans over all edges.
+
+Edges can be identified by anything hashable, like (source, target, key) tuples of a graph or the integer edge
+identifiers of a :class:`pybel_tools.store.NetworkStore`.
+"""
+
+from collections import Counter
+
+from pybel.constants import ANNOTATIONS
+
+__all__ = [
+    'AnnotationIndex',
+]
+
+
+class AnnotationIndex:
+    """An inverted index of {annotation: {value: set of edge identifiers}}"""
+
+    def __init__(self):
+        #: A dictionary of {str annotation: {str value: set of edge identifiers}}
+        self.index = {}
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Indexes the annotations of all edges in a graph, which are identified by (source, target, key) tuples
+
+        :param pybel.BELGraph graph: A BEL graph
+        :rtype: AnnotationIndex
+        """
+        index = cls()
+
+        for u, v, k, d in graph.edges_iter(keys=True, data=True):
+            if ANNOTATIONS in d:
+                index.add((u, v, k), d[ANNOTATIONS])
+
+        return index
+
+    def add(self, edge, annotations):
+        """Adds an edge's annotations to the index
+
+        :param edge: The edge's identifier
+        :param dict[str,str] annotations: The edge's annotations dictionary
+        """
+        for annotation, value in annotations.items():
+            self.index.setdefault(annotation, {}).setdefault(value, set()).add(edge)
+
+    def restrict(self, edges):
+        """Builds an index of only the given edges, like the ones in one network
+
+        :param iter edges: An iterable of edge identifiers
+        :rtype: AnnotationIndex
+        """
+        edges = edges if isinstance(edges, (set, frozenset)) else set(edges)
+        result = AnnotationIndex()
+
+        for annotation, values in self.index.items():
+            restricted = {}
+
+            for value, value_edges in values.items():
+                value_edges = value_edges & edges
+                if value_edges:
+                    restricted[value] = value_edges
+
+            if restricted:
+                result.index[annotation] = restricted
+
+        return result
+
+    def get_annotations(self):
+        """Gets the annotations used by the indexed edges
+
+        :rtype: set[str]
+        """
+        return set(self.index)
+
+    def get_values(self, annotation):
+        """Gets the values of the given annotation
+
+        :param str annotation: An annotation
+        :rtype: set[str]
+        """
+        return set(self.index.get(annotation, ()))
+
+    def get_edges(self, annotation, value):
+        """Gets the edges that have the given value for the given annotation
+
+        :param str annotation: An annotation
+        :param str value: A value of the annotation
+        :rtype: set
+        """
+        return self.index.get(annotation, {}).get(value, set())
+
+    def count_annotations(self):
+        """Counts the edges that use each annotation, like :func:`pybel_tools.summary.count_annotations`
+
+        :rtype: collections.Counter
+        """
+        return Counter({
+            annotation: sum(len(edges) for edges in values.values())
+            for annotation, values in self.index.items()
+        })
+
+    def count_values(self, annotation):
+        """Counts the edges that have each value of the given annotation, like
+        :func:`pybel_tools.summary.count_annotation_values`
+
+        :param str annotation: An annotation
+        :rtype: collections.Counter
+        """
+        return Counter({
+            value: len(edges)
+            for value, edges in self.index.get(annotation, {}).items()
+        })
+
+    def query(self, annotations):
+        """Gets the edges that match all of the given annotations, like the filter from
+        :func:`pybel_tools.filters.build_annotation_dict_filter` applied to the annotations
+
+        :param dict annotations: A dictionary of {str annotation: str value or iterable of values}. An edge matches an
+                                 annotation if it has any of its values.
+        :rtype: set
+        """
+        edge_sets = []
+
+        for annotation, values in annotations.items():
+            if isinstance(values, str):
+                values = [values]
+
+            edges = set()
+            for value in values:
+                edges.update(self.get_edges(annotation, value))
+
+            if not edges:
+                return set()
+
+            edge_sets.append(edges)
+
+        if not edge_sets:
+            return set()
+
+        edge_sets.sort(key=len)
+        return edge_sets[0].intersection(*edge_sets[1:])
+
+    def get_tree(self):
+        """Builds the tree structure of the annotations and their values, like
+        :func:`pybel_tools.summary.get_tree_annotations`
+
+        :rtype: list[dict]
+        """
+        return [
+            {'text': annotation, 'children': [{'text': value} for value in sorted(values)]}
+            for annotation, values in sorted(self.index.items())
+        ]
@@ -5,8 +5,9 @@
 import itertools as itt
 from collections import Counter, defaultdict
 
-from pybel.constants import RELATION, ANNOTATIONS, FUNCTION, PATHOLOGY, CAUSAL_INCREASE_RELATIONS, \
-    CAUSAL_DECREASE_RELATIONS, CAUSES_NO_CHANGE
+from pybel.constants import RELATION, ANNOTATIONS, CAUSAL_INCREASE_RELATIONS, CAUSAL_DECREASE_RELATIONS, \
+    CAUSES_NO_CHANGE
+from .pair_relations import PairRelationTable
 from ..filters.node_filters import keep_node_permissive
 from ..utils import get_value_sets, check_has_annotation
 
@@ -199,16 +200,6 @@ def count_annotation_values_filtered(graph, annotation, source_filter=None, targ
     )
 
 
-def _iter_pairs(graph):
-    """Iterates over unique node-node pairs in the graph
-    
-    :param pybel.BELGraph graph: A BEL graph
-    :rtype: iter
-    """
-    for u, v in set(graph.edges_iter()):
-        yield u, v
-
-
 def get_all_relations(graph, u, v):
     """Returns the set of all relations between a given pair of nodes
     
@@ -260,21 +251,18 @@ def get_contradictory_pairs(graph):
     :return: An iterator over (source, target) node pairs that have contradictory causal edges
     :rtype: iter
     """
-    for u, v in _iter_pairs(graph):
-        if pair_has_contradiction(graph, u, v):
-            yield u, v
+    for u, v, _ in PairRelationTable(graph).iter_contradictions():
+        yield u, v
 
 
 def get_contradiction_summary(graph):
-    """
-    
+    """Iterates over contradictory node pairs in the graph along with all of their relations
+
     :param pybel.BELGraph graph: A BEL graph
-    :return: 
+    :return: An iterator over (source, target, set of relations) for node pairs that have contradictory causal edges
+    :rtype: iter[tuple[tuple,tuple,set[str]]]
     """
-    for u, v in _iter_pairs(graph):
-        relations = get_all_relations(graph, u, v)
-        if _pair_has_contradiction_helper(relations):
-            yield u, v, relations
+    return PairRelationTable(graph).iter_contradictions()
 
 
 def get_consistent_edges(graph):
@@ -284,9 +272,7 @@ def get_consistent_edges(graph):
     :return: An iterator over (source, target) node pairs corresponding to edges with many inconsistent relations
     :rtype: iter
     """
-    for u, v in _iter_pairs(graph):
-        if pair_is_consistent(graph, u, v):
-            yield u, v
+    return PairRelationTable(graph).iter_consistent_pairs()
 
 
 def get_inconsistent_edges(graph):
@@ -296,9 +282,7 @@ def get_inconsistent_edges(graph):
     :return: An iterator over (source, target) node pairs corresponding to edges with many inconsistent relations
     :rtype: iter
     """
-    for u, v in _iter_pairs(graph):
-        if not pair_is_consistent(graph, u, v):
-            yield u, v
+    return PairRelationTable(graph).iter_inconsistent_pairs()
 
 
 def _disease_iterator(graph):
@@ -307,11 +291,7 @@ def _disease_iterator(graph):
     :param pybel.BELGraph graph: A BEL graph
     :rtype: iter
     """
-    for u, v in _iter_pairs(graph):
-        if graph.node[u][FUNCTION] == PATHOLOGY:
-            yield u
-        if graph.node[v][FUNCTION] == PATHOLOGY:
-            yield v
+    return count_diseases(graph).elements()
 
 
 def count_diseases(graph):
@@ -320,7 +300,7 @@ def count_diseases(graph):
     :param pybel.BELGraph graph: A BEL graph
     :rtype: Counter
     """
-    return Counter(_disease_iterator(graph))
+    return PairRelationTable(graph).count_pathologies()
 
 
 def get_tree_annotations(graph):
@@ -0,0 +1,489 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains an engine that calculates many summary statistics of a graph at once, like the ones shown on
+the summary page.
+
+Each statistic is a :class:`SummaryVisitor` registered with :func:`register_summary_visitor`. :func:`summarize_graph`
+feeds all the visitors in one pass over the nodes, one pass over the edges, and one pass over the compilation warnings,
+instead of each statistic walking the graph again.
+"""
+
+from collections import Counter, OrderedDict, defaultdict
+
+from pybel.constants import *
+from pybel.parser.parse_exceptions import *
+
+__all__ = [
+    'SummaryVisitor',
+    'register_summary_visitor',
+    'get_summary_visitor_names',
+    'summarize_graph',
+]
+
+#: A dictionary of {name: visitor class} in the order they were registered
+_visitor_classes = OrderedDict()
+
+
+class SummaryVisitor:
+    """Calculates a summary statistic of a graph from its nodes, edges, and compilation warnings. Subclasses override
+    only the methods they need, and only those are called by :func:`summarize_graph`.
+    """
+
+    #: The key of the result in the dictionary from :func:`summarize_graph`
+    name = None
+
+    def visit_node(self, node, data):
+        """Visits a node
+
+        :param tuple node: A BEL node
+        :param dict data: The node's data dictionary
+        """
+
+    def visit_pair(self, u, v, edges):
+        """Visits a pair of nodes with at least one edge from the first to the second
+
+        :param tuple u: The source BEL node
+        :param tuple v: The target BEL node
+        :param dict edges: A dictionary of {key: edge data dictionary} of the edges from u to v
+        """
+
+    def visit_edge(self, u, v, key, data):
+        """Visits an edge
+
+        :param tuple u: The source BEL node
+        :param tuple v: The target BEL node
+        :param key: The edge's key
+        :param dict data: The edge's data dictionary
+        """
+
+    def visit_warning(self, line_number, line, exc, context):
+        """Visits a compilation warning
+
+        :param int line_number: The line number of the statement
+        :param str line: The statement
+        :param Exception exc: The warning
+        :param dict context: The state of the parser when the warning happened
+        """
+
+    def get_result(self, graph):
+        """Gets the statistic after all of the nodes, edges, and warnings have been visited
+
+        :param pybel.BELGraph graph: The summarized BEL graph, for its graph-level data
+        """
+        raise NotImplementedError
+
+
+def register_summary_visitor(cls):
+    """Registers a visitor class, so it's used by :func:`summarize_graph`. Can be used as a class decorator.
+
+    :param type cls: A subclass of :class:`SummaryVisitor` with a name
+    :return: The same class
+    :rtype: type
+    """
+    if not cls.name:
+        raise ValueError('{} has no name'.format(cls.__name__))
+
+    _visitor_classes[cls.name] = cls
+    return cls
+
+
+def get_summary_visitor_names():
+    """Gets the names of the registered visitors
+
+    :rtype: list[str]
+    """
+    return list(_visitor_classes)
+
+
+def _get_overriding(visitors, method):
+    """Gets the visitors that override the given method of :class:`SummaryVisitor`"""
+    return [
+        visitor
+        for visitor in visitors
+        if getattr(type(visitor), method) is not getattr(SummaryVisitor, method)
+    ]
+
+
+def summarize_graph(graph, names=None):
+    """Calculates the statistics of the registered visitors in one pass over the nodes, one over the edges, and one
+    over the warnings
+
+    :param pybel.BELGraph graph: A BEL graph
+    :param iter[str] names: The names of the visitors to use. Defaults to all of them.
+    :return: A dictionary of {name: result}
+    :rtype: dict
+    """
+    names = get_summary_visitor_names() if names is None else names
+    visitors = [_visitor_classes[name]() for name in names]
+
+    node_visitors = _get_overriding(visitors, 'visit_node')
+    if node_visitors:
+        for node, data in graph.nodes_iter(data=True):
+            for visitor in node_visitors:
+                visitor.visit_node(node, data)
+
+    pair_visitors = _get_overriding(visitors, 'visit_pair')
+    edge_visitors = _get_overriding(visitors, 'visit_edge')
+    if pair_visitors or edge_visitors:
+        for u, successors in graph.adjacency_iter():
+            for v, edges in successors.items():
+                for visitor in pair_visitors:
+                    visitor.visit_pair(u, v, edges)
+
+                for key, data in edges.items():
+                    for visitor in edge_visitors:
+                        visitor.visit_edge(u, v, key, data)
+
+    warning_visitors = _get_overriding(visitors, 'visit_warning')
+    if warning_visitors:
+        for line_number, line, exc, context in graph.warnings:
+            for visitor in warning_visitors:
+                visitor.visit_warning(line_number, line, exc, context)
+
+    return {
+        visitor.name: visitor.get_result(graph)
+        for visitor in visitors
+    }
+
+
+@register_summary_visitor
+class FunctionCounter(SummaryVisitor):
+    """Counts the nodes with each function, like :func:`pybel_tools.summary.count_functions`"""
+    name = 'functions'
+
+    def __init__(self):
+        self.counter = Counter()
+
+    def visit_node(self, node, data):
+        self.counter[data[FUNCTION]] += 1
+
+    def get_result(self, graph):
+        return self.counter
+
+
+@register_summary_visitor
+class NamespaceCounter(SummaryVisitor):
+    """Counts the nodes from each namespace, like :func:`pybel_tools.summary.count_namespaces`"""
+    name = 'namespaces'
+
+    def __init__(self):
+        self.counter = Counter()
+
+    def visit_node(self, node, data):
+        if NAMESPACE in data:
+            self.counter[data[NAMESPACE]] += 1
+
+    def get_result(self, graph):
+        return self.counter
+
+
+@register_summary_visitor
+class UnusedNamespaceCollector(NamespaceCounter):
+    """Gets the defined namespaces that no node uses, like :func:`pybel_tools.summary.get_unused_namespaces`"""
+    name = 'unused_namespaces'
+
+    def get_result(self, graph):
+        defined_namespaces = set(graph.namespace_pattern) | set(graph.namespace_url) | set(graph.namespace_owl)
+        return defined_namespaces - set(self.counter)
+
+
+@register_summary_visitor
+class VariantCounter(SummaryVisitor):
+    """Counts each kind of variant, like :func:`pybel_tools.summary.count_variants`"""
+    name = 'variants'
+
+    def __init__(self):
+        self.counter = Counter()
+
+    def visit_node(self, node, data):
+        for variant_data in data.get(VARIANTS, ()):
+            self.counter[variant_data[KIND]] += 1
+
+    def get_result(self, graph):
+        return self.counter
+
+
+@register_summary_visitor
+class DegreeCounter(SummaryVisitor):
+    """Counts the edges of each node, like :meth:`networkx.MultiDiGraph.degree`"""
+    name = 'degrees'
+
+    def __init__(self):
+        self.counter = Counter()
+
+    def visit_node(self, node, data):
+        self.counter[node] += 0
+
+    def visit_edge(self, u, v, key, data):
+        self.counter[u] += 1
+        self.counter[v] += 1
+
+    def get_result(self, graph):
+        return self.counter
+
+
+@register_summary_visitor
+class RelationCounter(SummaryVisitor):
+    """Counts the edges with each relation, like :func:`pybel_tools.summary.count_relations`"""
+    name = 'relations'
+
+    def __init__(self):
+        self.counter = Counter()
+
+    def visit_edge(self, u, v, key, data):
+        self.counter[data[RELATION]] += 1
+
+    def get_result(self, graph):
+        return self.counter
+
+
+class _ModifiedNodeCollector(SummaryVisitor):
+    """Gets the nodes that have the modifier in any of their edges, like
+    :func:`pybel_tools.filters.node_filters.node_has_modifier`
+    """
+    modifier = None
+
+    def __init__(self):
+        self.nodes = set()
+
+    def visit_edge(self, u, v, key, data):
+        if SUBJECT in data and data[SUBJECT].get(MODIFIER) == self.modifier:
+            self.nodes.add(u)
+
+        if OBJECT in data and data[OBJECT].get(MODIFIER) == self.modifier:
+            self.nodes.add(v)
+
+    def get_result(self, graph):
+        return self.nodes
+
+
+@register_summary_visitor
+class TranslocationCollector(_ModifiedNodeCollector):
+    """Gets the translocated nodes, like :func:`pybel_tools.summary.get_translocated`"""
+    name = 'translocations'
+    modifier = TRANSLOCATION
+
+
+@register_summary_visitor
+class DegradationCollector(_ModifiedNodeCollector):
+    """Gets the degraded nodes, like :func:`pybel_tools.summary.get_degradations`"""
+    name = 'degradations'
+    modifier = DEGRADATION
+
+
+@register_summary_visitor
+class ActivityCollector(_ModifiedNodeCollector):
+    """Gets the nodes with molecular activities, like :func:`pybel_tools.summary.get_activities`"""
+    name = 'activities'
+    modifier = ACTIVITY
+
+
+@register_summary_visitor
+class DiseaseCounter(SummaryVisitor):
+    """Counts the pairs of nodes in which each pathology takes part, like :func:`pybel_tools.summary.count_diseases`"""
+    name = 'diseases'
+
+    def __init__(self):
+        self.counter = Counter()
+        self._pathologies = set()
+
+    def visit_node(self, node, data):
+        if data[FUNCTION] == PATHOLOGY:
+            self._pathologies.add(node)
+
+    def visit_pair(self, u, v, edges):
+        if u in self._pathologies:
+            self.counter[u] += 1
+
+        if v in self._pathologies:
+            self.counter[v] += 1
+
+    def get_result(self, graph):
+        return self.counter
+
+
+@register_summary_visitor
+class UnusedAnnotationCollector(SummaryVisitor):
+    """Gets the defined annotations that no edge uses, like :func:`pybel_tools.summary.get_unused_annotations`"""
+    name = 'unused_annotations'
+
+    def __init__(self):
+        self.annotations = set()
+
+    def visit_edge(self, u, v, key, data):
+        if ANNOTATIONS in data:
+            self.annotations.update(data[ANNOTATIONS])
+
+    def get_result(self, graph):
+        defined_annotations = (
+            set(graph.annotation_pattern) |
+            set(graph.annotation_url) |
+            set(graph.annotation_owl) |
+            set(graph.annotation_list)
+        )
+        return defined_annotations - self.annotations
+
+
+@register_summary_visitor
+class UnusedListAnnotationValueCollector(SummaryVisitor):
+    """Gets the values of the list annotations that no edge uses, like
+    :func:`pybel_tools.summary.get_unused_list_annotation_values`
+    """
+    name = 'unused_list_annotation_values'
+
+    def __init__(self):
+        self.values = defaultdict(set)
+
+    def visit_edge(self, u, v, key, data):
+        if ANNOTATIONS in data:
+            for annotation, value in data[ANNOTATIONS].items():
+                self.values[annotation].add(value)
+
+    def get_result(self, graph):
+        result = {}
+        for annotation, values in graph.annotation_list.items():
+            used_values = self.values.get(annotation, set())
+            if len(used_values) == len(values):  # all values have been used
+                continue
+            result[annotation] = set(values) - used_values
+        return result
+
+
+@register_summary_visitor
+class ErrorTypeCounter(SummaryVisitor):
+    """Counts each type of warning, like :func:`pybel_tools.summary.count_error_types`"""
+    name = 'error_types'
+
+    def __init__(self):
+        self.counter = Counter()
+
+    def visit_warning(self, line_number, line, exc, context):
+        self.counter[exc.__class__.__name__] += 1
+
+    def get_result(self, graph):
+        return self.counter
+
+
+@register_summary_visitor
+class ErrorGrouper(SummaryVisitor):
+    """Groups the line numbers of each warning, like :func:`pybel_tools.summary.group_errors`"""
+    name = 'error_groups'
+
+    def __init__(self):
+        self.groups = defaultdict(list)
+
+    def visit_warning(self, line_number, line, exc, context):
+        self.groups[str(exc)].append(line_number)
+
+    def get_result(self, graph):
+        return dict(self.groups)
+
+
+class _WarningAttributeCollector(SummaryVisitor):
+    """Gets an attribute of the warnings of the given types"""
+    warning_types = ()
+    attribute = None
+
+    def __init__(self):
+        self.values = set()
+
+    def visit_warning(self, line_number, line, exc, context):
+        if isinstance(exc, self.warning_types):
+            self.values.add(getattr(exc, self.attribute))
+
+    def get_result(self, graph):
+        return self.values
+
+
+@register_summary_visitor
+class UndefinedNamespaceCollector(_WarningAttributeCollector):
+    """Gets the namespaces that aren't defined, like :func:`pybel_tools.summary.get_undefined_namespaces`"""
+    name = 'undefined_namespaces'
+    warning_types = UndefinedNamespaceWarning
+    attribute = 'namespace'
+
+
+@register_summary_visitor
+class UndefinedAnnotationCollector(_WarningAttributeCollector):
+    """Gets the annotations that aren't defined, like
+    :func:`pybel_tools.summary.error_summary.get_undefined_annotations`
+    """
+    name = 'undefined_annotations'
+    warning_types = UndefinedAnnotationWarning
+    attribute = 'annotation'
+
+
+@register_summary_visitor
+class IncorrectNameNamespaceCollector(_WarningAttributeCollector):
+    """Gets the namespaces with incorrect names, like
+    :func:`pybel_tools.summary.error_summary.get_namespaces_with_incorrect_names`
+    """
+    name = 'namespaces_with_incorrect_names'
+    warning_types = (MissingNamespaceNameWarning, MissingNamespaceRegexWarning)
+    attribute = 'namespace'
+
+
+@register_summary_visitor
+class InfoCollector(SummaryVisitor):
+    """Gets the numbers of nodes, edges and components, the density, and the average degree, like
+    :func:`pybel_tools.summary.info_list`. The weakly connected components are found with a union-find over the
+    edges.
+    """
+    name = 'info'
+
+    def __init__(self):
+        self.number_nodes = 0
+        self.number_edges = 0
+        self.number_warnings = 0
+        self._parents = {}
+
+    def _find(self, node):
+        parents = self._parents
+        root = node
+        while parents[root] != root:
+            root = parents[root]
+
+        while parents[node] != root:
+            parents[node], node = root, parents[node]
+
+        return root
+
+    def visit_node(self, node, data):
+        self.number_nodes += 1
+        self._parents[node] = node
+
+    def visit_pair(self, u, v, edges):
+        self.number_edges += len(edges)
+
+        u_root, v_root = self._find(u), self._find(v)
+        if u_root != v_root:
+            self._parents[u_root] = v_root
+
+    def visit_warning(self, line_number, line, exc, context):
+        self.number_warnings += 1
+
+    def get_result(self, graph):
+        number_nodes, number_edges = self.number_nodes, self.number_edges
+        number_components = sum(1 for node, parent in self._parents.items() if node == parent)
+
+        if number_nodes <= 1:
+            density = 0
+        else:
+            density = number_edges / (number_nodes * (number_nodes - 1))
+            if not graph.is_directed():
+                density *= 2
+
+        result = [
+            ('Nodes', number_nodes),
+            ('Edges', number_edges),
+            ('Network density', density),
+            ('Components', number_components),
+        ]
+
+        if number_nodes:
+            result.append(('Average degree', number_edges / float(number_nodes)))
+
+        if self.number_warnings:
+            result.append(('Compilation warnings', self.number_warnings))
+
+        return result
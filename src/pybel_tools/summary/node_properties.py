@@ -4,9 +4,8 @@
 
 from collections import Counter
 
-import networkx as nx
-
 from pybel.constants import *
+from ..centrality import get_default_centrality_service
 from ..filters.node_filters import get_nodes, node_has_molecular_activity, node_is_degraded, node_is_translocated
 
 __all__ = [
@@ -240,6 +239,5 @@ def count_top_degrees(graph, number=30):
 
 
 def count_top_centrality(graph, number=30):
-    dd = nx.betweenness_centrality(graph)
-    dc = Counter(dd)
+    dc = get_default_centrality_service().get_betweenness_centrality(graph)
     return dict(dc.most_common(number))
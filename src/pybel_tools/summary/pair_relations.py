@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains a table of the relations between each pair of nodes in a graph, for finding consistent,
+inconsistent, and contradictory pairs and counting the mentions of pathologies without grouping the edges again for
+each question.
+
+The relations of each pair of nodes are stored as a bitmask, built in one pass over the graph's adjacency, so each
+question is answered with a few operations over the whole array of masks. A table describes its graph as it was when
+the table was built. Functions that change the edges of a graph, like
+:func:`pybel_tools.mutation.remove_inconsistent_edges`, can be given a table to keep up to date, so it can be shared by
+a chain of them.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+from pybel.constants import CAUSAL_DECREASE_RELATIONS, CAUSAL_INCREASE_RELATIONS, CAUSES_NO_CHANGE, FUNCTION, \
+    PATHOLOGY, RELATION
+
+__all__ = [
+    'PairRelationTable',
+]
+
+#: The most relations a table can hold, since each has a bit in a 64-bit mask
+MAX_RELATIONS = 64
+
+
+class PairRelationTable:
+    """A table of the relations between each pair of nodes with at least one edge from the first to the second"""
+
+    def __init__(self, graph):
+        """
+        :param pybel.BELGraph graph: A BEL graph
+        """
+        #: The relations in the order of their bits
+        self.relations = []
+        self._relation_bits = {}
+
+        #: The (source, target) node pairs in the order of their rows
+        self.pairs = []
+        masks = []
+
+        for u, successors in graph.adjacency_iter():
+            for v, edges in successors.items():
+                mask = 0
+                for data in edges.values():
+                    mask |= self._get_bit(data[RELATION])
+
+                self.pairs.append((u, v))
+                masks.append(mask)
+
+        number_pairs = len(self.pairs)
+        pathologies = {node for node, data in graph.nodes_iter(data=True) if data[FUNCTION] == PATHOLOGY}
+
+        self.masks = np.array(masks, dtype=np.uint64)
+        self.source_pathologies = np.fromiter((u in pathologies for u, _ in self.pairs), dtype=bool, count=number_pairs)
+        self.target_pathologies = np.fromiter((v in pathologies for _, v in self.pairs), dtype=bool, count=number_pairs)
+
+        #: Which rows' pairs still have edges in the graph
+        self.alive = np.ones(number_pairs, dtype=bool)
+
+        self._rows = {pair: row for row, pair in enumerate(self.pairs)}
+
+    def _get_bit(self, relation):
+        """Gets the bit of a relation, giving it the next one if it's new
+
+        :param str relation: A BEL relation
+        :rtype: int
+        """
+        if relation not in self._relation_bits:
+            if len(self.relations) == MAX_RELATIONS:
+                raise ValueError('can not hold more than {} relations'.format(MAX_RELATIONS))
+
+            self._relation_bits[relation] = 1 << len(self.relations)
+            self.relations.append(relation)
+
+        return self._relation_bits[relation]
+
+    def _get_mask(self, relations):
+        """Gets the mask of the relations that are in the table
+
+        :param iter[str] relations: BEL relations
+        :rtype: numpy.uint64
+        """
+        mask = 0
+        for relation in relations:
+            mask |= self._relation_bits.get(relation, 0)
+        return np.uint64(mask)
+
+    def _get_relations(self, mask):
+        """Gets the relations of a mask
+
+        :param int mask: A mask
+        :rtype: set[str]
+        """
+        mask = int(mask)
+        return {
+            relation
+            for bit, relation in enumerate(self.relations)
+            if mask >> bit & 1
+        }
+
+    def remove_pair(self, u, v):
+        """Removes a pair of nodes from the table after all of the edges from the first to the second were removed
+
+        :param tuple u: The source BEL node
+        :param tuple v: The target BEL node
+        """
+        self.alive[self._rows[u, v]] = False
+
+    def get_relations(self, u, v):
+        """Gets the set of all relations from the first node to the second
+
+        :param tuple u: The source BEL node
+        :param tuple v: The target BEL node
+        :rtype: set[str]
+        """
+        return self._get_relations(self.masks[self._rows[u, v]])
+
+    def _iter_rows(self, rows):
+        for row in rows.tolist():
+            yield self.pairs[row]
+
+    def get_consistent_rows(self):
+        """Gets the rows of the pairs whose edges all have the same relation
+
+        :rtype: numpy.ndarray
+        """
+        masks = self.masks
+        return np.flatnonzero(self.alive & ((masks & (masks - np.uint64(1))) == 0))
+
+    def get_inconsistent_rows(self):
+        """Gets the rows of the pairs whose edges have more than one relation
+
+        :rtype: numpy.ndarray
+        """
+        masks = self.masks
+        return np.flatnonzero(self.alive & ((masks & (masks - np.uint64(1))) != 0))
+
+    def get_contradictory_rows(self):
+        """Gets the rows of the pairs whose edges have more than one of an increase, a decrease, and no change
+
+        :rtype: numpy.ndarray
+        """
+        masks = self.masks
+        zero = np.uint64(0)
+
+        number_kinds = (
+            ((masks & self._get_mask(CAUSAL_INCREASE_RELATIONS)) != zero).astype(np.int8) +
+            ((masks & self._get_mask(CAUSAL_DECREASE_RELATIONS)) != zero).astype(np.int8) +
+            ((masks & self._get_mask([CAUSES_NO_CHANGE])) != zero).astype(np.int8)
+        )
+
+        return np.flatnonzero(self.alive & (number_kinds > 1))
+
+    def iter_pairs(self):
+        """Iterates over the pairs of nodes
+
+        :rtype: iter[tuple[tuple,tuple]]
+        """
+        return self._iter_rows(np.flatnonzero(self.alive))
+
+    def iter_consistent_pairs(self):
+        """Iterates over the pairs of nodes whose edges all have the same relation
+
+        :rtype: iter[tuple[tuple,tuple]]
+        """
+        return self._iter_rows(self.get_consistent_rows())
+
+    def iter_inconsistent_pairs(self):
+        """Iterates over the pairs of nodes whose edges have more than one relation
+
+        :rtype: iter[tuple[tuple,tuple]]
+        """
+        return self._iter_rows(self.get_inconsistent_rows())
+
+    def iter_contradictions(self):
+        """Iterates over the pairs of nodes whose causal relations contradict each other, with all of their relations
+
+        :rtype: iter[tuple[tuple,tuple,set[str]]]
+        """
+        for row in self.get_contradictory_rows().tolist():
+            u, v = self.pairs[row]
+            yield u, v, self._get_relations(self.masks[row])
+
+    def count_pathologies(self):
+        """Counts the pairs of nodes in which each pathology takes part
+
+        :rtype: collections.Counter
+        """
+        result = Counter(u for u, _ in self._iter_rows(np.flatnonzero(self.alive & self.source_pathologies)))
+        result.update(v for _, v in self._iter_rows(np.flatnonzero(self.alive & self.target_pathologies)))
+        return result
+
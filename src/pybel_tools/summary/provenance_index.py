@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+"""This module contains indexes of the provenance of the edges in a BEL graph, so the edges citing given PubMed
+identifiers or written by given authors can be looked up without checking every edge, and PubMed identifiers and
+authors can be suggested from the beginning of their names without checking all of them.
+"""
+
+import re
+import threading
+from bisect import bisect_left
+
+from pybel.constants import CITATION, CITATION_TYPE, CITATION_REFERENCE, CITATION_AUTHORS
+from ..constants import PUBMED
+
+__all__ = [
+    'PrefixIndex',
+    'ProvenanceIndex',
+]
+
+_WORD_START = re.compile(r'(?<!\w)\w', re.UNICODE)
+
+
+def _iter_word_suffixes(text):
+    """Iterates over the parts of a string starting at each of its words
+
+    :param str text: A string, like ``Hoyt, Charles T``
+    :rtype: iter[str]
+    """
+    for match in _WORD_START.finditer(text):
+        yield text[match.start():]
+
+
+class PrefixIndex:
+    """A sorted array of strings that finds the ones starting with a given prefix by binary search. The search is
+    case-insensitive.
+
+    New strings are kept aside and merged into the sorted array the next time it's searched, so adding strings one by
+    one stays cheap. Strings can be added and searched from different threads.
+    """
+
+    def __init__(self, values=None, words=False):
+        """
+        :param iter[str] values: The strings to index
+        :param bool words: Should strings also be found by the beginning of any of their words, and not only by the
+                           beginning of the whole string? Useful for names like ``Hoyt, Charles T``.
+        """
+        self.words = words
+
+        self._values = set()
+        self._keys = []
+        self._key_values = []
+        self._pending = []
+        self._lock = threading.Lock()
+
+        if values is not None:
+            self.update(values)
+
+    def __contains__(self, value):
+        return value in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, value):
+        """Adds a string to the index
+
+        :param str value: A string
+        """
+        with self._lock:
+            self._add(value)
+
+    def _add(self, value):
+        if value in self._values:
+            return
+
+        self._values.add(value)
+
+        lower = value.lower()
+        keys = _iter_word_suffixes(lower) if self.words else (lower,)
+        self._pending.extend((key, value) for key in keys)
+
+    def update(self, values):
+        """Adds strings to the index
+
+        :param iter[str] values: An iterable of strings
+        """
+        with self._lock:
+            for value in values:
+                self._add(value)
+
+    def _merge_pending(self):
+        if not self._pending:
+            return
+
+        # Timsort merges the sorted array with the sorted new entries in linear time
+        entries = list(zip(self._keys, self._key_values))
+        entries.extend(sorted(self._pending))
+        entries.sort()
+
+        self._keys = [key for key, _ in entries]
+        self._key_values = [value for _, value in entries]
+        self._pending = []
+
+    def search(self, prefix, limit=None):
+        """Finds the strings starting with the given prefix, in the order of their matching parts
+
+        :param str prefix: The beginning of a string, or of one of its words if the index was built with ``words``
+        :param int limit: The maximum number of strings to return. If none, returns all of them.
+        :rtype: list[str]
+        """
+        with self._lock:
+            self._merge_pending()
+            # merging replaces the arrays instead of changing them, so they can be read without holding the lock
+            keys, key_values = self._keys, self._key_values
+
+        prefix = prefix.lower()
+
+        result = []
+        seen = set()
+
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                break
+
+            value = key_values[i]
+
+            if value in seen:
+                continue
+
+            seen.add(value)
+            result.append(value)
+
+            if limit is not None and len(result) >= limit:
+                break
+
+        return result
+
+
+def _get_authors(citation):
+    """Gets the authors of a citation, whether or not they've been parsed with
+    :func:`pybel_tools.mutation.parse_authors`
+
+    :param dict citation: A citation dictionary
+    :rtype: list[str]
+    """
+    authors = citation.get(CITATION_AUTHORS)
+
+    if not authors:
+        return []
+
+    if isinstance(authors, str):
+        return [author.strip() for author in authors.split('|') if author.strip()]
+
+    return authors
+
+
+class ProvenanceIndex:
+    """An index of {PubMed identifier: set of edges} and {author: set of edges}"""
+
+    def __init__(self):
+        #: A dictionary of {str PubMed identifier: set of edge identifiers}
+        self.pmid_edges = {}
+        #: A dictionary of {str author: set of edge identifiers}
+        self.author_edges = {}
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Indexes the citations of all edges in a graph, which are identified by (source, target, key) tuples
+
+        :param pybel.BELGraph graph: A BEL graph
+        :rtype: ProvenanceIndex
+        """
+        index = cls()
+
+        for u, v, k, d in graph.edges_iter(keys=True, data=True):
+            if CITATION in d:
+                index.add((u, v, k), d[CITATION])
+
+        return index
+
+    def add(self, edge, citation):
+        """Adds an edge's citation to the index
+
+        :param edge: The edge's identifier
+        :param dict citation: The edge's citation dictionary
+        """
+        self.add_many([edge], citation)
+
+    def add_many(self, edges, citation):
+        """Adds several edges with the same citation to the index
+
+        :param iter edges: An iterable of edge identifiers
+        :param dict citation: The edges' citation dictionary
+        """
+        edges = set(edges)
+
+        if citation.get(CITATION_TYPE) == PUBMED:
+            self.pmid_edges.setdefault(citation[CITATION_REFERENCE], set()).update(edges)
+
+        for author in _get_authors(citation):
+            self.author_edges.setdefault(author, set()).update(edges)
+
+    def update(self, index):
+        """Adds the entries of another index to this one
+
+        :param ProvenanceIndex index: Another index
+        """
+        for mine, theirs in ((self.pmid_edges, index.pmid_edges), (self.author_edges, index.author_edges)):
+            for key, edges in theirs.items():
+                mine.setdefault(key, set()).update(edges)
+
+    def get_pmid_edges(self, pmids):
+        """Gets the edges citing any of the given PubMed identifiers, like the edges passing
+        :func:`pybel_tools.filters.build_pmid_inclusion_filter`
+
+        :param pmids: A PubMed identifier or iterable of PubMed identifiers
+        :type pmids: str or iter[str]
+        :rtype: set
+        """
+        return self._get_edges(self.pmid_edges, pmids)
+
+    def get_author_edges(self, authors):
+        """Gets the edges citing publications by any of the given authors, like the edges passing
+        :func:`pybel_tools.filters.build_author_inclusion_filter`
+
+        :param authors: An author or iterable of authors
+        :type authors: str or iter[str]
+        :rtype: set
+        """
+        return self._get_edges(self.author_edges, authors)
+
+    @staticmethod
+    def _get_edges(edges_by_key, keys):
+        if isinstance(keys, str):
+            keys = [keys]
+
+        result = set()
+        for key in keys:
+            result.update(edges_by_key.get(key, ()))
+
+        return result
@@ -4,13 +4,13 @@
 
 from __future__ import print_function
 
-import itertools as itt
 from collections import defaultdict
 from operator import itemgetter
 
 from pybel.constants import *
 from ..selection.group_nodes import group_nodes_by_annotation_filtered, group_nodes_by_annotation
-from ..utils import calculate_tanimoto_set_distances, check_has_annotation, count_dict_values
+from ..utils import calculate_set_overlaps, calculate_tanimoto_matrix, calculate_tanimoto_set_distances, \
+    check_has_annotation, count_dict_values
 
 __all__ = [
     'count_subgraph_sizes',
@@ -44,8 +44,9 @@ def calculate_subgraph_edge_overlap(graph, annotation='Subgraph'):
     :param pybel.BELGraph graph: A BEL graph
     :param annotation: The annotation to group by and compare. Defaults to 'Subgraph'
     :type annotation: str
-    :return: {subgraph: set of edges}, {(subgraph 1, subgraph2): set of intersecting edges},
-            {(subgraph 1, subgraph2): set of unioned edges}, {(subgraph 1, subgraph2): tanimoto similarity},
+    :return: {subgraph: set of edges}, and matrices of the number of intersecting edges, the number of unioned edges,
+            and the tanimoto similarity of each pair of subgraphs, labeled by subgraph
+    :rtype: tuple[dict[str,set[tuple]],pandas.DataFrame,pandas.DataFrame,pandas.DataFrame]
     """
 
     sg2edge = defaultdict(set)
@@ -55,14 +56,8 @@ def calculate_subgraph_edge_overlap(graph, annotation='Subgraph'):
             continue
         sg2edge[d[ANNOTATIONS][annotation]].add((u, v))
 
-    subgraph_intersection = defaultdict(dict)
-    subgraph_union = defaultdict(dict)
-    result = defaultdict(dict)
-
-    for sg1, sg2 in itt.product(sg2edge, repeat=2):
-        subgraph_intersection[sg1][sg2] = sg2edge[sg1] & sg2edge[sg2]
-        subgraph_union[sg1][sg2] = sg2edge[sg1] | sg2edge[sg2]
-        result[sg1][sg2] = len(subgraph_intersection[sg1][sg2]) / len(subgraph_union[sg1][sg2])
+    subgraph_intersection, subgraph_union = calculate_set_overlaps(sg2edge)
+    result = calculate_tanimoto_matrix(subgraph_intersection, subgraph_union)
 
     return sg2edge, subgraph_intersection, subgraph_union, result
 
@@ -73,8 +68,8 @@ def summarize_subgraph_edge_overlap(graph, annotation='Subgraph'):
     :param pybel.BELGraph graph: A BEL graph
     :param annotation: The annotation to group by and compare. Defaults to :code:`"Subgraph"`
     :type annotation: str
-    :return: A similarity matrix in a dict of dicts
-    :rtype: dict
+    :return: A similarity matrix, labeled by subgraph
+    :rtype: pandas.DataFrame
     """
     _, _, _, subgraph_overlap = calculate_subgraph_edge_overlap(graph, annotation)
     return subgraph_overlap
@@ -115,6 +110,8 @@ def summarize_subgraph_node_overlap(graph, node_filters=None, annotation='Subgra
     """Calculates the subgraph similarity tanimoto similarity in nodes passing the given filter
 
     Provides an alternate view on subgraph similarity, from a more node-centric view
+
+    :rtype: pandas.DataFrame
     """
     r1 = group_nodes_by_annotation_filtered(graph, node_filters=node_filters, annotation=annotation)
     r2 = calculate_tanimoto_set_distances(r1)
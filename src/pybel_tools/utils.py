@@ -2,7 +2,6 @@
 
 """This module contains functions useful throughout PyBEL Tools"""
 
-import itertools as itt
 import json
 import logging
 import os
@@ -11,13 +10,16 @@ from itertools import zip_longest
 from operator import itemgetter
 
 import jinja2
-import networkx as nx
+import numpy as np
 import pandas as pd
 from pkg_resources import get_distribution
+from scipy import sparse
 
 from pybel.constants import ANNOTATIONS, CITATION_TYPE, CITATION_NAME, CITATION_REFERENCE, CITATION_DATE, \
     CITATION_AUTHORS, CITATION_COMMENTS, RELATION
 
+from .centrality import get_default_centrality_service
+
 CENTRALITY_SAMPLES = 200
 
 
@@ -160,24 +162,88 @@ def calculate_single_tanimoto_set_distances(target, dict_of_sets):
     return {k: tanimoto_set_similarity(target_set, s) for k, s in dict_of_sets.items()}
 
 
-def calculate_tanimoto_set_distances(dict_of_sets):
-    """Returns a distance matrix keyed by the keys in the given dict. Distances are calculated
-    based on pairwise tanimoto similarity of the sets contained
+def get_set_incidence_matrix(dict_of_sets):
+    """Builds a sparse matrix with a row for each set and a column for each element, which is one where the element is
+    in the set
 
     :param dict_of_sets: A dict of {x: set of y}
     :type dict_of_sets: dict
-    :return: A similarity matrix based on the set overlap (tanimoto) score between each x as a dict of dicts
-    :rtype: dict
+    :return: The keys in the order of the rows, the elements in the order of the columns, and the matrix
+    :rtype: tuple[list,list,scipy.sparse.csr_matrix]
     """
-    result = defaultdict(dict)
+    labels = list(dict_of_sets)
+    element_columns = {}
+    rows, columns = [], []
+
+    for row, label in enumerate(labels):
+        for element in dict_of_sets[label]:
+            rows.append(row)
+            columns.append(element_columns.setdefault(element, len(element_columns)))
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, columns)),
+        shape=(len(labels), len(element_columns))
+    )
+    matrix.data.fill(1)  # elements repeated in the same set were summed
 
-    for x, y in itt.combinations(dict_of_sets, 2):
-        result[x][y] = result[y][x] = tanimoto_set_similarity(dict_of_sets[x], dict_of_sets[y])
+    return labels, list(element_columns), matrix
 
-    for x in dict_of_sets:
-        result[x][x] = 1.0
 
-    return dict(result)
+def _calculate_overlap_arrays(matrix):
+    """Calculates the sizes of the intersection and of the union of each pair of rows of an incidence matrix
+
+    :param scipy.sparse.csr_matrix matrix: An incidence matrix from :func:`get_set_incidence_matrix`
+    :rtype: tuple[numpy.ndarray,numpy.ndarray]
+    """
+    intersections = matrix.dot(matrix.T).toarray()
+    sizes = intersections.diagonal()
+    unions = sizes[:, np.newaxis] + sizes[np.newaxis, :] - intersections
+    return intersections, unions
+
+
+def calculate_set_overlaps(dict_of_sets):
+    """Calculates the number of elements in the intersection and in the union of each pair of sets with one sparse
+    matrix product, without building the intersections or unions
+
+    :param dict_of_sets: A dict of {x: set of y}
+    :type dict_of_sets: dict
+    :return: The matrices of the sizes of the intersections and of the unions, labeled by the keys in the given dict
+    :rtype: tuple[pandas.DataFrame,pandas.DataFrame]
+    """
+    labels, _, matrix = get_set_incidence_matrix(dict_of_sets)
+    intersections, unions = _calculate_overlap_arrays(matrix)
+
+    return (
+        pd.DataFrame(intersections, index=labels, columns=labels),
+        pd.DataFrame(unions, index=labels, columns=labels),
+    )
+
+
+def calculate_tanimoto_matrix(intersections, unions):
+    """Calculates the tanimoto similarity of each pair of sets from the sizes of their intersection and union. The
+    similarity of each set to itself is 1.0, and the similarity of two empty sets is 0.0.
+
+    :param pandas.DataFrame intersections: The matrix of the sizes of the intersections
+    :param pandas.DataFrame unions: The matrix of the sizes of the unions
+    :rtype: pandas.DataFrame
+    """
+    result = np.zeros(unions.shape)
+    np.divide(intersections.values, unions.values, out=result, where=unions.values != 0)
+    np.fill_diagonal(result, 1.0)
+    return pd.DataFrame(result, index=unions.index, columns=unions.columns)
+
+
+def calculate_tanimoto_set_distances(dict_of_sets):
+    """Returns a distance matrix keyed by the keys in the given dict. Distances are calculated
+    based on pairwise tanimoto similarity of the sets contained
+
+    :param dict_of_sets: A dict of {x: set of y}
+    :type dict_of_sets: dict
+    :return: A similarity matrix based on the set overlap (tanimoto) score between each x, labeled by x
+    :rtype: pandas.DataFrame
+    """
+    intersections, unions = calculate_set_overlaps(dict_of_sets)
+    return calculate_tanimoto_matrix(intersections, unions)
 
 
 def calculate_global_tanimoto_set_distances(dict_of_sets):
@@ -187,21 +253,16 @@ def calculate_global_tanimoto_set_distances(dict_of_sets):
 
     :param dict_of_sets: A dict of {x: set of y}
     :type dict_of_sets: dict
-    :return: A similarity matrix based on the alternative tanimoto distance as a dict of dicts
-    :rtype: dict
+    :return: A similarity matrix based on the alternative tanimoto distance, labeled by x
+    :rtype: pandas.DataFrame
     """
-    universe = set(itt.chain.from_iterable(dict_of_sets.values()))
-    universe_size = len(universe)
+    labels, elements, matrix = get_set_incidence_matrix(dict_of_sets)
+    _, unions = _calculate_overlap_arrays(matrix)
 
-    result = defaultdict(dict)
+    universe_size = len(elements)
+    result = 1.0 - unions / universe_size if universe_size else np.ones(unions.shape)
 
-    for x, y in itt.combinations(dict_of_sets, 2):
-        result[x][y] = result[y][x] = 1.0 - len(dict_of_sets[x] | dict_of_sets[y]) / universe_size
-
-    for x in dict_of_sets:
-        result[x][x] = 1.0 - len(x) / universe_size
-
-    return dict(result)
+    return pd.DataFrame(result, index=labels, columns=labels)
 
 
 def all_edges_iter(graph, u, v):
@@ -280,6 +341,40 @@ def is_edge_consistent(graph, u, v):
     return 0 == len(set(d[RELATION] for d in graph.edge[u][v].values()))
 
 
+def get_consistent_pair_edges(graph, pairs, edge_filter=None):
+    """Checks the relations of the edges between many pairs of nodes at once. A pair is consistent if all of the edges
+    from its source to its target that pass the filter have the same relation.
+
+    :param pybel.BELGraph graph: A BEL graph
+    :param iter[tuple[tuple,tuple]] pairs: An iterable of pairs of source and target nodes with edges in the graph
+    :param edge_filter: An optional edge filter function (graph, node, node, key, data) -> bool
+    :type edge_filter: types.FunctionType
+    :return: A dictionary of {(source, target): list of edge data dictionaries} for the consistent pairs
+    :rtype: dict[tuple[tuple,tuple],list[dict]]
+    """
+    result = {}
+
+    for u, v in pairs:
+        relation = None
+        edges = []
+
+        for k, d in graph.edge[u][v].items():
+            if edge_filter is not None and not edge_filter(graph, u, v, k, d):
+                continue
+
+            if relation is None:
+                relation = d[RELATION]
+            elif relation != d[RELATION]:
+                break
+
+            edges.append(d)
+        else:
+            if edges:
+                result[u, v] = edges
+
+    return result
+
+
 def safe_add_edge(graph, u, v, key, attr_dict, **attr):
     """Adds an edge while preserving negative keys, and paying no respect to positive ones
 
@@ -302,6 +397,25 @@ def safe_add_edge(graph, u, v, key, attr_dict, **attr):
         graph.add_edge(u, v, attr_dict=attr_dict, **attr)
 
 
+def copy_nested(value):
+    """Copies a (nested) value made of dictionaries, lists, and sets, like a node or edge data dictionary. It's faster
+    than :func:`copy.deepcopy` for the small dictionaries of BEL graphs. Other values, like strings and tuples, are
+    kept as they are.
+
+    :rtype: object
+    """
+    if isinstance(value, dict):
+        return {k: copy_nested(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [copy_nested(v) for v in value]
+
+    if isinstance(value, set):
+        return {copy_nested(v) for v in value}
+
+    return value
+
+
 def load_differential_gene_expression(data_path, gene_symbol_column='Gene.symbol', logfc_column='logFC'):
     """Quick and dirty loader for differential gene expression data
     
@@ -392,11 +506,14 @@ def enable_cool_mode():
 
 
 def calc_betweenness_centality(graph):
-    try:
-        res = Counter(nx.betweenness_centrality(graph, k=CENTRALITY_SAMPLES))
-        return res
-    except:
-        return Counter(nx.betweenness_centrality(graph))
+    """Estimates the betweenness centralities of the nodes in a graph from a seeded sample of
+    :data:`CENTRALITY_SAMPLES` sources with the shared centrality service, or calculates them exactly for smaller
+    graphs
+
+    :param pybel.BELGraph graph: A BEL graph
+    :rtype: collections.Counter
+    """
+    return get_default_centrality_service().get_betweenness_centrality(graph, k=CENTRALITY_SAMPLES)
 
 
 def grouper(n, iterable, fillvalue=None):
@@ -15,7 +15,7 @@ from pybel.constants import GENE
 from pybel.manager.models import Network
 from six import StringIO
 
-from .extension import get_manager, get_api
+from .extension import get_manager, get_api, get_mechanism_cache
 from .forms import DifferentialGeneExpressionForm
 from .main_service import get_graph_from_request
 from .models import Experiment
@@ -30,6 +30,46 @@ log = logging.getLogger(__name__)
 
 LABEL = 'dgxa'
 
+#: Describes the preprocessing in :func:`generate_cmpa_mechanisms`. Change it whenever the preprocessing changes, so
+#: the mechanisms cached with the old preprocessing are not used anymore.
+CMPA_PIPELINE = ';'.join([
+    'remove_nodes_by_namespace(MGI,RGD)',
+    'collapse_by_central_dogma_to_genes',
+    'rewire_variants_to_genes',
+    'overlay_type_data({},{},HGNC,impute=0)'.format(LABEL, GENE),
+    'generate_bioprocess_mechanisms({})'.format(LABEL),
+])
+
+
+def generate_cmpa_mechanisms(graph):
+    """Preprocesses a network and generates the candidate mechanisms for CMPA without any experimental data.
+
+    Since the missing data is imputed when it's overlaid, all HGNC genes get a value no matter the data, so the pruning
+    of the mechanisms doesn't depend on the data and a placeholder is overlaid here. Use :func:`overlay_cmpa_data` to
+    overlay the actual data on the mechanisms.
+
+    :param pybel.BELGraph graph: A BEL graph. Is modified in place.
+    :return: A dictionary of {tuple node: pybel.BELGraph candidate mechanism}
+    :rtype: dict[tuple,pybel.BELGraph]
+    """
+    remove_nodes_by_namespace(graph, {'MGI', 'RGD'})
+    collapse_by_central_dogma_to_genes(graph)
+    rewire_variants_to_genes(graph)
+
+    overlay_type_data(graph, {}, LABEL, GENE, 'HGNC', overwrite=False, impute=0)
+
+    return generation.generate_bioprocess_mechanisms(graph, LABEL)
+
+
+def overlay_cmpa_data(candidate_mechanisms, data):
+    """Overlays the experimental data on the candidate mechanisms from :func:`generate_cmpa_mechanisms`
+
+    :param dict[tuple,pybel.BELGraph] candidate_mechanisms: A dictionary of {tuple node: candidate mechanism}
+    :param dict[str,float] data: A dictionary of {HGNC gene symbol: data}
+    """
+    for subgraph in candidate_mechanisms.values():
+        overlay_type_data(subgraph, data, LABEL, GENE, 'HGNC', overwrite=True, impute=0)
+
 
 def build_analysis_service(app):
     """Builds the analysis service
@@ -107,16 +147,30 @@ def build_analysis_service(app):
         data = {k: v for _, k, v in df.itertuples()}
 
         network = manager.get_network_by_id(network_id)
-        graph = pybel.from_bytes(network.blob)
 
-        remove_nodes_by_namespace(graph, {'MGI', 'RGD'})
-        collapse_by_central_dogma_to_genes(graph)
-        rewire_variants_to_genes(graph)
+        def build_mechanisms():
+            return generate_cmpa_mechanisms(pybel.from_bytes(network.blob))
 
-        overlay_type_data(graph, data, LABEL, GENE, 'HGNC', overwrite=False, impute=0)
+        mechanism_cache = get_mechanism_cache(app)
 
-        candidate_mechanisms = generation.generate_bioprocess_mechanisms(graph, LABEL)
-        scores = npa.calculate_average_npa_on_subgraphs(candidate_mechanisms, LABEL, runs=form.permutations.data)
+        if mechanism_cache is None:
+            candidate_mechanisms = build_mechanisms()
+        else:
+            candidate_mechanisms = mechanism_cache.get_or_build(
+                network.id,
+                network.blob,
+                build_mechanisms,
+                pipeline=CMPA_PIPELINE
+            )
+
+        overlay_cmpa_data(candidate_mechanisms, data)
+
+        scores = npa.calculate_average_npa_on_subgraphs(
+            candidate_mechanisms,
+            LABEL,
+            runs=form.permutations.data,
+            n_jobs=app.config.get('PYBEL_WEB_CMPA_JOBS'),
+        )
 
         log.info('done running CMPA in %.2fs', time.time() - t)
 
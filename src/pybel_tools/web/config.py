@@ -23,3 +23,12 @@ class Config:
     PYBEL_DS_CHECK_VERSION = True
     PYBEL_DS_EAGER = False
     PYBEL_DS_PRELOAD = False
+    PYBEL_DS_PRELOAD_JOBS = None
+    PYBEL_DS_PRELOAD_BACKGROUND = True
+    PYBEL_DS_SNAPSHOT = None
+    PYBEL_DS_QUERY_CACHE_EDGES = None
+    PYBEL_DS_QUERY_CACHE_TTL = 3600
+
+    PYBEL_PATHS_CUTOFF = 7
+    PYBEL_PATHS_MAX_PATHS = 1000
+    PYBEL_PATHS_TIME_BUDGET = 5
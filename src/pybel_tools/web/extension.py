@@ -1,20 +1,38 @@
 # -*- coding: utf-8 -*-
 
-from pybel.constants import PYBEL_CONNECTION
+import os
+
+from pybel.constants import PYBEL_CONNECTION, PYBEL_DIR
 from pybel.manager import build_manager
 from pybel.manager.models import Base
 
+from ..analysis.mechanism_cache import MechanismCache
 from ..api import DatabaseService
+from ..centrality import CentralityService, get_default_centrality_service, set_default_centrality_service
+
+#: The default directory for caching the candidate mechanisms of each network
+DEFAULT_MECHANISM_CACHE = os.path.join(PYBEL_DIR, 'mechanisms')
+
+#: The default directory for caching the betweenness centralities of the networks and query results
+DEFAULT_CENTRALITY_CACHE = os.path.join(PYBEL_DIR, 'centralities')
 
 
 class _FlaskPybelState:
-    def __init__(self, manager):
+    def __init__(self, manager, mechanism_cache=None, api=None, centrality_service=None):
         """Stores the application-wide PyBEL data
         
         :param pybel.manager.cache.CacheManager manager: A cache manager
+        :param MechanismCache mechanism_cache: An on-disk cache for candidate mechanisms
+        :param DatabaseService api: The dictionary service. Is built from the manager if not given.
+        :param CentralityService centrality_service: The centrality service. Defaults to the one shared by the
+                                                     summary functions.
         """
         self.manager = manager
-        self.api = DatabaseService(manager=self.manager)
+        self.api = DatabaseService(manager=self.manager) if api is None else api
+        self.mechanism_cache = mechanism_cache
+        self.centrality_service = (
+            get_default_centrality_service() if centrality_service is None else centrality_service
+        )
 
 
 class FlaskPybel:
@@ -27,13 +45,48 @@ class FlaskPybel:
     def init_app(self, app):
         """
         :param flask.Flask app: 
+
+        The candidate mechanisms are cached in the directory given by ``PYBEL_WEB_MECHANISM_CACHE``, which defaults to
+        ``~/.pybel/mechanisms`` and can be set to an empty value to disable caching. Its maximum size in bytes is given
+        by ``PYBEL_WEB_MECHANISM_CACHE_SIZE``.
+
+        The query results of the dictionary service are cached up to a total of ``PYBEL_DS_QUERY_CACHE_EDGES`` edges
+        and expire after ``PYBEL_DS_QUERY_CACHE_TTL`` seconds.
+
+        The betweenness centralities are cached in the directory given by ``PYBEL_WEB_CENTRALITY_CACHE``, which
+        defaults to ``~/.pybel/centralities`` and can be set to an empty value to only cache them in memory. They're
+        calculated by ``PYBEL_WEB_CENTRALITY_JOBS`` worker processes. This service is also used by the summary
+        functions, like :func:`pybel_tools.utils.calc_betweenness_centality`.
         """
         manager = build_manager(app.config.get(PYBEL_CONNECTION))
 
         Base.metadata.bind = manager.engine
         Base.query = manager.session.query_property()
 
-        state = _FlaskPybelState(manager)
+        mechanism_cache_directory = app.config.get('PYBEL_WEB_MECHANISM_CACHE', DEFAULT_MECHANISM_CACHE)
+        mechanism_cache = MechanismCache(
+            mechanism_cache_directory,
+            max_size=app.config.get('PYBEL_WEB_MECHANISM_CACHE_SIZE')
+        ) if mechanism_cache_directory else None
+
+        api = DatabaseService(
+            manager=manager,
+            query_cache_edges=app.config.get('PYBEL_DS_QUERY_CACHE_EDGES'),
+            query_cache_ttl=app.config.get('PYBEL_DS_QUERY_CACHE_TTL')
+        )
+
+        centrality_service = CentralityService(
+            directory=app.config.get('PYBEL_WEB_CENTRALITY_CACHE', DEFAULT_CENTRALITY_CACHE) or None,
+            n_jobs=app.config.get('PYBEL_WEB_CENTRALITY_JOBS')
+        )
+        set_default_centrality_service(centrality_service)
+
+        state = _FlaskPybelState(
+            manager,
+            mechanism_cache=mechanism_cache,
+            api=api,
+            centrality_service=centrality_service
+        )
 
         app.extensions = getattr(app, 'extensions', {})
         app.extensions['pybel'] = state
@@ -66,3 +119,22 @@ def get_api(app):
     :rtype: DatabaseService
     """
     return get_state(app).api
+
+
+def get_mechanism_cache(app):
+    """Gets the candidate mechanism cache from a Flask app
+
+    :param flask.Flask app: A Flask app
+    :return: The mechanism cache, or None if caching is disabled
+    :rtype: Optional[MechanismCache]
+    """
+    return get_state(app).mechanism_cache
+
+
+def get_centrality_service(app):
+    """Gets the betweenness centrality service from a Flask app
+
+    :param flask.Flask app: A Flask app
+    :rtype: CentralityService
+    """
+    return get_state(app).centrality_service
@@ -5,7 +5,6 @@
 import logging
 import os
 import time
-from operator import itemgetter
 
 import flask
 import networkx as nx
@@ -22,10 +21,10 @@ from pybel import from_url
 from pybel.constants import METADATA_NAME, METADATA_AUTHORS, METADATA_CONTACT
 from pybel.constants import SMALL_CORPUS_URL, LARGE_CORPUS_URL, FRAUNHOFER_RESOURCES, PYBEL_LOG_DIR
 from pybel.manager.models import Namespace, Annotation, Network
-from .extension import get_manager, get_api
+from .extension import get_manager, get_api, get_mechanism_cache, get_centrality_service
 from .forms import SeedProvenanceForm, SeedSubgraphForm
 from .models import Report, get_recent_reports
-from .send_utils import serve_network
+from .send_utils import serve_network, serve_json_list
 from .utils import render_graph_summary, try_insert_graph, sanitize_list_of_str
 from ..api import DatabaseService
 from ..constants import BMS_BASE
@@ -33,8 +32,8 @@ from ..definition_utils import write_namespace
 from ..ioutils import convert_recursive, upload_recursive, get_paths_recursive
 from ..mutation.metadata import fix_pubmed_citations
 from ..selection.induce_subgraph import SEED_TYPES, SEED_TYPE_PROVENANCE
+from ..selection.paths import get_ranked_paths, get_shortest_paths_between_node_sets
 from ..summary.error_summary import get_undefined_namespace_names, get_incorrect_names
-from ..summary.export import info_json
 from ..summary.provenance import get_authors, get_pubmed_identifiers
 
 log = logging.getLogger(__name__)
@@ -58,9 +57,21 @@ PATHS_METHOD = 'paths_method'
 PIPELINE = 'pipeline'
 AUTOLOAD = 'autoload'
 FILTERS = 'filters'
+OFFSET = 'offset'
+LIMIT = 'limit'
 # TODO: delete once pipeline is ready
 FILTER_PATHOLOGIES = 'pathology_filter'
 
+#: The default maximum number of nodes suggested by /api/suggestion/nodes/
+DEFAULT_SUGGESTION_LIMIT = 50
+
+#: The default maximum number of edges in the paths from /api/paths/
+DEFAULT_PATHS_CUTOFF = 7
+#: The default maximum number of paths returned by /api/paths/
+DEFAULT_PATHS_MAX_PATHS = 1000
+#: The default number of seconds /api/paths/ looks for paths
+DEFAULT_PATHS_TIME_BUDGET = 5
+
 BLACK_LIST = {
     GRAPH_ID,
     APPEND_PARAM,
@@ -79,15 +90,16 @@ BLACK_LIST = {
     AUTOLOAD,
     FILTERS,
     FILTER_PATHOLOGIES,
+    LIMIT,
 }
 
 
-def get_graph_from_request(api):
-    """Process the GET request returning the filtered graph
-    
+def get_query_from_request(api):
+    """Process the GET request returning the arguments of the query for the filtered graph
+
     :param DatabaseService api: The database service
-    :return: graph: A BEL graph
-    :rtype: pybel.BELGraph
+    :return: A dictionary of keyword arguments for :meth:`DatabaseService.query`
+    :rtype: dict
     """
 
     network_id = request.args.get(GRAPH_ID)
@@ -136,7 +148,8 @@ def get_graph_from_request(api):
 
     annotations = {k: request.args.getlist(k) for k in request.args if k not in BLACK_LIST}
 
-    graph = api.query(
+    return dict(
+        annotations,
         network_id=network_id,
         seed_method=seed_method,
         seed_data=seed_data,
@@ -144,10 +157,17 @@ def get_graph_from_request(api):
         remove_nodes=remove_nodes,
         filters=filters,
         filter_pathologies=filter_pathologies,
-        **annotations
     )
 
-    return graph
+
+def get_graph_from_request(api):
+    """Process the GET request returning the filtered graph
+    
+    :param DatabaseService api: The database service
+    :return: graph: A BEL graph
+    :rtype: pybel.BELGraph
+    """
+    return api.query(**get_query_from_request(api))
 
 
 def get_networks_with_permission(api):
@@ -175,6 +195,24 @@ def get_networks_with_permission(api):
     return networks
 
 
+def invalidate_mechanisms(app, network_id=None):
+    """Removes the cached candidate mechanisms of a dropped network
+
+    :param flask.Flask app: A Flask app
+    :param network_id: The identifier of the dropped network. If none, removes the mechanisms for all networks.
+    :type network_id: int
+    """
+    mechanism_cache = get_mechanism_cache(app)
+
+    if mechanism_cache is None:
+        return
+
+    if network_id is None:
+        mechanism_cache.clear()
+    else:
+        mechanism_cache.invalidate(network_id)
+
+
 def build_dictionary_service_admin(app):
     """Dictionary Service Admin Functions"""
     manager = get_manager(app)
@@ -185,7 +223,7 @@ def build_dictionary_service_admin(app):
     def run_reload():
         """Reloads the networks and supernetwork"""
         api.clear()
-        api.cache_networks(force_reload=True)
+        api.cache_networks(force_reload=True, snapshot_path=app.config.get('PYBEL_DS_SNAPSHOT'))
         return jsonify({'status': 200})
 
     @app.route('/admin/enrich')
@@ -337,6 +375,7 @@ def build_dictionary_service_admin(app):
 def build_api_admin(app):
     """API Admin functions"""
     manager = get_manager(app)
+    api = get_api(app)
 
     @app.route('/admin/rollback')
     @roles_required('admin')
@@ -351,6 +390,8 @@ def build_api_admin(app):
         """Drops a specific graph"""
         log.info('dropping graphs %s', network_id)
         manager.drop_graph(network_id)
+        api.remove_network(network_id)
+        invalidate_mechanisms(app, network_id)
         return jsonify({'status': 200})
 
     @app.route('/admin/manage/graphs/dropall')
@@ -359,6 +400,8 @@ def build_api_admin(app):
         """Drops all graphs"""
         log.info('dropping all graphs')
         manager.drop_graphs()
+        api.clear()
+        invalidate_mechanisms(app)
         return jsonify({'status': 200})
 
     @app.route('/admin/manage/namespaces/drop/<int:namespace_id>')
@@ -415,13 +458,23 @@ def build_main_service(app):
     api = get_api(app)
 
     if app.config.get('PYBEL_DS_PRELOAD', False):
-        log.info('preloading networks')
-        api.cache_networks(
-            check_version=app.config.get('PYBEL_DS_CHECK_VERSION', True),
-            force_reload=app.config.get('PYBEL_WEB_FORCE_RELOAD', False),
-            eager=app.config.get('PYBEL_DS_EAGER', False)
-        )
-        log.info('pre-loaded the dict service')
+        snapshot_path = app.config.get('PYBEL_DS_SNAPSHOT')
+        eager = app.config.get('PYBEL_DS_EAGER', False)
+        force_reload = app.config.get('PYBEL_WEB_FORCE_RELOAD', False)
+
+        if snapshot_path and not force_reload and api.load_fresh_snapshot(snapshot_path, eager=eager):
+            log.info('loaded the dict service from snapshot %s', snapshot_path)
+        else:
+            log.info('preloading networks')
+            api.cache_networks(
+                check_version=app.config.get('PYBEL_DS_CHECK_VERSION', True),
+                force_reload=force_reload,
+                eager=eager,
+                n_jobs=app.config.get('PYBEL_DS_PRELOAD_JOBS'),
+                background=app.config.get('PYBEL_DS_PRELOAD_BACKGROUND', True),
+                snapshot_path=snapshot_path,
+            )
+            log.info('pre-loading the dict service')
 
     build_dictionary_service_admin(app)
     build_api_admin(app)
@@ -572,7 +625,7 @@ def build_main_service(app):
     @app.route('/api/summary/<int:network_id>')
     def get_number_nodes(network_id):
         """Gets a summary of the given network"""
-        return jsonify(info_json(api.get_network(network_id)))
+        return jsonify(dict(api.get_summary(network_id)['info']))
 
     @app.route('/api/network/', methods=['GET'])
     @login_required
@@ -597,6 +650,8 @@ def build_main_service(app):
         if not current_user.admin:
             flask.abort(403)
         manager.drop_graph(network_id)
+        api.remove_network(network_id)
+        invalidate_mechanisms(app, network_id)
         flask.flash('Dropped network {}'.format(network_id))
         return redirect(url_for('view_networks'))
 
@@ -613,6 +668,8 @@ def build_main_service(app):
             manager.session.delete(report.network)
             manager.session.delete(report)
             manager.commit()
+            api.remove_network(network_id)
+            invalidate_mechanisms(app, network_id)
             flask.flash('Dropped network {}'.format(network_id))
         except:
             manager.rollback()
@@ -620,6 +677,11 @@ def build_main_service(app):
 
         return redirect(url_for('view_networks'))
 
+    @app.route('/api/warmup')
+    def get_warm_up_status():
+        """Returns the progress of loading the networks in the background"""
+        return jsonify(api.warm_up_status)
+
     @app.route('/api/tree/')
     @login_required
     def get_tree_api():
@@ -629,10 +691,16 @@ def build_main_service(app):
 
     @app.route('/api/paths/')
     def get_paths_api():
-        """Returns array of shortest/all paths given a source node and target node both belonging in the graph
-        :return: JSON 
+        """Returns array of shortest/all paths given a source node and target node both belonging in the graph.
+
+        All paths are bounded by the ``PYBEL_PATHS_CUTOFF``, ``PYBEL_PATHS_MAX_PATHS`` and ``PYBEL_PATHS_TIME_BUDGET``
+        configuration options, which the ``limit`` argument can lower, and are streamed from the best to the worst
+        ranked.
+
+        :return: JSON
         """
-        graph = get_graph_from_request(api)
+        query = get_query_from_request(api)
+        graph = api.query(**query)
 
         if SOURCE_NODE not in request.args:
             raise ValueError('no source')
@@ -656,22 +724,32 @@ def build_main_service(app):
             log.info('Nodes in graph: %s', graph.nodes())
             return flask.abort(500)
 
-        if undirected:
-            graph = graph.to_undirected()
-
         if method == 'all':
-            # TODO: Think about increasing the cutoff
-            all_paths = nx.all_simple_paths(graph, source=source, target=target, cutoff=7)
-            # all_paths is a generator -> convert to list and create a list of lists (paths)
-            return jsonify(list(all_paths))
+            max_paths = app.config.get('PYBEL_PATHS_MAX_PATHS', DEFAULT_PATHS_MAX_PATHS)
 
-        try:
-            shortest_path = nx.shortest_path(graph, source=source, target=target)
-        except nx.NetworkXNoPath:
+            if LIMIT in request.args:
+                max_paths = min(max_paths, int(request.args[LIMIT]))
+
+            paths = get_ranked_paths(
+                graph,
+                source,
+                target,
+                cutoff=app.config.get('PYBEL_PATHS_CUTOFF', DEFAULT_PATHS_CUTOFF),
+                max_paths=max_paths,
+                time_budget=app.config.get('PYBEL_PATHS_TIME_BUDGET', DEFAULT_PATHS_TIME_BUDGET),
+                undirected=undirected,
+                adjacency=api.get_undirected_adjacency(**query) if undirected else None,
+            )
+
+            return serve_json_list(paths)
+
+        shortest_paths = get_shortest_paths_between_node_sets(graph, [source], [target], undirected=undirected)
+
+        if not shortest_paths:
             log.debug('No paths between: {} and {}'.format(source, target))
             return 'No paths between the selected nodes'
 
-        return jsonify(shortest_path)
+        return jsonify(shortest_paths[0])
 
     @app.route('/api/centrality/', methods=['GET'])
     def get_nodes_by_betweenness_centrality():
@@ -686,9 +764,9 @@ def build_main_service(app):
         if node_numbers > nx.number_of_nodes(graph):
             return 'The number introduced is bigger than the nodes in the network'
 
-        bw_dict = nx.betweenness_centrality(graph)
+        bw_dict = get_centrality_service(app).get_betweenness_centrality(graph)
 
-        node_list = [i[0] for i in sorted(bw_dict.items(), key=itemgetter(1), reverse=True)[0:node_numbers]]
+        node_list = [node for node, _ in bw_dict.most_common(node_numbers)]
 
         return jsonify(node_list)
 
@@ -716,11 +794,16 @@ def build_main_service(app):
 
     @app.route('/api/suggestion/nodes/')
     def get_node_suggestion():
-        """Suggests a node based on the search criteria"""
+        """Suggests nodes based on the search criteria, from the best to the worst match. The results can be paged
+        through with the ``offset`` and ``limit`` arguments."""
         if not request.args['search']:
             return jsonify([])
 
-        autocompletion_set = api.get_nodes_containing_keyword(request.args['search'])
+        autocompletion_set = api.get_nodes_containing_keyword(
+            request.args['search'],
+            offset=request.args.get(OFFSET, 0, type=int),
+            limit=request.args.get(LIMIT, DEFAULT_SUGGESTION_LIMIT, type=int)
+        )
 
         return jsonify(autocompletion_set)
 
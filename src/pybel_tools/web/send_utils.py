@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import json
 import logging
 
 from flask import send_file, Response, jsonify
@@ -48,6 +49,28 @@ def to_json_custom(graph, _id='id', source='source', target='target', key='key')
     return result
 
 
+def _iter_json_list(items):
+    """Iterates over the chunks of the JSON array of the given items, one item at a time"""
+    yield '['
+
+    for i, item in enumerate(items):
+        if i:
+            yield ','
+
+        yield json.dumps(item)
+
+    yield ']'
+
+
+def serve_json_list(items):
+    """A helper function to stream a JSON array without building the whole document in memory
+
+    :param iter items: An iterable of JSON serializable items
+    :rtype: flask.Response
+    """
+    return Response(_iter_json_list(items), mimetype='application/json')
+
+
 def serve_network(graph, serve_format=None):
     """A helper function to serialize a graph and download as a file"""
     if serve_format is None or serve_format == 'json':
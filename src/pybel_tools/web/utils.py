@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import itertools as itt
-from collections import Counter
 
 import flask
 from flask import current_app
@@ -17,14 +16,7 @@ from ..analysis.stability import *
 from ..constants import CNAME
 from ..filters.edge_filters import edge_has_pathology_causal, filter_edges
 from ..filters.node_filters import iter_undefined_families
-from ..summary import get_contradiction_summary, count_functions, count_relations, count_error_types, get_translocated, \
-    get_degradations, get_activities, count_namespaces, group_errors
-from ..summary.edge_summary import count_diseases, get_unused_annotations, get_unused_list_annotation_values
-from ..summary.error_summary import get_undefined_namespaces, get_undefined_annotations, \
-    get_namespaces_with_incorrect_names
-from ..summary.export import info_list
-from ..summary.node_properties import count_variants
-from ..summary.node_summary import get_unused_namespaces
+from ..summary import get_contradiction_summary, summarize_graph
 from ..utils import prepare_c3, count_dict_values, calc_betweenness_centality
 
 log = logging.getLogger(__name__)
@@ -91,9 +83,11 @@ def render_graph_summary_no_api(graph):
     :param pybel.BELGraph graph: A BEL graph
     :return: A Flask Resposne object
     """
+    summary = summarize_graph(graph)
+
     hub_data = {
         graph.node[node][CNAME]: count
-        for node, count in Counter(graph.degree()).most_common(25)
+        for node, count in summary['degrees'].most_common(25)
     }
     centrality_data = {
         graph.node[node][CNAME]: count
@@ -101,43 +95,49 @@ def render_graph_summary_no_api(graph):
     }
     disease_data = {
         graph.node[node][CNAME]: count
-        for node, count in count_diseases(graph).most_common(25)
+        for node, count in summary['diseases'].most_common(25)
     }
 
-    undefined_namespaces = get_undefined_namespaces(graph)
-    undefined_annotations = get_undefined_annotations(graph)
-    namespaces_with_incorrect_names = get_namespaces_with_incorrect_names(graph)
-
-    unused_namespaces = get_unused_namespaces(graph)
-    unused_annotations = get_unused_annotations(graph)
-    unused_list_annotation_values = get_unused_list_annotation_values(graph)
-
     return render_template(
         'summary.html',
-        chart_1_data=prepare_c3(count_functions(graph), 'Entity Type'),
-        chart_2_data=prepare_c3(count_relations(graph), 'Relationship Type'),
-        chart_3_data=prepare_c3(count_error_types(graph), 'Error Type'),
+        graph=graph,
+        time=None,
+        current_user=current_user,
+        **_get_summary_template_data(summary, hub_data, centrality_data, disease_data)
+    )
+
+
+def _get_summary_template_data(summary, hub_data, centrality_data, disease_data):
+    """Gets the parts of the graph summary page that come from :func:`pybel_tools.summary.summarize_graph`
+
+    :param dict summary: The summary of a graph
+    :param dict hub_data: The degrees of the top hubs
+    :param dict centrality_data: The centralities of the most central nodes
+    :param dict disease_data: The counts of the top pathologies
+    :rtype: dict
+    """
+    return dict(
+        chart_1_data=prepare_c3(summary['functions'], 'Entity Type'),
+        chart_2_data=prepare_c3(summary['relations'], 'Relationship Type'),
+        chart_3_data=prepare_c3(summary['error_types'], 'Error Type'),
         chart_4_data=prepare_c3({
-            'Translocations': len(get_translocated(graph)),
-            'Degradations': len(get_degradations(graph)),
-            'Molecular Activities': len(get_activities(graph))
+            'Translocations': len(summary['translocations']),
+            'Degradations': len(summary['degradations']),
+            'Molecular Activities': len(summary['activities'])
         }, 'Modifier Type'),
-        chart_5_data=prepare_c3(count_variants(graph), 'Node Variants'),
-        chart_6_data=prepare_c3(count_namespaces(graph), 'Namespaces'),
+        chart_5_data=prepare_c3(summary['variants'], 'Node Variants'),
+        chart_6_data=prepare_c3(summary['namespaces'], 'Namespaces'),
         chart_7_data=prepare_c3(hub_data, 'Top Hubs'),
         chart_8_data=prepare_c3(centrality_data, 'Top Central'),
         chart_9_data=prepare_c3(disease_data, 'Pathologies'),
-        error_groups=count_dict_values(group_errors(graph)).most_common(20),
-        info_list=info_list(graph),
-        graph=graph,
-        time=None,
-        undefined_namespaces=sorted(undefined_namespaces),
-        unused_namespaces=sorted(unused_namespaces),
-        undefined_annotations=sorted(undefined_annotations),
-        unused_annotations=sorted(unused_annotations),
-        unused_list_annotation_values=sorted(unused_list_annotation_values.items()),
-        current_user=current_user,
-        namespaces_with_incorrect_names=namespaces_with_incorrect_names
+        error_groups=count_dict_values(summary['error_groups']).most_common(20),
+        info_list=summary['info'],
+        undefined_namespaces=sorted(summary['undefined_namespaces']),
+        unused_namespaces=sorted(summary['unused_namespaces']),
+        undefined_annotations=sorted(summary['undefined_annotations']),
+        unused_annotations=sorted(summary['unused_annotations']),
+        unused_list_annotation_values=sorted(summary['unused_list_annotation_values'].items()),
+        namespaces_with_incorrect_names=summary['namespaces_with_incorrect_names'],
     )
 
 
@@ -165,9 +165,11 @@ def render_graph_summary(graph_id, graph, api=None):
         node_bel_cache[node] = decanonicalize_node(graph, node)
         return node_bel_cache[node]
 
+    motifs = get_stability_motifs(graph)
+
     unstable_pairs = itt.chain.from_iterable([
-        ((u, v, 'Chaotic') for u, v, in get_chaotic_pairs(graph)),
-        ((u, v, 'Dampened') for u, v, in get_dampened_pairs(graph)),
+        ((u, v, 'Chaotic') for u, v, in motifs['chaotic_pairs']),
+        ((u, v, 'Dampened') for u, v, in motifs['dampened_pairs']),
     ])
     unstable_pairs = [
         (dcn(u), api.get_node_id(u), dcn(v), api.get_node_id(v), label)
@@ -180,11 +182,11 @@ def render_graph_summary(graph_id, graph, api=None):
     ]
 
     contradictory_triplets = itt.chain.from_iterable([
-        ((a, b, c, 'Separate') for a, b, c in get_separate_unstable_correlation_triples(graph)),
-        ((a, b, c, 'Mutual') for a, b, c in get_mutually_unstable_correlation_triples(graph)),
-        ((a, b, c, 'Jens') for a, b, c in get_jens_unstable_alpha(graph)),
-        ((a, b, c, 'Increase Mismatch') for a, b, c in get_increase_mismatch_triplets(graph)),
-        ((a, b, c, 'Decrease Mismatch') for a, b, c in get_decrease_mismatch_triplets(graph)),
+        ((a, b, c, 'Separate') for a, b, c in motifs['separate_unstable_correlation_triples']),
+        ((a, b, c, 'Mutual') for a, b, c in motifs['mutually_unstable_correlation_triples']),
+        ((a, b, c, 'Jens') for a, b, c in motifs['jens_unstable_alpha']),
+        ((a, b, c, 'Increase Mismatch') for a, b, c in motifs['increase_mismatch_triplets']),
+        ((a, b, c, 'Decrease Mismatch') for a, b, c in motifs['decrease_mismatch_triplets']),
 
     ])
 
@@ -194,21 +196,15 @@ def render_graph_summary(graph_id, graph, api=None):
     ]
 
     unstable_triplets = itt.chain.from_iterable([
-        ((a, b, c, 'Chaotic') for a, b, c in get_chaotic_triplets(graph)),
-        ((a, b, c, 'Dampened') for a, b, c in get_dampened_triplets(graph)),
+        ((a, b, c, 'Chaotic') for a, b, c in motifs['chaotic_triplets']),
+        ((a, b, c, 'Dampened') for a, b, c in motifs['dampened_triplets']),
     ])
     unstable_triplets = [
         (dcn(a), api.get_node_id(a), dcn(b), api.get_node_id(b), dcn(c), api.get_node_id(c), d)
         for a, b, c, d in unstable_triplets
     ]
 
-    undefined_namespaces = get_undefined_namespaces(graph)
-    undefined_annotations = get_undefined_annotations(graph)
-    namespaces_with_incorrect_names = get_namespaces_with_incorrect_names(graph)
-
-    unused_namespaces = get_unused_namespaces(graph)
-    unused_annotations = get_unused_annotations(graph)
-    unused_list_annotation_values = get_unused_list_annotation_values(graph)
+    summary = api.get_summary(graph_id, graph=graph)
 
     versions = api.manager.get_networks(name=graph.name)
 
@@ -224,21 +220,6 @@ def render_graph_summary(graph_id, graph, api=None):
 
     return render_template(
         'summary.html',
-        chart_1_data=prepare_c3(count_functions(graph), 'Entity Type'),
-        chart_2_data=prepare_c3(count_relations(graph), 'Relationship Type'),
-        chart_3_data=prepare_c3(count_error_types(graph), 'Error Type'),
-        chart_4_data=prepare_c3({
-            'Translocations': len(get_translocated(graph)),
-            'Degradations': len(get_degradations(graph)),
-            'Molecular Activities': len(get_activities(graph))
-        }, 'Modifier Type'),
-        chart_5_data=prepare_c3(count_variants(graph), 'Node Variants'),
-        chart_6_data=prepare_c3(count_namespaces(graph), 'Namespaces'),
-        chart_7_data=prepare_c3(hub_data, 'Top Hubs'),
-        chart_8_data=prepare_c3(centrality_data, 'Top Central'),
-        chart_9_data=prepare_c3(disease_data, 'Pathologies'),
-        error_groups=count_dict_values(group_errors(graph)).most_common(20),
-        info_list=info_list(graph),
         contradictions=contradictory_pairs,
         unstable_pairs=unstable_pairs,
         contradictory_triplets=contradictory_triplets,
@@ -246,14 +227,9 @@ def render_graph_summary(graph_id, graph, api=None):
         graph=graph,
         graph_id=graph_id,
         time=None,
-        undefined_namespaces=sorted(undefined_namespaces),
-        unused_namespaces=sorted(unused_namespaces),
-        undefined_annotations=sorted(undefined_annotations),
-        unused_annotations=sorted(unused_annotations),
-        unused_list_annotation_values=sorted(unused_list_annotation_values.items()),
         current_user=current_user,
-        namespaces_with_incorrect_names=namespaces_with_incorrect_names,
         network_versions=versions,
         causal_pathologies=causal_pathologies,
         undefined_families=undefined_sfam,
+        **_get_summary_template_data(summary, hub_data, centrality_data, disease_data)
     )
@@ -1,8 +1,49 @@
 # -*- coding: utf-8 -*-
 
 import os
+import random
+
+from pybel import BELGraph
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 resources_path = os.path.join(dir_path, 'resources')
 
 rgd_orthologs_path = os.path.join(resources_path, 'RGD_ORTHOLOGS.txt')
+
+
+def make_random_graph(number_nodes, number_edges, seed, graph_cls=BELGraph, make_node=None, make_data=None,
+                      self_loops=True, exact=False):
+    """Makes a reproducible random graph for comparing implementations
+
+    :param int number_nodes: The number of nodes
+    :param int number_edges: The number of edges to add
+    :param int seed: The seed of the random number generator
+    :param type graph_cls: The class of the graph
+    :param make_node: A function that takes the index of a node and the random number generator and returns the node.
+                      Tuples are added with :meth:`pybel.BELGraph.add_simple_node`. Defaults to the index.
+    :param make_data: A function that takes the random number generator and returns the data of an edge. Defaults to
+                      no data.
+    :param bool self_loops: Can edges connect a node to itself?
+    :param bool exact: Adds edges until the graph has ``number_edges``, so repeated ones in simple graphs don't count
+    """
+    rng = random.Random(seed)
+    graph = graph_cls()
+
+    nodes = [i if make_node is None else make_node(i, rng) for i in range(number_nodes)]
+    for node in nodes:
+        if isinstance(node, tuple):
+            graph.add_simple_node(*node)
+        else:
+            graph.add_node(node)
+
+    count = 0
+    while (graph.number_of_edges() if exact else count) < number_edges:
+        if self_loops:
+            u, v = rng.choice(nodes), rng.choice(nodes)
+        else:
+            u, v = rng.sample(nodes, 2)
+
+        graph.add_edge(u, v, attr_dict=(None if make_data is None else make_data(rng)))
+        count += 1
+
+    return graph
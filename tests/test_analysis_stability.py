@@ -1,9 +1,14 @@
+import itertools as itt
 import unittest
 
+from networkx import DiGraph
+
 from pybel import BELGraph
 from pybel.constants import *
 from pybel_tools.analysis.stability import *
+from pybel_tools.analysis.stability import find_3_cycles_digraph
 from pybel_tools.mutation.inference import infer_missing_two_way_edges
+from tests.constants import make_random_graph
 
 
 class TestUnstableTriplets(unittest.TestCase):
@@ -92,3 +97,74 @@ class TestUnstableTriplets(unittest.TestCase):
         g.add_edge(c, b, **{RELATION: NEGATIVE_CORRELATION})
         g.add_edge(e, c, **{RELATION: POSITIVE_CORRELATION})
         g.add_edge(e, b, **{RELATION: POSITIVE_CORRELATION})
+
+
+relations = [INCREASES, DIRECTLY_DECREASES, DECREASES, POSITIVE_CORRELATION, NEGATIVE_CORRELATION, ASSOCIATION]
+
+
+def make_protein(i, rng):
+    return PROTEIN, 'HGNC', str(i)
+
+
+def make_relation(rng):
+    return {RELATION: rng.choice(relations)}
+
+
+def get_3_cycles_by_relations(graph, relations):
+    """Builds the graph of the given relations and finds its 3-cycles like the original implementation"""
+    result = DiGraph()
+    for u, v, d in graph.edges_iter(data=True):
+        if d[RELATION] in relations:
+            result.add_edge(u, v)
+    return find_3_cycles_digraph(result)
+
+
+class TestCausalMotifScanner(unittest.TestCase):
+    def test_same_as_graphs(self):
+        for seed in range(5):
+            graph = make_random_graph(20, 150, seed, make_node=make_protein, make_data=make_relation,
+                                      self_loops=False)
+            motifs = get_stability_motifs(graph)
+
+            self.assertEqual(get_3_cycles_by_relations(graph, CAUSAL_INCREASE_RELATIONS), motifs['chaotic_triplets'])
+            self.assertEqual(get_3_cycles_by_relations(graph, CAUSAL_DECREASE_RELATIONS), motifs['dampened_triplets'])
+            self.assertEqual(find_3_cycles_digraph(jens_transformation(graph)), motifs['jens_unstable_alpha'])
+
+            cg = get_correlation_graph(graph)
+            triangles = get_correlation_triangles(cg)
+
+            self.assertEqual(
+                {t for t in triangles if all(NEGATIVE_CORRELATION in cg.edge[u][v] for u, v in itt.combinations(t, 2))},
+                set(motifs['mutually_unstable_correlation_triples'])
+            )
+
+            for a, b, c in motifs['separate_unstable_correlation_triples']:
+                self.assertIn(tuple(sorted([a, b, c], key=str)), triangles)
+                self.assertIn(POSITIVE_CORRELATION, cg.edge[a][b])
+                self.assertIn(POSITIVE_CORRELATION, cg.edge[a][c])
+                self.assertIn(NEGATIVE_CORRELATION, cg.edge[b][c])
+
+            for a, b, c in motifs['increase_mismatch_triplets']:
+                self.assertTrue(any(d[RELATION] in CAUSAL_INCREASE_RELATIONS for d in graph.edge[a][b].values()))
+                self.assertTrue(any(d[RELATION] in CAUSAL_INCREASE_RELATIONS for d in graph.edge[a][c].values()))
+                self.assertIn(NEGATIVE_CORRELATION, cg.edge[b][c])
+
+            for u, v in motifs['regulatory_pairs']:
+                self.assertTrue(any(d[RELATION] in CAUSAL_INCREASE_RELATIONS for d in graph.edge[u][v].values()))
+                self.assertTrue(any(d[RELATION] in CAUSAL_DECREASE_RELATIONS for d in graph.edge[v][u].values()))
+
+    def test_pairs(self):
+        a, b, c = (PROTEIN, 'HGNC', 'A'), (PROTEIN, 'HGNC', 'B'), (PROTEIN, 'HGNC', 'C')
+
+        graph = BELGraph()
+        graph.add_edge(a, b, **{RELATION: INCREASES})
+        graph.add_edge(b, a, **{RELATION: DIRECTLY_INCREASES})
+        graph.add_edge(b, c, **{RELATION: INCREASES})
+        graph.add_edge(c, b, **{RELATION: DECREASES})
+        graph.add_edge(c, a, **{RELATION: DECREASES})
+        graph.add_edge(a, c, **{RELATION: DECREASES})
+        graph.add_edge(a, a, **{RELATION: INCREASES})
+
+        self.assertEqual({(b, c)}, get_regulatory_pairs(graph))
+        self.assertEqual({(a, b)}, get_chaotic_pairs(graph))
+        self.assertEqual({(a, c)}, get_dampened_pairs(graph))
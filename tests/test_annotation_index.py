@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from pybel import BELGraph
+from pybel.constants import *
+from pybel_tools.selection import get_subgraph_by_annotation_value, get_subgraph_by_data, get_subgraphs_by_annotation
+from pybel_tools.summary import AnnotationIndex, count_annotations, count_annotation_values, get_tree_annotations
+
+HGNC = 'HGNC'
+
+a = PROTEIN, HGNC, 'A'
+b = PROTEIN, HGNC, 'B'
+c = PROTEIN, HGNC, 'C'
+d = PROTEIN, HGNC, 'D'
+
+
+def build_graph():
+    graph = BELGraph()
+
+    for node in (a, b, c, d):
+        graph.add_simple_node(*node)
+
+    for u, v, annotations in (
+            (a, b, {'Species': '9606', 'Cell': 'neuron'}),
+            (a, b, {'Species': '10090', 'Cell': 'neuron'}),
+            (b, c, {'Species': '9606'}),
+            (c, d, {'Cell': 'glia'}),
+            (a, d, {}),
+    ):
+        graph.add_edge(u, v, attr_dict={RELATION: INCREASES, EVIDENCE: str(annotations), ANNOTATIONS: annotations})
+
+    return graph
+
+
+def edge_set(graph):
+    return {(u, v, k) for u, v, k in graph.edges_iter(keys=True)}
+
+
+class TestAnnotationIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph = build_graph()
+        self.index = AnnotationIndex.from_graph(self.graph)
+
+    def test_counts(self):
+        self.assertEqual({'Species', 'Cell'}, self.index.get_annotations())
+        self.assertEqual(count_annotations(self.graph), self.index.count_annotations())
+
+        for annotation in ('Species', 'Cell', 'Missing'):
+            self.assertEqual(count_annotation_values(self.graph, annotation), self.index.count_values(annotation))
+
+    def test_tree(self):
+        self.assertEqual(get_tree_annotations(self.graph), self.index.get_tree())
+
+    def test_query(self):
+        for annotations in (
+                {'Species': '9606'},
+                {'Species': '9606', 'Cell': 'neuron'},
+                {'Species': ['9606', '10090'], 'Cell': 'neuron'},
+                {'Species': '9606', 'Cell': 'glia'},
+                {'Missing': 'value'},
+        ):
+            expected = edge_set(get_subgraph_by_data(self.graph, {ANNOTATIONS: annotations}))
+            self.assertEqual(expected, self.index.query(annotations), msg=annotations)
+
+    def test_restrict(self):
+        edges = {(u, v, k) for u, v, k in self.graph.edges_iter(keys=True) if u == a}
+        index = self.index.restrict(edges)
+
+        self.assertEqual({'neuron': 2}, index.count_values('Cell'))
+        self.assertEqual({'9606': 1, '10090': 1}, index.count_values('Species'))
+
+    def test_subgraphs_by_annotation(self):
+        subgraphs = get_subgraphs_by_annotation(self.graph, annotation='Species')
+
+        self.assertEqual({'9606', '10090'}, set(subgraphs))
+
+        for value, subgraph in subgraphs.items():
+            expected = get_subgraph_by_annotation_value(self.graph, value, annotation='Species')
+            self.assertEqual(edge_set(expected), edge_set(subgraph))
+            self.assertEqual(set(expected), set(subgraph))
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pybel import BELGraph, to_bytes
+from pybel.constants import *
+from pybel.parser.parse_exceptions import UndefinedNamespaceWarning
+from pybel_tools.api import DatabaseService
+from pybel_tools.constants import CNAME
+from pybel_tools.mutation import expand_internal, serialize_authors
+from pybel_tools.selection.induce_subgraph import SEED_TYPE_NEIGHBORS, SEED_TYPE_PROVENANCE, get_subgraph
+from pybel_tools.summary import (
+    count_annotation_values, get_authors, get_tree_annotations, get_undefined_namespace_names,
+)
+
+HGNC = 'HGNC'
+
+a = PROTEIN, HGNC, 'A'
+b = PROTEIN, HGNC, 'B'
+c = PROTEIN, HGNC, 'C'
+c_rna = RNA, HGNC, 'C'
+d = PROTEIN, HGNC, 'D'
+d_gene = GENE, HGNC, 'D'
+d_rna = RNA, HGNC, 'D'
+
+
+def make_edge_data(relation, pmid, evidence, annotations=None):
+    return {
+        RELATION: relation,
+        CITATION: {
+            CITATION_TYPE: CITATION_TYPE_PUBMED,
+            CITATION_NAME: 'Paper {}'.format(pmid),
+            CITATION_REFERENCE: pmid,
+            CITATION_AUTHORS: 'Author A|Author {}'.format(pmid),
+        },
+        EVIDENCE: evidence,
+        ANNOTATIONS: annotations or {},
+    }
+
+
+def build_network(name, edges):
+    graph = BELGraph()
+    graph.graph[GRAPH_METADATA] = {METADATA_NAME: name, METADATA_VERSION: '1.0.0'}
+
+    for u, v, data in edges:
+        for node in (u, v):
+            if node not in graph:
+                graph.add_simple_node(*node)
+        graph.add_edge(u, v, attr_dict=data)
+
+    return graph
+
+
+def build_networks():
+    first = build_network('first', [
+        (a, b, make_edge_data(INCREASES, '1', 'A increases B', {'Species': '9606'})),
+        (b, c, make_edge_data(DECREASES, '1', 'B decreases C', {'Species': '9606'})),
+    ])
+    first.add_warning(3, 'p(FAKE:X)', UndefinedNamespaceWarning(3, 'p(FAKE:X)', 2, 'FAKE', 'X'))
+    second = build_network('second', [
+        (a, b, make_edge_data(INCREASES, '1', 'A increases B', {'Species': '9606'})),  # same as in the first
+        (a, b, make_edge_data(INCREASES, '2', 'A increases B again')),
+        (c, d, make_edge_data(ASSOCIATION, '2', 'C is associated with D')),
+    ])
+    return first, second
+
+
+def edge_set(graph, api):
+    """Gets a set of comparable edges, with nodes relabeled back to tuples"""
+    return {
+        (api.nid_node[u], api.nid_node[v], repr(sorted(data.items())))
+        for u, v, data in graph.edges_iter(data=True)
+    }
+
+
+class TestDatabaseService(unittest.TestCase):
+    def setUp(self):
+        self.api = DatabaseService(manager=None, graph_cache_size=1)
+        self.first, self.second = build_networks()
+        self.api.add_network(1, self.first)
+        self.api.add_network(2, self.second)
+
+    def test_store(self):
+        # the shared edges, including the ones added by infer_central_dogma, are stored once
+        self.assertEqual(len(edge_set(self.first, self.api) | edge_set(self.second, self.api)),
+                         self.api.store.number_of_edges())
+        self.assertEqual(2, len(self.api.store.citations))
+
+    def test_networks(self):
+        for network_id, expected in ((1, self.first), (2, self.second)):
+            self.api._graphs.clear()
+            graph = self.api.get_network(network_id)
+
+            self.assertEqual(expected.name, graph.name)
+            self.assertEqual(set(expected.nodes()), set(graph.nodes()))
+            self.assertEqual(edge_set(expected, self.api), edge_set(graph, self.api))
+
+        self.assertEqual(1, len(self.api._graphs))
+
+    def test_warnings(self):
+        self.assertEqual({'X'}, get_undefined_namespace_names(self.api.get_network(1), 'FAKE'))
+        self.assertEqual([], self.api.get_network(2).warnings)
+
+    def test_node_data_copied(self):
+        graph = self.api.get_network(1)
+        node = self.api.get_node_id(a)
+        graph.node[node]['test'] = True
+
+        self.api._graphs.clear()
+        self.assertNotIn('test', self.api.get_network(1).node[node])
+
+    def test_edge_data_copied(self):
+        """Checks that changing the citations of one network doesn't change the others, which share them"""
+        serialize_authors(self.api.get_network(1))
+
+        authors = {'Author A', 'Author 1', 'Author 2'}
+        self.assertEqual(authors, get_authors(self.api.get_network(2)))
+        self.assertEqual(authors, get_authors(self.api.universe))
+
+    def test_query_result_copied(self):
+        """Checks that changing the citations of a query result doesn't change the networks it was made from"""
+        serialize_authors(self.api.query(network_id=1))
+
+        self.assertEqual({'Author A', 'Author 1'}, get_authors(self.api.get_network(1)))
+        self.assertEqual({'Author A', 'Author 1', 'Author 2'}, get_authors(self.api.get_network(2)))
+        self.assertEqual({'Author A', 'Author 1', 'Author 2'}, get_authors(self.api.universe))
+
+    def test_cname(self):
+        node = self.api.get_node_id(d_gene)
+        self.assertEqual('D', self.api.get_cname(node))
+
+        del self.api.store.node_data[node][CNAME]
+        self.assertEqual('D', self.api.get_cname(node))
+        self.assertIsNone(self.api._universe)
+
+    def test_universe(self):
+        universe = self.api.get_network()
+
+        self.assertEqual(edge_set(self.first, self.api) | edge_set(self.second, self.api),
+                         edge_set(universe, self.api))
+        self.assertIn(self.api.node_nid[d_gene], universe)
+        self.assertIn(self.api.node_nid[d_rna], universe)
+
+    def test_get_edges(self):
+        a_id, b_id, c_id = (self.api.get_node_id(node) for node in (a, b, c))
+
+        self.assertEqual(2, len(self.api.get_edges(a_id, b_id)))
+        self.assertEqual({'1', '2'}, {data[CITATION][CITATION_REFERENCE] for data in self.api.get_edges(a_id, b_id)})
+
+        with self.assertRaises(ValueError):
+            self.api.get_edges(a_id, c_id)
+
+    def test_query(self):
+        result = self.api.query(2, seed_method=SEED_TYPE_NEIGHBORS, seed_data=[self.api.get_node_id(c)])
+        self.assertEqual({c, c_rna, d}, {self.api.nid_node[node] for node in result})
+
+        result = self.api.query(seed_method=SEED_TYPE_NEIGHBORS, seed_data=[self.api.get_node_id(c)])
+        self.assertEqual({b, c, c_rna, d}, {self.api.nid_node[node] for node in result})
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.api = DatabaseService(manager=None)
+        self.first, self.second = build_networks()
+        self.api.add_network(1, self.first)
+        self.api.add_network(2, self.second)
+
+    def query(self, network_id=None):
+        return self.api.query(network_id, seed_method=SEED_TYPE_NEIGHBORS, seed_data=[self.api.get_node_id(c)])
+
+    def test_hit(self):
+        first = self.query()
+        second = self.query()
+
+        self.assertEqual(1, self.api.query_cache.hits)
+        self.assertIsNot(first, second)
+        self.assertEqual(edge_set(first, self.api), edge_set(second, self.api))
+
+    def test_hit_copied(self):
+        """Checks that changing the citations of a query result doesn't change the cached result"""
+        serialize_authors(self.query(), force_serialize=True)
+
+        self.assertEqual({'Author A', 'Author 1', 'Author 2'}, get_authors(self.query()))
+        self.assertEqual(1, self.api.query_cache.hits)
+
+    def get_undirected_adjacency(self, network_id=None):
+        return self.api.get_undirected_adjacency(network_id, seed_method=SEED_TYPE_NEIGHBORS,
+                                                 seed_data=[self.api.get_node_id(c)])
+
+    def test_undirected_adjacency(self):
+        graph = self.query()
+        adjacency = self.get_undirected_adjacency()
+        nid = self.api.get_node_id(c)
+
+        self.assertEqual(set(graph), set(adjacency))
+        self.assertEqual(set(graph.pred[nid]) | set(graph.succ[nid]), adjacency[nid])
+        self.assertIs(adjacency, self.get_undirected_adjacency())
+
+        self.api.remove_network(2)
+        self.assertIsNot(adjacency, self.get_undirected_adjacency())
+        self.assertNotIn(self.api.get_node_id(d), self.get_undirected_adjacency())
+
+    def test_invalidate_add(self):
+        self.query(1)
+        self.query(2)
+        self.query()
+
+        e = PROTEIN, HGNC, 'E'
+        self.api.add_network(3, build_network('third', [(c, e, make_edge_data(INCREASES, '3', 'C increases E'))]))
+
+        self.assertEqual(2, len(self.api.query_cache))  # only the universe query is invalidated
+        self.assertIn(e, {self.api.nid_node[node] for node in self.query()})
+
+    def test_remove(self):
+        self.query(2)
+        self.query()
+
+        self.api.remove_network(2)
+
+        self.assertEqual(0, len(self.api.query_cache))
+        self.assertNotIn(2, self.api.store)
+        self.assertNotIn(d, {self.api.nid_node[node] for node in self.query()})
+
+
+class TestAnnotationIndex(unittest.TestCase):
+    def setUp(self):
+        self.api = DatabaseService(manager=None)
+        self.first, self.second = build_networks()
+        self.third = build_network('third', [
+            (a, c, make_edge_data(INCREASES, '3', 'A increases C', {'Species': '10090', 'Cell': 'neuron'})),
+            (b, d, make_edge_data(DECREASES, '3', 'B decreases D', {'Species': '9606', 'Cell': 'neuron'})),
+            (c, d, make_edge_data(INCREASES, '3', 'C increases D', {'Cell': 'glia'})),
+        ])
+
+        for network_id, graph in enumerate((self.first, self.second, self.third), start=1):
+            self.api.add_network(network_id, graph)
+
+    def test_counts(self):
+        for network_id in (1, 2, 3, None):
+            graph = self.api.get_network(network_id)
+
+            for annotation in ('Species', 'Cell'):
+                self.assertEqual(count_annotation_values(graph, annotation),
+                                 self.api.count_annotation_values(annotation, network_id))
+
+    def test_tree(self):
+        for network_id in (1, 3, None):
+            self.assertEqual(get_tree_annotations(self.api.get_network(network_id)),
+                             self.api.get_tree_annotations(network_id))
+
+        self.assertEqual(self.api.get_tree_annotations(3), self.api.get_tree_annotations('3'))
+
+    def test_query(self):
+        """Checks that queries filtered by annotations give the same results as filtering every edge"""
+        for network_id in (3, None):
+            for annotations in (
+                    {'Species': '9606'},
+                    {'Cell': 'neuron', 'Species': '9606'},
+                    {'Cell': ['neuron', 'glia']},
+                    {'Cell': 'neuron', 'Species': 'missing'},
+            ):
+                expected = get_subgraph(self.api.get_network(network_id), **annotations)
+                result = self.api.query(network_id, **annotations)
+                self.assertEqual(edge_set(expected, self.api), edge_set(result, self.api))
+
+    def test_add(self):
+        self.assertEqual({'neuron': 2, 'glia': 1}, self.api.count_annotation_values('Cell'))
+
+        e = PROTEIN, HGNC, 'E'
+        self.api.add_network(4, build_network('fourth', [
+            (d, e, make_edge_data(INCREASES, '4', 'D increases E', {'Cell': 'glia'})),
+        ]))
+
+        self.assertEqual({'neuron': 2, 'glia': 2}, self.api.count_annotation_values('Cell'))
+        self.assertEqual({'glia': 1}, self.api.count_annotation_values('Cell', 4))
+
+        self.api.remove_network(3)
+
+        self.assertEqual({'glia': 1}, self.api.count_annotation_values('Cell'))
+
+
+class TestProvenanceIndex(unittest.TestCase):
+    def setUp(self):
+        self.api = DatabaseService(manager=None)
+        self.first, self.second = build_networks()
+        self.api.add_network(1, self.first)
+        self.api.add_network(2, self.second)
+
+    def test_query(self):
+        """Checks that seeding by provenance with the index gives the same results as checking every edge"""
+        for network_id in (1, 2, None):
+            for seed_data in ({'pmids': ['2']}, {'authors': ['Author 1']}, {'pmids': ['2'], 'authors': ['Author A']}):
+                graph = self.api.get_network(network_id)
+                expected = get_subgraph(graph, seed_method=SEED_TYPE_PROVENANCE, seed_data=seed_data)
+                expand_internal(graph, expected)
+                result = self.api.query(network_id, seed_method=SEED_TYPE_PROVENANCE, seed_data=seed_data)
+                self.assertEqual(edge_set(expected, self.api), edge_set(result, self.api))
+
+    def test_suggestions(self):
+        self.assertEqual(['1', '2'], self.api.get_pubmed_containing_keyword(''))
+        self.assertEqual(['2'], self.api.get_pubmed_containing_keyword('2'))
+        self.assertEqual(['Author 2'], self.api.get_authors_containing_keyword('2'))
+        self.assertEqual(['Author 1'], self.api.get_authors_containing_keyword('auth', limit=1))
+
+        e = PROTEIN, HGNC, 'E'
+        self.api.add_network(3, build_network('third', [(c, e, make_edge_data(INCREASES, '3', 'C increases E'))]))
+
+        self.assertEqual(['3'], self.api.get_pubmed_containing_keyword('3'))
+        self.assertEqual(['Author 1', 'Author 2', 'Author 3', 'Author A'],
+                         self.api.get_authors_containing_keyword('author'))
+
+        universe = self.api.get_network()
+        edges = self.api.get_provenance_index().get_pmid_edges('3')
+        self.assertEqual({'C increases E'}, {universe.edge[u][v][k][EVIDENCE] for u, v, k in edges})
+
+
+class TestNodeSuggestion(unittest.TestCase):
+    def setUp(self):
+        self.api = DatabaseService(manager=None)
+        self.first, self.second = build_networks()
+        self.api.add_network(1, self.first)
+
+    def test_suggestion(self):
+        expected = {
+            bel
+            for bel in self.api.bel_id
+            if 'hgnc:c' in bel.lower()
+        }
+        self.assertEqual(expected, {entry['text'] for entry in self.api.get_nodes_containing_keyword('HGNC:C')})
+        self.assertNotIn('HGNC:D', str(self.api.get_nodes_containing_keyword('HGNC:D')))
+
+        self.api.add_network(2, self.second)
+
+        result = self.api.get_nodes_containing_keyword('HGNC:D')
+        self.assertIn(self.api.node_nid[d], {int(entry['id']) for entry in result})
+        self.assertEqual(result[:1], self.api.get_nodes_containing_keyword('HGNC:D', limit=1))
+
+
+class TestWarmUp(unittest.TestCase):
+    def test_warm_up(self):
+        """Checks that loading the networks with a process pool gives the same results as loading them serially"""
+        first, second = build_networks()
+        networks = [(1, to_bytes(first)), (2, to_bytes(second))]
+
+        api = DatabaseService(manager=None)
+        api._warm_up(networks, n_jobs=2)
+
+        self.assertEqual({'total': 2, 'loaded': 2, 'failed': 0, 'done': True}, api.warm_up_status)
+
+        expected = DatabaseService(manager=None)
+        expected.add_network(1, first)
+        expected.add_network(2, second)
+
+        self.assertEqual(set(expected.bel_id), set(api.bel_id))
+        self.assertEqual(expected.store.number_of_edges(), api.store.number_of_edges())
+        self.assertEqual(
+            edge_set(expected.get_network(), expected),
+            edge_set(api.get_network(), api)
+        )
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'snapshot.bin')
+
+        self.first, self.second = build_networks()
+
+        self.expected = DatabaseService(manager=None)
+        self.expected.add_network(1, self.first)
+        self.expected.add_network(2, self.second)
+        self.expected.dump_snapshot(self.path, network_ids=[1, 2, 3])
+
+        self.api = DatabaseService(manager=None)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load(self):
+        self.assertTrue(self.api.load_snapshot(self.path, network_ids=[3, 2, 1]))
+
+        self.assertEqual(self.expected.bel_id, self.api.bel_id)
+        self.assertEqual(self.expected.node_degrees, self.api.node_degrees)
+        self.assertEqual(self.expected.universe_pmids, self.api.universe_pmids)
+        self.assertEqual(self.expected.universe_authors, self.api.universe_authors)
+
+        for network_id in (1, 2):
+            graph = self.api.get_network(network_id)
+            self.assertEqual(self.expected.get_network(network_id).name, graph.name)
+            self.assertTrue(all(type(node) is int for node in graph))
+            self.assertEqual(edge_set(self.expected.get_network(network_id), self.expected), edge_set(graph, self.api))
+            self.assertEqual(len(self.expected.get_network(network_id).warnings), len(graph.warnings))
+
+        self.assertEqual(edge_set(self.expected.get_network(), self.expected),
+                         edge_set(self.api.get_network(), self.api))
+
+        a_id, b_id = self.api.get_node_id(a), self.api.get_node_id(b)
+        self.assertEqual(2, len(self.api.get_edges(a_id, b_id)))
+
+        self.assertEqual(self.expected.get_tree_annotations(), self.api.get_tree_annotations())
+        self.assertEqual(self.expected.count_annotation_values('Species', 1),
+                         self.api.count_annotation_values('Species', 1))
+
+        self.assertEqual(['1', '2'], self.api.get_pubmed_containing_keyword(''))
+        self.assertEqual(self.expected.get_nodes_containing_keyword('hgnc'),
+                         self.api.get_nodes_containing_keyword('hgnc'))
+        self.assertEqual(self.expected.get_provenance_index(2).author_edges,
+                         self.api.get_provenance_index(2).author_edges)
+
+    def test_add_after_load(self):
+        """Checks that networks can be added to a store rebuilt from memory-mapped arrays"""
+        self.assertTrue(self.api.load_snapshot(self.path))
+
+        e = PROTEIN, HGNC, 'E'
+        edges = [
+            (a, b, make_edge_data(INCREASES, '2', 'A increases B again')),  # same as in the second
+            (d, e, make_edge_data(INCREASES, '3', 'D increases E')),
+        ]
+        self.api.add_network(3, build_network('third', edges))
+        self.expected.add_network(3, build_network('third', edges))
+
+        self.assertEqual(self.expected.store.number_of_edges(), self.api.store.number_of_edges())
+        self.assertEqual({'1', '2', '3'}, self.api.universe_pmids)
+        self.assertEqual(edge_set(self.expected.get_network(), self.expected),
+                         edge_set(self.api.get_network(), self.api))
+
+    def test_stale(self):
+        self.assertFalse(self.api.load_snapshot(self.path, network_ids=[1, 2]))
+        self.assertEqual(0, self.api.store.number_of_edges())
+
+    def test_invalid(self):
+        self.assertFalse(self.api.load_snapshot(os.path.join(self.directory, 'missing.bin')))
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot')
+
+        self.assertFalse(self.api.load_snapshot(self.path))
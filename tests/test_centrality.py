@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from functools import partial
+from unittest import mock
+
+import networkx as nx
+
+from pybel_tools import centrality
+from pybel_tools.centrality import CentralityService, betweenness_centrality, get_graph_digest, get_sample_size
+from tests.constants import make_random_graph
+
+#: Makes random simple graphs with exactly the given number of edges
+make_graph = partial(make_random_graph, graph_cls=nx.DiGraph, self_loops=False, exact=True)
+
+
+class TestBetweennessCentrality(unittest.TestCase):
+    def assertCentralitiesEqual(self, expected, result):
+        self.assertEqual(set(expected), set(result))
+        for node, value in expected.items():
+            self.assertAlmostEqual(value, result[node], msg='node: {}'.format(node))
+
+    def test_same_as_networkx(self):
+        for seed in range(5):
+            for directed in (True, False):
+                graph = make_graph(25, 50, seed, graph_cls=nx.DiGraph if directed else nx.Graph)
+
+                for normalized in (True, False):
+                    self.assertCentralitiesEqual(
+                        nx.betweenness_centrality(graph, normalized=normalized),
+                        betweenness_centrality(graph, normalized=normalized)
+                    )
+
+    def test_multigraph(self):
+        graph = nx.MultiDiGraph()
+        graph.add_edge(1, 2)
+        graph.add_edge(1, 2)
+        graph.add_edge(2, 3)
+        graph.add_edge(1, 4)
+        graph.add_edge(4, 3)
+
+        self.assertCentralitiesEqual(nx.betweenness_centrality(graph), betweenness_centrality(graph))
+
+    def test_parallel(self):
+        graph = make_graph(40, 100, 0)
+        self.assertCentralitiesEqual(betweenness_centrality(graph), betweenness_centrality(graph, n_jobs=2))
+        self.assertCentralitiesEqual(
+            betweenness_centrality(graph, k=10, seed=5),
+            betweenness_centrality(graph, k=10, seed=5, n_jobs=2)
+        )
+
+    def test_sampled(self):
+        graph = make_graph(40, 100, 0)
+
+        self.assertEqual(betweenness_centrality(graph, k=10, seed=1), betweenness_centrality(graph, k=10, seed=1))
+        self.assertCentralitiesEqual(betweenness_centrality(graph), betweenness_centrality(graph, k=40, seed=1))
+
+    def test_sample_size(self):
+        self.assertEqual(2, get_sample_size(2, 0.1))
+        self.assertLess(get_sample_size(1000, 0.1), get_sample_size(1000, 0.05))
+        self.assertLess(get_sample_size(1000, 0.1), get_sample_size(10000, 0.1))
+        self.assertLess(get_sample_size(1000, 0.1, delta=0.1), get_sample_size(1000, 0.1, delta=0.01))
+
+    def test_digest(self):
+        graph = make_graph(10, 20, 0)
+        reordered = nx.DiGraph()
+        reordered.add_edges_from(reversed(graph.edges()))
+        reordered.add_nodes_from(graph)
+
+        self.assertEqual(get_graph_digest(graph), get_graph_digest(reordered))
+
+        reordered.add_edge(0, 9, relation='increases')
+        self.assertNotEqual(get_graph_digest(graph), get_graph_digest(reordered))
+        self.assertNotEqual(get_graph_digest(graph), get_graph_digest(graph.to_undirected()))
+
+
+class TestCentralityService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.graph = make_graph(30, 60, 0)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_memory(self):
+        service = CentralityService()
+
+        with mock.patch.object(centrality, 'betweenness_centrality', wraps=betweenness_centrality) as m:
+            result = service.get_betweenness_centrality(self.graph)
+            result[0] = -1
+            self.assertNotEqual(-1, service.get_betweenness_centrality(self.graph)[0])
+            self.assertEqual(1, m.call_count)
+
+            service.get_betweenness_centrality(self.graph, k=10)
+            service.get_betweenness_centrality(self.graph, k=10, seed=1)
+            self.assertEqual(3, m.call_count)
+
+            # Asking for more samples than nodes is the same as the exact calculation
+            service.get_betweenness_centrality(self.graph, k=100)
+            self.assertEqual(3, m.call_count)
+
+    def test_disk(self):
+        CentralityService(directory=self.directory).get_betweenness_centrality(self.graph, epsilon=0.5)
+        self.assertEqual(1, len(os.listdir(self.directory)))
+
+        with mock.patch.object(centrality, 'betweenness_centrality') as m:
+            result = CentralityService(directory=self.directory).get_betweenness_centrality(self.graph, epsilon=0.5)
+            self.assertFalse(m.called)
+
+        self.assertEqual(set(self.graph), set(result))
+
+    def test_max_entries(self):
+        service = CentralityService(max_entries=1)
+
+        with mock.patch.object(centrality, 'betweenness_centrality', wraps=betweenness_centrality) as m:
+            service.get_betweenness_centrality(self.graph)
+            service.get_betweenness_centrality(make_graph(10, 20, 1))
+            service.get_betweenness_centrality(self.graph)
+            self.assertEqual(3, m.call_count)
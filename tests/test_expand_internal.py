@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import itertools as itt
+import random
+import unittest
+from collections import defaultdict
+
+from pybel import BELGraph
+from pybel.constants import *
+from pybel_tools.filters.edge_filters import edge_is_causal
+from pybel_tools.mutation import expand_internal, expand_internal_causal
+from pybel_tools.utils import get_consistent_pair_edges
+
+RELATIONS = [INCREASES, DECREASES, ASSOCIATION]
+
+
+def expand_internal_all_pairs(universe, graph, edge_filter=None):
+    """The original implementation of :func:`expand_internal`, which checks every pair of nodes"""
+    for u, v in itt.product(graph.nodes(), repeat=2):
+        if graph.has_edge(u, v) or not universe.has_edge(u, v):
+            continue
+
+        rs = defaultdict(list)
+        for k, d in universe.edge[u][v].items():
+            if edge_filter is not None and not edge_filter(universe, u, v, k, d):
+                continue
+
+            rs[d[RELATION]].append(d)
+
+        if 1 == len(rs):
+            for d in rs[list(rs)[0]]:
+                graph.add_edge(u, v, attr_dict=d)
+
+
+def make_universe(number_nodes, number_edges, seed):
+    r = random.Random(seed)
+    universe = BELGraph()
+    universe.add_nodes_from(range(number_nodes))
+
+    for _ in range(number_edges):
+        u, v = r.randrange(number_nodes), r.randrange(number_nodes)
+        universe.add_edge(u, v, **{RELATION: r.choice(RELATIONS), EVIDENCE: str(r.random())})
+
+    return universe
+
+
+def make_subgraph(universe, number_nodes, seed):
+    r = random.Random(seed)
+    graph = BELGraph()
+    graph.add_nodes_from(r.sample(universe.nodes(), number_nodes))
+
+    for u, v, d in universe.edges(data=True):
+        if u in graph and v in graph and r.random() < 0.3:
+            graph.add_edge(u, v, attr_dict=d)
+
+    return graph
+
+
+def get_edges(graph):
+    return sorted((u, v, d[RELATION], d[EVIDENCE]) for u, v, d in graph.edges_iter(data=True))
+
+
+class TestExpandInternal(unittest.TestCase):
+    def setUp(self):
+        self.universe = BELGraph()
+        self.universe.add_edge(1, 2, **{RELATION: INCREASES, EVIDENCE: 'a'})
+        self.universe.add_edge(1, 2, **{RELATION: INCREASES, EVIDENCE: 'b'})
+        self.universe.add_edge(2, 3, **{RELATION: INCREASES, EVIDENCE: 'c'})
+        self.universe.add_edge(2, 3, **{RELATION: DECREASES, EVIDENCE: 'd'})
+        self.universe.add_edge(3, 1, **{RELATION: ASSOCIATION, EVIDENCE: 'e'})
+        self.universe.add_edge(3, 4, **{RELATION: INCREASES, EVIDENCE: 'f'})
+
+        self.graph = BELGraph()
+        self.graph.add_nodes_from([1, 2, 3])
+
+    def test_consistent_edges(self):
+        result = get_consistent_pair_edges(self.universe, [(1, 2), (2, 3), (3, 1)])
+
+        self.assertEqual({(1, 2), (3, 1)}, set(result))
+        self.assertEqual(2, len(result[1, 2]))
+
+    def test_consistent_edges_filtered(self):
+        result = get_consistent_pair_edges(self.universe, [(1, 2), (2, 3), (3, 1)], edge_filter=edge_is_causal)
+
+        self.assertEqual({(1, 2)}, set(result))
+
+    def test_expand(self):
+        expand_internal(self.universe, self.graph)
+
+        self.assertEqual([(1, 2, INCREASES, 'a'), (1, 2, INCREASES, 'b'), (3, 1, ASSOCIATION, 'e')],
+                         get_edges(self.graph))
+        self.assertNotIn(4, self.graph)
+
+    def test_expand_causal(self):
+        expand_internal_causal(self.universe, self.graph)
+
+        self.assertEqual([(1, 2, INCREASES, 'a'), (1, 2, INCREASES, 'b')], get_edges(self.graph))
+
+    def test_same_as_all_pairs(self):
+        for seed in range(10):
+            universe = make_universe(60, 300, seed)
+
+            for edge_filter in (None, edge_is_causal):
+                graph = make_subgraph(universe, 25, seed)
+                expected = graph.copy()
+
+                expand_internal(universe, graph, edge_filters=edge_filter)
+                expand_internal_all_pairs(universe, expected, edge_filter=edge_filter)
+
+                self.assertEqual(get_edges(expected), get_edges(graph), msg='seed: {}'.format(seed))
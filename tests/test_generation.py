@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from pybel import BELGraph
+from pybel.constants import *
+from pybel_tools.generation import generate_mechanism, generate_mechanisms, generate_bioprocess_mechanisms
+
+HGNC = 'HGNC'
+KEY = 'weight'
+
+a = PROTEIN, HGNC, 'A'
+b = PROTEIN, HGNC, 'B'
+c = PROTEIN, HGNC, 'C'
+d = PROTEIN, HGNC, 'D'
+e = PROTEIN, HGNC, 'E'
+f = PROTEIN, HGNC, 'F'
+t1 = BIOPROCESS, 'GOBP', 'T1'
+t2 = BIOPROCESS, 'GOBP', 'T2'
+
+
+def build_graph():
+    graph = BELGraph()
+
+    for node in (a, b, c, d, e, f, t1, t2):
+        graph.add_simple_node(*node)
+
+    for node in (a, b, d, e):
+        graph.node[node][KEY] = 1
+
+    graph.add_edge(a, t1, **{RELATION: INCREASES})
+    graph.add_edge(b, t1, **{RELATION: DECREASES})
+    graph.add_edge(b, t1, **{RELATION: INCREASES})  # inconsistent
+    graph.add_edge(c, a, **{RELATION: DIRECTLY_INCREASES})
+    graph.add_edge(c, a, **{RELATION: DIRECTLY_INCREASES})  # consistent duplicate
+    graph.add_edge(d, c, **{RELATION: INCREASES})  # three steps away from t1
+    graph.add_edge(e, a, **{RELATION: ASSOCIATION})  # not causal
+    graph.add_edge(t1, t2, **{RELATION: INCREASES})
+    graph.add_edge(f, t1, **{RELATION: DECREASES})
+    graph.add_edge(t2, t1, **{RELATION: DECREASES})
+
+    return graph
+
+
+class TestGenerateMechanisms(unittest.TestCase):
+    def assert_same_mechanism(self, expected, actual):
+        self.assertEqual(expected.nodes(), actual.nodes())
+        for node in expected:
+            self.assertEqual(expected.node[node], actual.node[node])
+        self.assertEqual(
+            sorted(map(repr, expected.edges(keys=True, data=True))),
+            sorted(map(repr, actual.edges(keys=True, data=True)))
+        )
+
+    def test_same_as_generate_mechanism(self):
+        graph = build_graph()
+
+        for key in (None, KEY):
+            mechanisms = generate_mechanisms(graph, [t1, t2, a, d], key=key)
+
+            for node, mechanism in mechanisms.items():
+                self.assert_same_mechanism(generate_mechanism(graph, node, key=key), mechanism)
+
+    def test_bioprocesses(self):
+        graph = build_graph()
+        mechanisms = generate_bioprocess_mechanisms(graph)
+
+        self.assertEqual({t1, t2}, set(mechanisms))
+        self.assertEqual({a, b, c, f, t1, t2}, set(mechanisms[t1]))
+        self.assertFalse(mechanisms[t1].has_edge(b, t1))
+        self.assertEqual(1, mechanisms[t1].number_of_edges(c, a))
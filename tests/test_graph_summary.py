@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from collections import Counter
+
+from pybel import BELGraph
+from pybel.constants import *
+from pybel.parser.parse_exceptions import *
+
+from pybel_tools.summary import (
+    count_error_types, count_functions, count_namespaces, count_relations, get_activities, get_degradations,
+    get_translocated, get_unused_namespaces, group_errors, summarize_graph,
+)
+from pybel_tools.summary.edge_summary import count_diseases, get_unused_annotations, get_unused_list_annotation_values
+from pybel_tools.summary.error_summary import (
+    get_namespaces_with_incorrect_names, get_undefined_annotations, get_undefined_namespaces,
+)
+from pybel_tools.summary.export import info_list
+from pybel_tools.summary.graph_summary import SummaryVisitor, _visitor_classes, register_summary_visitor
+from pybel_tools.summary.node_properties import count_variants
+
+a = PROTEIN, 'HGNC', 'A'
+b = PROTEIN, 'HGNC', 'B'
+c = RNA, 'HGNC', 'C'
+d = PATHOLOGY, 'MESHD', 'D'
+e = ABUNDANCE, 'CHEBI', 'E'
+f = PROTEIN, 'HGNC', 'F', PMOD, (BEL_DEFAULT_NAMESPACE, 'Ph')
+
+
+def make_graph():
+    graph = BELGraph()
+
+    for node in (a, b, c, d, e):
+        graph.add_simple_node(*node)
+
+    graph.add_node(f, attr_dict={
+        FUNCTION: PROTEIN,
+        NAMESPACE: 'HGNC',
+        NAME: 'F',
+        VARIANTS: [{KIND: PMOD, IDENTIFIER: {NAMESPACE: BEL_DEFAULT_NAMESPACE, NAME: 'Ph'}}]
+    })
+
+    graph.namespace_url.update({'HGNC': 'http://example.com/hgnc', 'GOBP': 'http://example.com/gobp'})
+    graph.namespace_pattern['MESHD'] = '.*'
+    graph.annotation_url['Species'] = 'http://example.com/species'
+    graph.annotation_list.update({'Confidence': {'High', 'Low'}, 'Tissue': {'Brain'}})
+
+    graph.add_edge(a, b, attr_dict={RELATION: INCREASES, OBJECT: {MODIFIER: ACTIVITY}})
+    graph.add_edge(a, b, attr_dict={RELATION: DECREASES, SUBJECT: {MODIFIER: DEGRADATION}})
+    graph.add_edge(b, d, attr_dict={RELATION: INCREASES, ANNOTATIONS: {'Confidence': 'High'}})
+    graph.add_edge(b, d, attr_dict={RELATION: POSITIVE_CORRELATION, ANNOTATIONS: {'Tissue': 'Brain'}})
+    graph.add_edge(d, e, attr_dict={RELATION: ASSOCIATION})
+    graph.add_edge(c, c, attr_dict={RELATION: INCREASES, SUBJECT: {MODIFIER: TRANSLOCATION}})
+
+    for line_number, line, exc in [
+        (1, 'p(HGNC:X)', MissingNamespaceNameWarning(1, 'p(HGNC:X)', 2, 'HGNC', 'X')),
+        (2, 'p(FAKE:X)', UndefinedNamespaceWarning(2, 'p(FAKE:X)', 2, 'FAKE', 'X')),
+        (3, 'SET Fake = "X"', UndefinedAnnotationWarning(3, 'SET Fake = "X"', 4, 'Fake')),
+        (4, 'p(FAKE:X)', UndefinedNamespaceWarning(4, 'p(FAKE:X)', 2, 'FAKE', 'X')),
+    ]:
+        graph.add_warning(line_number, line, exc)
+
+    return graph
+
+
+class TestSummarizeGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = make_graph()
+        self.summary = summarize_graph(self.graph)
+
+    def test_nodes(self):
+        self.assertEqual(count_functions(self.graph), self.summary['functions'])
+        self.assertEqual(count_namespaces(self.graph), self.summary['namespaces'])
+        self.assertEqual(count_variants(self.graph), self.summary['variants'])
+        self.assertEqual(get_unused_namespaces(self.graph), self.summary['unused_namespaces'])
+        self.assertEqual({'GOBP'}, self.summary['unused_namespaces'])
+
+    def test_edges(self):
+        self.assertEqual(count_relations(self.graph), self.summary['relations'])
+        self.assertEqual(Counter(self.graph.degree()), self.summary['degrees'])
+        self.assertEqual(count_diseases(self.graph), self.summary['diseases'])
+        self.assertEqual(get_translocated(self.graph), self.summary['translocations'])
+        self.assertEqual(get_degradations(self.graph), self.summary['degradations'])
+        self.assertEqual(get_activities(self.graph), self.summary['activities'])
+        self.assertEqual(get_unused_annotations(self.graph), self.summary['unused_annotations'])
+        self.assertEqual(
+            get_unused_list_annotation_values(self.graph),
+            self.summary['unused_list_annotation_values']
+        )
+
+    def test_warnings(self):
+        self.assertEqual(count_error_types(self.graph), self.summary['error_types'])
+        self.assertEqual(group_errors(self.graph), self.summary['error_groups'])
+        self.assertEqual(get_undefined_namespaces(self.graph), self.summary['undefined_namespaces'])
+        self.assertEqual(get_undefined_annotations(self.graph), self.summary['undefined_annotations'])
+        self.assertEqual(
+            get_namespaces_with_incorrect_names(self.graph),
+            self.summary['namespaces_with_incorrect_names']
+        )
+
+    def test_info(self):
+        expected = info_list(self.graph)
+        result = self.summary['info']
+
+        self.assertEqual([key for key, _ in expected], [key for key, _ in result])
+        for (key, expected_value), (_, value) in zip(expected, result):
+            self.assertAlmostEqual(expected_value, value, msg=key)
+
+        self.assertEqual(3, dict(result)['Components'])
+
+    def test_empty(self):
+        summary = summarize_graph(BELGraph())
+        self.assertEqual(Counter(), summary['functions'])
+        self.assertEqual(dict(info_list(BELGraph())), dict(summary['info']))
+
+    def test_names(self):
+        summary = summarize_graph(self.graph, names=['functions', 'info'])
+        self.assertEqual({'functions', 'info'}, set(summary))
+
+    def test_register(self):
+        @register_summary_visitor
+        class EdgeKeyCounter(SummaryVisitor):
+            name = 'test_edge_keys'
+
+            def __init__(self):
+                self.counter = Counter()
+
+            def visit_edge(self, u, v, key, data):
+                self.counter[key] += 1
+
+            def get_result(self, graph):
+                return self.counter
+
+        try:
+            summary = summarize_graph(self.graph)
+            self.assertEqual(Counter(k for _, _, k in self.graph.edges_iter(keys=True)), summary['test_edge_keys'])
+        finally:
+            del _visitor_classes['test_edge_keys']
+
+        with self.assertRaises(ValueError):
+            register_summary_visitor(SummaryVisitor)
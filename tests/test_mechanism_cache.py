@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pybel import BELGraph
+from pybel.constants import *
+from pybel_tools.analysis.mechanism_cache import MechanismCache
+
+a = PROTEIN, 'HGNC', 'A'
+t = BIOPROCESS, 'GOBP', 'T'
+
+
+def build_mechanisms():
+    graph = BELGraph()
+    graph.add_simple_node(*a)
+    graph.add_simple_node(*t)
+    graph.add_edge(a, t, **{RELATION: INCREASES})
+    return {t: graph}
+
+
+class TestMechanismCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = MechanismCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get(1, b'network'))
+
+        self.cache.set(1, b'network', build_mechanisms())
+        mechanisms = self.cache.get(1, b'network')
+
+        self.assertIsNotNone(mechanisms)
+        self.assertEqual({t}, set(mechanisms))
+        self.assertTrue(mechanisms[t].has_edge(a, t))
+
+        self.assertIsNone(self.cache.get(1, b'network', pipeline='something else'))
+        self.assertIsNone(self.cache.get(2, b'network'))
+
+    def test_reupload(self):
+        self.cache.set(1, b'network', build_mechanisms())
+        self.cache.set(1, b'new network', build_mechanisms())
+
+        self.assertIsNone(self.cache.get(1, b'network'))
+        self.assertIsNotNone(self.cache.get(1, b'new network'))
+        self.assertEqual(1, len(os.listdir(self.directory)))
+
+    def test_get_or_build(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return build_mechanisms()
+
+        self.cache.get_or_build(1, b'network', build)
+        self.cache.get_or_build(1, b'network', build)
+
+        self.assertEqual(1, len(calls))
+
+    def test_invalidate(self):
+        self.cache.set(1, b'network', build_mechanisms())
+        self.cache.set(2, b'network', build_mechanisms())
+
+        self.cache.invalidate(1)
+        self.assertIsNone(self.cache.get(1, b'network'))
+        self.assertIsNotNone(self.cache.get(2, b'network'))
+
+        self.cache.clear()
+        self.assertEqual(0, self.cache.size())
+
+    def test_evict(self):
+        self.cache.set(1, b'network', build_mechanisms())
+        self.cache.max_size = self.cache.size()
+
+        os.utime(self.cache._get_path(1, self.cache.get_digest(b'network')), (0, 0))
+        self.cache.set(2, b'network', build_mechanisms())
+
+        self.assertIsNone(self.cache.get(1, b'network'))
+        self.assertIsNotNone(self.cache.get(2, b'network'))
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+import itertools as itt
+import unittest
+
+import networkx as nx
+
+from pybel_tools.selection import iter_3_cycle_indices, iter_3_cycles, iter_triangle_indices, iter_triangles
+from tests.constants import make_random_graph
+
+
+def get_triangles_by_combinations(graph):
+    """The original implementation, which pairs up the neighbors of every node"""
+    graph = nx.Graph(graph)
+    return {
+        frozenset((n, u, v))
+        for n in graph
+        for u, v in itt.combinations(graph.adj[n], 2)
+        if n != u and n != v and graph.has_edge(u, v)
+    }
+
+
+def get_3_cycles_by_successors(graph):
+    """The original implementation, which follows the successors of every edge"""
+    return {
+        frozenset((a, b, c))
+        for a, b in graph.edges_iter()
+        for c in graph.successors(b)
+        if len({a, b, c}) == 3 and graph.has_edge(c, a)
+    }
+
+
+class TestMotifs(unittest.TestCase):
+    def test_triangles(self):
+        for seed in range(10):
+            graph = make_random_graph(30, 150, seed, graph_cls=nx.MultiDiGraph)
+            triangles = list(iter_triangles(graph))
+
+            self.assertEqual(len(triangles), len(set(map(frozenset, triangles))), msg='triangles should be unique')
+            self.assertEqual(get_triangles_by_combinations(graph), set(map(frozenset, triangles)))
+
+    def test_3_cycles(self):
+        for seed in range(10):
+            graph = make_random_graph(30, 150, seed, graph_cls=nx.MultiDiGraph)
+            cycles = list(iter_3_cycles(graph))
+
+            self.assertEqual(len(cycles), len(set(map(frozenset, cycles))), msg='cycles should be unique')
+            self.assertEqual(get_3_cycles_by_successors(graph), set(map(frozenset, cycles)))
+
+            for a, b, c in cycles:
+                self.assertTrue(graph.has_edge(a, b))
+                self.assertTrue(graph.has_edge(b, c))
+                self.assertTrue(graph.has_edge(c, a))
+
+    def test_indices(self):
+        self.assertEqual([(0, 1, 2)], [tuple(sorted(t)) for t in iter_triangle_indices(3, [0, 1, 2, 1], [1, 2, 0, 0])])
+        self.assertEqual([], list(iter_3_cycle_indices(3, [0, 1, 0], [1, 2, 2])))
+        self.assertEqual(1, len(list(iter_3_cycle_indices(3, [0, 1, 2, 1, 2, 0], [1, 2, 0, 0, 1, 2]))))
+        self.assertEqual([], list(iter_triangle_indices(0, [], [])))
+        self.assertEqual([], list(iter_3_cycle_indices(4, [0, 0, 1], [0, 1, 1])))
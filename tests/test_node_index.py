@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import unittest
+
+from pybel import BELGraph
+from pybel.constants import *
+from pybel_tools.selection import NodeTextIndex, search_node_names
+
+HGNC = 'HGNC'
+
+names = ['AKT1', 'AKT2', 'MAPK1', 'MAPKAPK2', 'TP53', 'TP53BP1', 'APP']
+
+
+def build_graph():
+    graph = BELGraph()
+
+    for name in names:
+        graph.add_simple_node(PROTEIN, HGNC, name)
+
+    graph.add_simple_node(ABUNDANCE, 'CHEBI', 'amyloid-beta')
+
+    return graph
+
+
+class TestNodeTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph = build_graph()
+        self.index = NodeTextIndex.from_graph(self.graph)
+
+    def test_find(self):
+        """Checks that the index finds the same nodes as checking every node"""
+        for query in ('akt', 'MAPK', 'p5', 'a', 'beta', 'missing', ['AKT1', 'tp53'], 'pk1'):
+            self.assertEqual(
+                set(search_node_names(self.graph, query)),
+                set(search_node_names(self.graph, query, node_index=self.index)),
+                msg=query
+            )
+
+    def test_rank(self):
+        self.assertEqual(
+            [(PROTEIN, HGNC, 'TP53'), (PROTEIN, HGNC, 'TP53BP1')],
+            self.index.search('tp53')
+        )
+        self.assertEqual(
+            [(PROTEIN, HGNC, 'MAPK1'), (PROTEIN, HGNC, 'MAPKAPK2')],
+            self.index.search('mapk')
+        )
+
+    def test_substring(self):
+        self.assertEqual([(PROTEIN, HGNC, 'MAPK1')], self.index.search('pk1'))
+        self.assertEqual([(ABUNDANCE, 'CHEBI', 'amyloid-beta')], self.index.search('beta'))
+
+    def test_short(self):
+        """Checks that short queries only match the beginning of words"""
+        self.assertEqual({(PROTEIN, HGNC, 'APP'), (PROTEIN, HGNC, 'AKT1'), (PROTEIN, HGNC, 'AKT2'),
+                          (ABUNDANCE, 'CHEBI', 'amyloid-beta')}, set(self.index.search('a')))
+        self.assertEqual([(ABUNDANCE, 'CHEBI', 'amyloid-beta')], self.index.search('be'))
+        self.assertEqual([], self.index.search('p5'))
+
+    def test_pages(self):
+        ranked = self.index.search('a')
+
+        self.assertEqual(ranked[:2], self.index.search('a', limit=2))
+        self.assertEqual(ranked[2:4], self.index.search('a', offset=2, limit=2))
+        self.assertEqual(ranked[3:], self.index.search('a', offset=3))
+
+    def test_add(self):
+        node = PROTEIN, HGNC, 'AKT3'
+        self.index.add(node, ['AKT3'])
+
+        self.assertIn(node, self.index.search('akt'))
+        self.assertIn(node, self.index.search('ak'))
+        self.assertEqual({node}, self.index.find('kt3'))
+
+    def test_threads(self):
+        """Checks that nodes added while another thread searches aren't lost"""
+        nodes = [(PROTEIN, HGNC, 'GENE{}'.format(i)) for i in range(5000)]
+
+        writer = threading.Thread(target=lambda: [self.index.add(node, [node[2]]) for node in nodes])
+        writer.start()
+        while writer.is_alive():
+            self.index.search('ge')
+            self.index.find('gene1')
+        writer.join()
+
+        self.assertEqual(set(nodes), set(self.index.search('gene')))
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import random
+import unittest
+
+from numpy.testing import assert_equal
+from pybel import BELGraph
+from pybel.constants import *
+from pybel_tools.analysis.npa import (
+    NpaRunner, NpaEngine, NPA_SCORE, calculate_average_npa_on_subgraphs, iter_engine_scores, multirun,
+)
+
+HGNC = 'HGNC'
+KEY = 'weight'
+
+a = PROTEIN, HGNC, 'A'
+b = PROTEIN, HGNC, 'B'
+c = PROTEIN, HGNC, 'C'
+d = PROTEIN, HGNC, 'D'
+e = PROTEIN, HGNC, 'E'
+t = BIOPROCESS, 'GOBP', 'T'
+
+
+def build_acyclic_graph():
+    graph = BELGraph()
+
+    for node, value in ((a, 2), (b, 3), (c, 5), (d, 7), (t, None)):
+        graph.add_simple_node(*node)
+        if value is not None:
+            graph.node[node][KEY] = value
+
+    graph.add_edge(a, c, **{RELATION: INCREASES})
+    graph.add_edge(b, c, **{RELATION: DECREASES})
+    graph.add_edge(c, t, **{RELATION: INCREASES})
+    graph.add_edge(d, t, **{RELATION: DIRECTLY_DECREASES})
+
+    return graph
+
+
+def build_cyclic_graph():
+    graph = build_acyclic_graph()
+
+    graph.add_simple_node(*e)
+
+    graph.add_edge(a, e, **{RELATION: INCREASES})
+    graph.add_edge(e, c, **{RELATION: INCREASES})
+    graph.add_edge(c, e, **{RELATION: DECREASES})
+    graph.add_edge(e, d, **{RELATION: INCREASES})
+    graph.add_edge(d, c, **{RELATION: INCREASES})
+    graph.add_edge(c, d, **{RELATION: DECREASES})
+
+    return graph
+
+
+class TestNpaEngine(unittest.TestCase):
+    def test_compile(self):
+        graph = build_acyclic_graph()
+        engine = NpaEngine(graph, t, KEY)
+
+        self.assertEqual(5, engine.number_of_nodes())
+        self.assertEqual(4, engine.number_of_edges())
+        self.assertEqual(sorted(graph.in_degree(node) for node in graph), sorted(engine.in_degree.tolist()))
+        self.assertEqual({1, -1}, set(engine.edge_weight.tolist()))
+
+    def test_acyclic(self):
+        """C = 0 + 2 - 3 = -1, T = 0 + C - 7 = -8"""
+        engine = NpaEngine(build_acyclic_graph(), t, KEY)
+        self.assertEqual(-8, engine.run())
+
+        runner = NpaRunner(build_acyclic_graph(), t, KEY)
+        runner.run()
+        self.assertEqual(runner.get_final_score(), engine.run())
+
+    def test_same_as_runner(self):
+        """Checks that the engine removes the same random edges as the runner when the random state is the same"""
+        graph = build_cyclic_graph()
+        engine = NpaEngine(graph, t, KEY)
+        scores = set()
+
+        for seed in range(20):
+            random.seed(seed)
+            runner = NpaRunner(graph, t, KEY)
+            try:
+                runner.run()
+                expected = runner.get_final_score()
+            except (ValueError, ZeroDivisionError):
+                expected = None
+
+            random.seed(seed)
+            try:
+                score = engine.run()
+            except ValueError:
+                score = None
+
+            self.assertEqual(expected, score, msg='seed: {}'.format(seed))
+            scores.add(score)
+
+        self.assertLess(1, len(scores), msg='random edge removal should give different scores')
+
+    def test_pickle(self):
+        engine = NpaEngine(build_cyclic_graph(), t, KEY)
+        unpickled = pickle.loads(pickle.dumps(engine))
+
+        self.assertEqual(list(engine.multirun(runs=20, seed=5)), list(unpickled.multirun(runs=20, seed=5)))
+
+    def test_seed(self):
+        engine = NpaEngine(build_cyclic_graph(), t, KEY)
+
+        self.assertEqual(list(engine.multirun(runs=20, seed=5)), list(engine.multirun(runs=20, seed=5)))
+
+    def test_multirun_array(self):
+        engine = NpaEngine(build_cyclic_graph(), t, KEY)
+        scores = engine.multirun_array(runs=20, seed=5)
+
+        self.assertEqual(list(engine.multirun(runs=20, seed=5)), scores.tolist())
+        self.assertGreaterEqual(20, len(scores))
+
+    def test_graph_unchanged(self):
+        graph = build_cyclic_graph()
+        engine = NpaEngine(graph, t, KEY)
+        list(engine.multirun(runs=10))
+
+        self.assertEqual(10, graph.number_of_edges())
+        self.assertTrue(all(NPA_SCORE not in data for _, data in graph.nodes_iter(data=True)))
+
+
+class TestNpaRunnerIncremental(unittest.TestCase):
+    def test_acyclic(self):
+        runner = NpaRunner(build_acyclic_graph(), t, KEY, incremental=True)
+        runner.run()
+        self.assertEqual(-8, runner.get_final_score())
+
+    def test_same_as_sweep(self):
+        """Checks that the incremental frontier makes the same choices as the full sweep"""
+        graph = build_cyclic_graph()
+
+        for seed in range(20):
+            results = []
+            for incremental in (False, True):
+                random.seed(seed)
+                runner = NpaRunner(graph, t, KEY, incremental=incremental)
+                try:
+                    runner.run()
+                    results.append(runner.get_final_score())
+                except (ValueError, ZeroDivisionError):
+                    results.append(None)
+
+            self.assertEqual(results[0], results[1], msg='seed: {}'.format(seed))
+
+
+class TestSeed(unittest.TestCase):
+    def test_multirun(self):
+        graph = build_cyclic_graph()
+
+        first = [runner.get_final_score() for runner in multirun(graph, t, KEY, runs=20, seed=3)]
+        random.seed(0)  # the global random state doesn't matter
+        second = [runner.get_final_score() for runner in multirun(graph, t, KEY, runs=20, seed=3)]
+
+        self.assertEqual(first, second)
+
+    def test_same_as_engine(self):
+        graph = build_cyclic_graph()
+        engine = NpaEngine(graph, t, KEY)
+
+        runner_scores = [runner.get_final_score() for runner in multirun(graph, t, KEY, runs=20, seed=3)]
+        engine_scores = list(engine.multirun(runs=20, seed=3))
+
+        self.assertEqual(runner_scores, engine_scores)
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        t2 = BIOPROCESS, 'GOBP', 'T2'
+        graph = build_cyclic_graph()
+        graph.add_simple_node(*t2)
+        graph.add_edge(e, t2, **{RELATION: INCREASES})
+
+        self.candidate_mechanisms = {t: build_cyclic_graph(), t2: graph}
+
+    def test_same_as_serial(self):
+        engines = [NpaEngine(graph, node, KEY) for node, graph in self.candidate_mechanisms.items()]
+
+        serial = {node: scores.tolist() for node, scores in iter_engine_scores(engines, runs=30, seed=7)}
+        parallel = {node: scores.tolist() for node, scores in iter_engine_scores(engines, runs=30, seed=7, n_jobs=2)}
+
+        self.assertEqual(serial, parallel)
+        self.assertEqual(set(self.candidate_mechanisms), set(parallel))
+
+    def test_subgraphs(self):
+        serial = calculate_average_npa_on_subgraphs(self.candidate_mechanisms, KEY, runs=30, seed=7)
+        parallel = calculate_average_npa_on_subgraphs(self.candidate_mechanisms, KEY, runs=30, seed=7, n_jobs=2,
+                                                      chunksize=2)
+
+        self.assertEqual(set(serial), set(parallel))
+        for node, results in serial.items():
+            self.assertEqual(len(results), len(parallel[node]))
+            for result, parallel_result in zip(results, parallel[node]):
+                # a normality p-value is NaN when the scores don't vary, and NaN != NaN
+                assert_equal(result, parallel_result)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from collections import Counter
+
+from pybel import BELGraph
+from pybel.constants import *
+
+from pybel_tools.mutation import collapse_consistent_edges, remove_inconsistent_edges
+from pybel_tools.summary import (
+    PairRelationTable, count_diseases, get_consistent_edges, get_contradiction_summary, get_contradictory_pairs,
+    get_inconsistent_edges, pair_has_contradiction, pair_is_consistent,
+)
+from pybel_tools.summary.edge_summary import get_all_relations
+from tests.constants import make_random_graph
+
+relations = [INCREASES, DIRECTLY_INCREASES, DECREASES, DIRECTLY_DECREASES, CAUSES_NO_CHANGE, ASSOCIATION]
+
+
+def make_node(i, rng):
+    return PATHOLOGY if i % 5 == 0 else PROTEIN, 'TEST', str(i)
+
+
+def make_data(rng):
+    return {RELATION: rng.choice(relations)}
+
+
+def iter_pairs(graph):
+    return set(graph.edges_iter())
+
+
+class TestPairRelationTable(unittest.TestCase):
+    def setUp(self):
+        self.graph = make_random_graph(30, 150, 0, make_node=make_node, make_data=make_data)
+
+    def test_queries(self):
+        pairs = iter_pairs(self.graph)
+
+        self.assertEqual(
+            {(u, v) for u, v in pairs if pair_is_consistent(self.graph, u, v)},
+            set(get_consistent_edges(self.graph))
+        )
+        self.assertEqual(
+            {(u, v) for u, v in pairs if not pair_is_consistent(self.graph, u, v)},
+            set(get_inconsistent_edges(self.graph))
+        )
+        self.assertEqual(
+            {(u, v) for u, v in pairs if pair_has_contradiction(self.graph, u, v)},
+            set(get_contradictory_pairs(self.graph))
+        )
+
+        for u, v, result in get_contradiction_summary(self.graph):
+            self.assertEqual(get_all_relations(self.graph, u, v), result)
+
+        self.assertEqual(
+            Counter(
+                node
+                for pair in pairs
+                for node in pair
+                if self.graph.node[node][FUNCTION] == PATHOLOGY
+            ),
+            count_diseases(self.graph)
+        )
+
+    def test_edge_swap(self):
+        """Changes the relations without changing the numbers of nodes and edges"""
+        a, b, c = [(PROTEIN, 'TEST', name) for name in 'ABC']
+        graph = BELGraph()
+        for node in (a, b, c):
+            graph.add_simple_node(*node)
+
+        graph.add_edge(a, b, attr_dict={RELATION: INCREASES})
+        graph.add_edge(a, b, attr_dict={RELATION: DECREASES})
+        graph.add_edge(b, c, attr_dict={RELATION: INCREASES})
+
+        self.assertEqual([(a, b)], list(get_inconsistent_edges(graph)))
+
+        graph.remove_edge(a, b, next(k for k, d in graph.edge[a][b].items() if d[RELATION] == INCREASES))
+        graph.add_edge(b, c, attr_dict={RELATION: DECREASES})
+
+        self.assertEqual([(b, c)], list(get_inconsistent_edges(graph)))
+        self.assertEqual([(a, b)], list(get_consistent_edges(graph)))
+
+        remove_inconsistent_edges(graph)
+        self.assertEqual([(a, b)], graph.edges())
+
+    def test_mutations(self):
+        expected = make_random_graph(30, 150, 0, make_node=make_node, make_data=make_data)
+        for u, v in iter_pairs(expected):
+            if not pair_is_consistent(expected, u, v):
+                expected.remove_edges_from([(u, v, k) for k in list(expected.edge[u][v])])
+
+        table = PairRelationTable(self.graph)
+        remove_inconsistent_edges(self.graph, table=table)
+        self.assertEqual(set(expected.edges_iter()), set(self.graph.edges_iter()))
+        self.assertEqual(set(), set(table.iter_inconsistent_pairs()))
+        self.assertEqual(set(), set(get_inconsistent_edges(self.graph)))
+
+        collapse_consistent_edges(self.graph, table=table)
+        self.assertEqual(len(iter_pairs(expected)), self.graph.number_of_edges())
+        self.assertEqual(set(iter_pairs(expected)), set(table.iter_consistent_pairs()))
+        self.assertEqual(set(iter_pairs(expected)), set(get_consistent_edges(self.graph)))
+
+        for u, v in iter_pairs(expected):
+            self.assertEqual(get_all_relations(expected, u, v), get_all_relations(self.graph, u, v))
+
+    def test_empty(self):
+        graph = BELGraph()
+        self.assertEqual([], list(get_consistent_edges(graph)))
+        self.assertEqual([], list(get_contradiction_summary(graph)))
+        self.assertEqual(Counter(), count_diseases(graph))
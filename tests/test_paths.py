@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+import itertools as itt
+import random
+import time
+import unittest
+
+import networkx as nx
+
+from pybel import BELGraph
+from pybel.constants import ASSOCIATION, DIRECTLY_INCREASES, INCREASES, RELATION
+from pybel_tools.selection import (
+    get_nodes_in_all_shortest_paths, get_ranked_paths, get_shortest_directed_path_between_subgraphs,
+    get_shortest_paths_between_node_sets, get_shortest_undirected_path_between_subgraphs, get_undirected_adjacency,
+    iter_simple_paths,
+)
+from tests.constants import make_random_graph
+
+
+def get_nodes_in_all_shortest_paths_by_pairs(graph, nodes):
+    """The original implementation, which searches each pair of nodes separately"""
+    result = set()
+
+    for u, v in itt.product(nodes, repeat=2):
+        try:
+            for path in nx.all_shortest_paths(graph, u, v):
+                result.update(path)
+        except nx.NetworkXNoPath:
+            continue
+
+    return result
+
+
+def make_increases(rng):
+    return {RELATION: INCREASES}
+
+
+class TestAllShortestPaths(unittest.TestCase):
+    def test_random(self):
+        """Checks that the multi-source search finds the same nodes as searching each pair"""
+        for seed in range(5):
+            graph = make_random_graph(60, 90, seed, make_data=make_increases)
+            nodes = random.Random(seed).sample(graph.nodes(), 8)
+
+            self.assertEqual(get_nodes_in_all_shortest_paths_by_pairs(graph, nodes),
+                             get_nodes_in_all_shortest_paths(graph, nodes))
+
+    def test_ties(self):
+        graph = BELGraph()
+        graph.add_edges_from([(1, 2), (1, 3), (2, 4), (3, 4), (4, 5), (1, 6), (6, 7), (7, 5)])
+
+        self.assertEqual({1, 2, 3, 4, 5, 6, 7}, get_nodes_in_all_shortest_paths(graph, [1, 5]))
+        self.assertEqual({1, 2, 3, 4}, get_nodes_in_all_shortest_paths(graph, [1, 4]))
+
+    def test_unreachable(self):
+        graph = BELGraph()
+        graph.add_edges_from([(1, 2), (2, 3), (4, 5)])
+
+        self.assertEqual({1, 2, 3, 4}, get_nodes_in_all_shortest_paths(graph, [1, 3, 4]))
+        self.assertEqual({1, 2, 3}, get_nodes_in_all_shortest_paths(graph, [1, 3, 'missing']))
+
+    def test_weighted(self):
+        graph = BELGraph()
+        graph.add_edge(1, 2, weight=1)
+        graph.add_edge(2, 3, weight=1)
+        graph.add_edge(1, 3, weight=5)
+        graph.add_node(4)
+
+        self.assertEqual({1, 2, 3, 4}, get_nodes_in_all_shortest_paths(graph, [1, 3, 4], weight='weight'))
+        self.assertEqual({1, 3, 4}, get_nodes_in_all_shortest_paths(graph, [1, 3, 4]))
+
+    def test_processes(self):
+        graph = make_random_graph(60, 90, 0, make_data=make_increases)
+        nodes = random.Random(0).sample(graph.nodes(), 8)
+
+        self.assertEqual(get_nodes_in_all_shortest_paths(graph, nodes),
+                         get_nodes_in_all_shortest_paths(graph, nodes, n_jobs=2))
+
+
+def get_shortest_paths_between_subgraphs_by_pairs(graph, a, b):
+    """Gets all minimal paths between the subgraphs by searching each pair of nodes separately"""
+    paths = []
+
+    for u, v in itt.chain(itt.product(a, b), itt.product(b, a)):
+        try:
+            paths.extend(nx.all_shortest_paths(graph, u, v))
+        except nx.NetworkXNoPath:
+            continue
+
+    min_len = min(map(len, paths))
+    return {tuple(path) for path in paths if len(path) == min_len}
+
+
+class TestShortestPathsBetweenSubgraphs(unittest.TestCase):
+    def test_random(self):
+        """Checks that the super-source search finds the same minimal paths as searching each pair"""
+        for seed in range(5):
+            graph = make_random_graph(60, 90, seed, make_data=make_increases)
+            nodes = random.Random(seed).sample(graph.nodes(), 8)
+            a, b = graph.subgraph(nodes[:4]), graph.subgraph(nodes[4:])
+
+            for undirected, function in ((False, get_shortest_directed_path_between_subgraphs),
+                                         (True, get_shortest_undirected_path_between_subgraphs)):
+                expected = get_shortest_paths_between_subgraphs_by_pairs(
+                    graph.to_undirected() if undirected else graph, a, b)
+
+                self.assertEqual(expected, {tuple(path) for path in function(graph, a, b, all_paths=True)})
+
+                paths = function(graph, a, b)
+                self.assertLessEqual({tuple(path) for path in paths}, expected)
+                self.assertTrue(paths)
+
+    def test_directions(self):
+        graph = BELGraph()
+        graph.add_edges_from([(1, 2), (2, 3), (4, 3), (5, 4)])
+        a, b = graph.subgraph([1, 5]), graph.subgraph([3])
+
+        self.assertEqual(1, len(get_shortest_directed_path_between_subgraphs(graph, a, b)))
+        self.assertEqual([[1, 2, 3], [5, 4, 3]],
+                         sorted(get_shortest_directed_path_between_subgraphs(graph, a, b, all_paths=True)))
+        self.assertEqual([[3, 2, 1], [3, 4, 5]],
+                         sorted(get_shortest_paths_between_node_sets(graph, [3], [1, 5], undirected=True)))
+        self.assertEqual([], get_shortest_paths_between_node_sets(graph, [3], [1, 5]))
+
+    def test_all_paths(self):
+        graph = BELGraph()
+        graph.add_edges_from([(1, 2), (1, 3), (2, 4), (3, 4)])
+
+        self.assertEqual(1, len(get_shortest_paths_between_node_sets(graph, [1], [4])))
+        self.assertEqual([[1, 2, 4], [1, 3, 4]],
+                         sorted(get_shortest_paths_between_node_sets(graph, [1], [4], all_paths=True)))
+
+
+class TestSimplePaths(unittest.TestCase):
+    def test_same_as_networkx(self):
+        for seed in range(5):
+            graph = make_random_graph(20, 45, seed, make_data=make_increases)
+            undirected_graph = graph.to_undirected()
+            adjacency = get_undirected_adjacency(graph)
+
+            for cutoff in (1, 3, 5):
+                for source, target in [(0, 1), (2, 7), (5, 19)]:
+                    self.assertEqual(
+                        {tuple(path) for path in nx.all_simple_paths(graph, source, target, cutoff=cutoff)},
+                        {tuple(path) for path in iter_simple_paths(graph.edge, source, target, cutoff=cutoff)},
+                        msg='seed: {}, cutoff: {}'.format(seed, cutoff)
+                    )
+
+                    expected = {
+                        tuple(path)
+                        for path in nx.all_simple_paths(undirected_graph, source, target, cutoff=cutoff)
+                    }
+                    result = list(iter_simple_paths(adjacency, source, target, cutoff=cutoff))
+                    self.assertEqual(expected, set(map(tuple, result)))
+                    self.assertEqual(len(result), len(set(map(tuple, result))), msg='paths should be unique')
+
+    def test_max_paths(self):
+        graph = make_random_graph(20, 80, 0, make_data=make_increases)
+        paths = list(iter_simple_paths(graph.edge, 0, 1, cutoff=6))
+        self.assertLess(10, len(paths))
+
+        self.assertEqual(paths[:10], list(iter_simple_paths(graph.edge, 0, 1, cutoff=6, max_paths=10)))
+        self.assertEqual([], list(iter_simple_paths(graph.edge, 0, 1, cutoff=6, max_paths=0)))
+
+    def test_time_budget(self):
+        """A complete graph on 12 nodes has millions of simple paths between any two nodes"""
+        graph = nx.complete_graph(12, create_using=nx.DiGraph())
+
+        t = time.time()
+        paths = list(iter_simple_paths(graph.edge, 0, 1, time_budget=0.1))
+        self.assertLess(time.time() - t, 2)
+        self.assertLess(0, len(paths))
+
+    def test_ranked(self):
+        graph = BELGraph()
+        graph.add_edge(1, 2, **{RELATION: DIRECTLY_INCREASES})
+        graph.add_edge(2, 4, **{RELATION: DIRECTLY_INCREASES})
+        graph.add_edge(1, 3, **{RELATION: ASSOCIATION})
+        graph.add_edge(3, 4, **{RELATION: ASSOCIATION})
+        graph.add_edge(5, 4, **{RELATION: INCREASES})
+        graph.add_edge(1, 5, **{RELATION: INCREASES})
+
+        self.assertEqual([[1, 2, 4], [1, 5, 4], [1, 3, 4]], get_ranked_paths(graph, 1, 4))
+        self.assertEqual([[1, 2, 4]], get_ranked_paths(graph, 1, 4, max_paths=1))
+        self.assertEqual([], get_ranked_paths(graph, 4, 1))
+        self.assertEqual([[4, 2, 1], [4, 5, 1], [4, 3, 1]], get_ranked_paths(graph, 4, 1, undirected=True))
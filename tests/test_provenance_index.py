@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import unittest
+
+from pybel import BELGraph
+from pybel.constants import *
+from pybel_tools.selection import get_subgraph_by_authors, get_subgraph_by_provenance_helper, get_subgraph_by_pubmed
+from pybel_tools.summary import PrefixIndex, ProvenanceIndex
+
+HGNC = 'HGNC'
+
+a = PROTEIN, HGNC, 'A'
+b = PROTEIN, HGNC, 'B'
+c = PROTEIN, HGNC, 'C'
+d = PROTEIN, HGNC, 'D'
+
+
+def build_graph():
+    graph = BELGraph()
+
+    for node in (a, b, c, d):
+        graph.add_simple_node(*node)
+
+    for u, v, pmid, authors in (
+            (a, b, '1234', ['Hoyt, Charles', 'Konotopez, Andrej']),
+            (a, b, '1235', ['Hoyt, Charles']),
+            (b, c, '2345', ['Domingo-Fernandez, Daniel']),
+            (c, d, '1234', ['Hoyt, Charles', 'Konotopez, Andrej']),
+    ):
+        graph.add_edge(u, v, attr_dict={
+            RELATION: INCREASES,
+            CITATION: {
+                CITATION_TYPE: CITATION_TYPE_PUBMED,
+                CITATION_NAME: 'Paper {}'.format(pmid),
+                CITATION_REFERENCE: pmid,
+                CITATION_AUTHORS: authors,
+            },
+            EVIDENCE: 'Evidence from {}'.format(pmid),
+        })
+
+    graph.add_edge(a, d, attr_dict={RELATION: ASSOCIATION})
+
+    return graph
+
+
+def edge_set(graph):
+    return {(u, v, k) for u, v, k in graph.edges_iter(keys=True)}
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def test_search(self):
+        index = PrefixIndex(['1234', '1235', '2345'])
+
+        self.assertEqual(['1234', '1235'], index.search('123'))
+        self.assertEqual(['1234'], index.search('123', limit=1))
+        self.assertEqual([], index.search('9'))
+
+        index.add('1230')
+
+        self.assertEqual(['1230', '1234', '1235'], index.search('123'))
+        self.assertEqual(4, len(index))
+
+    def test_words(self):
+        index = PrefixIndex(['Hoyt, Charles', 'Domingo-Fernandez, Daniel', 'Konotopez, Andrej'], words=True)
+
+        self.assertEqual(['Hoyt, Charles'], index.search('hoyt'))
+        self.assertEqual(['Hoyt, Charles'], index.search('Char'))
+        self.assertEqual(['Domingo-Fernandez, Daniel'], index.search('fern'))
+        self.assertEqual(['Domingo-Fernandez, Daniel'], index.search('d'))  # found once by both words
+        self.assertEqual([], index.search('oyt'))
+
+    def test_threads(self):
+        """Checks that strings added while another thread searches aren't lost"""
+        index = PrefixIndex()
+        values = [str(i) for i in range(20000)]
+
+        writer = threading.Thread(target=lambda: [index.add(value) for value in values])
+        writer.start()
+        while writer.is_alive():
+            index.search('1')
+        writer.join()
+
+        self.assertEqual(sorted(values), index.search(''))
+        self.assertEqual(len(index._keys), len(index._key_values))
+
+
+class TestProvenanceIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph = build_graph()
+        self.index = ProvenanceIndex.from_graph(self.graph)
+
+    def test_pubmed(self):
+        for pmids in ('1234', ['1235', '2345'], ['9999']):
+            self.assertEqual(
+                edge_set(get_subgraph_by_pubmed(self.graph, pmids)),
+                edge_set(get_subgraph_by_pubmed(self.graph, pmids, provenance_index=self.index))
+            )
+
+    def test_authors(self):
+        for authors in ('Hoyt, Charles', ['Konotopez, Andrej', 'Domingo-Fernandez, Daniel'], ['Nobody']):
+            self.assertEqual(
+                edge_set(get_subgraph_by_authors(self.graph, authors)),
+                edge_set(get_subgraph_by_authors(self.graph, authors, provenance_index=self.index))
+            )
+
+    def test_provenance(self):
+        expected = get_subgraph_by_provenance_helper(self.graph, pmids=['2345'], authors=['Konotopez, Andrej'])
+        result = get_subgraph_by_provenance_helper(self.graph, pmids=['2345'], authors=['Konotopez, Andrej'],
+                                                   provenance_index=self.index)
+
+        self.assertEqual(edge_set(expected), edge_set(result))
+        self.assertEqual(set(expected), set(result))
+
+    def test_unparsed_authors(self):
+        index = ProvenanceIndex()
+        index.add('edge', {CITATION_TYPE: CITATION_TYPE_PUBMED, CITATION_REFERENCE: '1', CITATION_AUTHORS: 'A|B'})
+
+        self.assertEqual({'edge'}, index.get_author_edges('B'))
+        self.assertEqual({'edge'}, index.get_pmid_edges('1'))
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+
+from pybel import BELGraph
+from pybel.constants import CITATION, CITATION_AUTHORS
+from pybel_tools.query_cache import QueryCache, make_query_key
+
+
+def build_graph(number_edges):
+    graph = BELGraph()
+    for i in range(number_edges):
+        graph.add_edge(i, i + 1)
+    return graph
+
+
+class TestQueryKey(unittest.TestCase):
+    def test_order(self):
+        self.assertEqual(
+            make_query_key(1, 'neighbor', [3, 1, 2], expand_nodes=[5, 4], annotations={'A': ['b', 'a'], 'C': ['d']}),
+            make_query_key(1, 'neighbor', [1, 2, 3], expand_nodes=[4, 5], annotations={'C': ['d'], 'A': ['a', 'b']}),
+        )
+
+    def test_empty(self):
+        self.assertEqual(make_query_key(1), make_query_key(1, seed_data=[], expand_nodes=[], annotations={}))
+
+    def test_different(self):
+        self.assertNotEqual(make_query_key(1, 'neighbor', [1]), make_query_key(2, 'neighbor', [1]))
+        self.assertNotEqual(make_query_key(1, 'neighbor', [1]), make_query_key(1, 'upstream', [1]))
+        self.assertNotEqual(make_query_key(1, 'neighbor', [1]), make_query_key(1, 'neighbor', [1], remove_nodes=[1]))
+
+    def test_provenance(self):
+        self.assertEqual(
+            make_query_key(1, 'pubmed', {'pmids': ['2', '1'], 'authors': ['X']}),
+            make_query_key(1, 'pubmed', {'authors': ['X'], 'pmids': ['1', '2']}),
+        )
+
+
+class TestQueryCache(unittest.TestCase):
+    def test_copy(self):
+        cache = QueryCache()
+        cache.set('a', 1, build_graph(3))
+
+        result = cache.get('a')
+        result.remove_node(0)
+
+        self.assertEqual(3, cache.get('a').number_of_edges())
+        self.assertEqual(2, cache.hits)
+
+    def test_copy_data(self):
+        graph = build_graph(1)
+        graph.add_edge(1, 2, attr_dict={CITATION: {CITATION_AUTHORS: ['X', 'Y']}})
+
+        cache = QueryCache()
+        cache.set('a', 1, graph)
+        graph.edge[1][2][0][CITATION][CITATION_AUTHORS].append('Z')
+
+        result = cache.get('a')
+        result.edge[1][2][0][CITATION][CITATION_AUTHORS] = 'X|Y'
+        result.node[1]['test'] = True
+
+        result = cache.get('a')
+        self.assertEqual(['X', 'Y'], result.edge[1][2][0][CITATION][CITATION_AUTHORS])
+        self.assertNotIn('test', result.node[1])
+
+    def test_evict(self):
+        cache = QueryCache(max_edges=10)
+        cache.set('a', 1, build_graph(4))
+        cache.set('b', 1, build_graph(4))
+        cache.get('a')
+        cache.set('c', 2, build_graph(4))
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(8, cache.number_of_edges())
+
+    def test_too_big(self):
+        cache = QueryCache(max_edges=2)
+        cache.set('a', 1, build_graph(3))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, cache.number_of_edges())
+
+    def test_ttl(self):
+        cache = QueryCache(ttl=0.01)
+        cache.set('a', 1, build_graph(1))
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
+
+    def test_invalidate(self):
+        cache = QueryCache()
+        cache.set('a', 1, build_graph(1))
+        cache.set('b', 2, build_graph(1))
+        cache.set('universe', None, build_graph(1))
+
+        cache.invalidate(1)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('b'))
+        self.assertIsNone(cache.get('universe'))
+
+    def test_undirected_adjacency(self):
+        cache = QueryCache()
+        self.assertIsNone(cache.get_undirected_adjacency('a'))
+
+        cache.set('a', 1, build_graph(2))
+        adjacency = cache.get_undirected_adjacency('a')
+
+        self.assertEqual({0: {1}, 1: {0, 2}, 2: {1}}, adjacency)
+        self.assertIs(adjacency, cache.get_undirected_adjacency('a'))
+
+        cache.set('a', 1, build_graph(1))
+        self.assertEqual({0: {1}, 1: {0}}, cache.get_undirected_adjacency('a'))
+
+        cache.invalidate(1)
+        self.assertIsNone(cache.get_undirected_adjacency('a'))
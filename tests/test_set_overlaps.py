@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import itertools as itt
+import random
+import unittest
+
+from pybel import BELGraph
+from pybel.constants import *
+
+from pybel_tools.summary import calculate_subgraph_edge_overlap, summarize_subgraph_edge_overlap
+from pybel_tools.utils import (
+    calculate_global_tanimoto_set_distances, calculate_set_overlaps, calculate_tanimoto_set_distances,
+    get_set_incidence_matrix, tanimoto_set_similarity,
+)
+
+
+def make_sets(number_sets, number_elements, seed):
+    rng = random.Random(seed)
+    return {
+        'set{}'.format(i): {rng.randrange(number_elements) for _ in range(rng.randrange(number_elements))}
+        for i in range(number_sets)
+    }
+
+
+class TestSetOverlaps(unittest.TestCase):
+    def setUp(self):
+        self.sets = make_sets(12, 30, 0)
+        self.sets['empty'] = set()
+
+    def test_incidence_matrix(self):
+        labels, elements, matrix = get_set_incidence_matrix({'a': [1, 2, 2], 'b': [2, 3]})
+
+        self.assertEqual(['a', 'b'], labels)
+        self.assertEqual([1, 2, 3], elements)
+        self.assertEqual([[1, 1, 0], [0, 1, 1]], matrix.toarray().tolist())
+
+    def test_overlaps(self):
+        intersections, unions = calculate_set_overlaps(self.sets)
+
+        self.assertEqual(list(self.sets), list(intersections.index))
+        self.assertEqual(list(self.sets), list(unions.columns))
+
+        for x, y in itt.product(self.sets, repeat=2):
+            self.assertEqual(len(self.sets[x] & self.sets[y]), intersections.loc[x, y])
+            self.assertEqual(len(self.sets[x] | self.sets[y]), unions.loc[x, y])
+
+    def test_tanimoto(self):
+        result = calculate_tanimoto_set_distances(self.sets)
+
+        for x, y in itt.combinations(self.sets, 2):
+            self.assertAlmostEqual(tanimoto_set_similarity(self.sets[x], self.sets[y]), result.loc[x, y])
+            self.assertEqual(result.loc[x, y], result.loc[y, x])
+
+        for x in self.sets:
+            self.assertEqual(1.0, result.loc[x, x])
+
+    def test_global_tanimoto(self):
+        result = calculate_global_tanimoto_set_distances(self.sets)
+        universe_size = len(set(itt.chain.from_iterable(self.sets.values())))
+
+        for x, y in itt.product(self.sets, repeat=2):
+            self.assertAlmostEqual(1.0 - len(self.sets[x] | self.sets[y]) / universe_size, result.loc[x, y])
+
+    def test_empty(self):
+        self.assertEqual((0, 0), calculate_tanimoto_set_distances({}).shape)
+        self.assertEqual([[1.0]], calculate_global_tanimoto_set_distances({'a': set()}).values.tolist())
+
+
+class TestSubgraphEdgeOverlap(unittest.TestCase):
+    def test_overlap(self):
+        graph = BELGraph()
+        a, b, c, d = [(PROTEIN, 'HGNC', name) for name in 'ABCD']
+        for node in (a, b, c, d):
+            graph.add_simple_node(*node)
+
+        graph.add_edge(a, b, attr_dict={RELATION: INCREASES, ANNOTATIONS: {'Subgraph': 'X'}})
+        graph.add_edge(a, b, attr_dict={RELATION: INCREASES, ANNOTATIONS: {'Subgraph': 'Y'}})
+        graph.add_edge(b, c, attr_dict={RELATION: INCREASES, ANNOTATIONS: {'Subgraph': 'X'}})
+        graph.add_edge(c, d, attr_dict={RELATION: INCREASES, ANNOTATIONS: {'Subgraph': 'Y'}})
+        graph.add_edge(a, d, attr_dict={RELATION: INCREASES})
+
+        sg2edge, intersections, unions, similarities = calculate_subgraph_edge_overlap(graph)
+
+        self.assertEqual({'X': {(a, b), (b, c)}, 'Y': {(a, b), (c, d)}}, dict(sg2edge))
+        self.assertEqual(1, intersections.loc['X', 'Y'])
+        self.assertEqual(3, unions.loc['X', 'Y'])
+        self.assertAlmostEqual(1 / 3, similarities.loc['X', 'Y'])
+        self.assertEqual(1.0, similarities.loc['X', 'X'])
+        self.assertTrue(similarities.equals(summarize_subgraph_edge_overlap(graph)))
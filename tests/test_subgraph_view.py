@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+from collections import Counter
+
+from pybel.constants import *
+from pybel_tools.filters.node_deletion import remove_nodes_by_function
+from pybel_tools.mutation import expand_node_neighborhood
+from pybel_tools.mutation.utils import remove_isolated_nodes
+from pybel_tools.selection import SubgraphView, get_subgraph, get_subgraph_by_data, get_subgraph_by_induction, \
+    get_subgraph_by_neighborhood
+from pybel_tools.selection.induce_subgraph import SEED_TYPE_INDUCTION, SEED_TYPE_NEIGHBORS
+from tests.constants import make_random_graph
+
+FUNCTIONS = [PROTEIN, PROTEIN, RNA, PATHOLOGY]
+RELATIONS = [INCREASES, DECREASES, ASSOCIATION]
+
+
+def make_node(i, rng):
+    return rng.choice(FUNCTIONS), 'HGNC', str(i)
+
+
+def make_data(rng):
+    return {
+        RELATION: rng.choice(RELATIONS),
+        EVIDENCE: str(rng.random()),
+        ANNOTATIONS: {'Species': rng.choice(['9606', '10090'])},
+    }
+
+
+def get_subgraph_materialized(graph, seed_method=None, seed_data=None, expand_nodes=None, remove_nodes=None,
+                              filter_pathologies=False, **annotations):
+    """The original implementation of :func:`get_subgraph` for the seeds handled by views"""
+    if seed_method == SEED_TYPE_INDUCTION:
+        result = get_subgraph_by_induction(graph, seed_data)
+    elif seed_method == SEED_TYPE_NEIGHBORS:
+        result = get_subgraph_by_neighborhood(graph, seed_data)
+    else:
+        result = graph.copy()
+
+    if annotations:
+        result = get_subgraph_by_data(result, {ANNOTATIONS: annotations})
+
+    for node in expand_nodes or []:
+        expand_node_neighborhood(graph, result, node)
+
+    for node in remove_nodes or []:
+        if node in result:
+            result.remove_node(node)
+
+    if filter_pathologies:
+        remove_nodes_by_function(result, PATHOLOGY)
+        remove_isolated_nodes(result)
+
+    return result
+
+
+def get_edges(graph):
+    return Counter((u, v, d[EVIDENCE]) for u, v, d in graph.edges_iter(data=True))
+
+
+class TestSubgraphView(unittest.TestCase):
+    def setUp(self):
+        self.graph = make_random_graph(40, 120, 0, make_node=make_node, make_data=make_data)
+        self.nodes = sorted(self.graph.nodes())
+
+    def test_induced(self):
+        view = SubgraphView(self.graph, nodes=self.nodes[:10])
+
+        self.assertIsNone(view.edges)
+        self.assertEqual(get_edges(self.graph.subgraph(self.nodes[:10])), get_edges(view.to_graph()))
+
+    def test_full(self):
+        result = SubgraphView(self.graph).to_graph()
+
+        self.assertEqual(set(self.graph.nodes()), set(result.nodes()))
+        self.assertEqual(get_edges(self.graph), get_edges(result))
+
+        result.node[self.nodes[0]]['test'] = True
+        self.assertNotIn('test', self.graph.node[self.nodes[0]], msg='node data should be copied')
+
+    def test_missing_neighborhood(self):
+        with self.assertRaises(ValueError):
+            SubgraphView.from_neighborhoods(self.graph, [(PROTEIN, 'HGNC', 'missing')])
+
+    def test_same_as_materialized(self):
+        for seed in range(10):
+            graph = make_random_graph(40, 100, seed, make_node=make_node, make_data=make_data)
+            r = random.Random(seed)
+            nodes = sorted(graph.nodes())
+
+            for seed_method in (None, SEED_TYPE_INDUCTION, SEED_TYPE_NEIGHBORS):
+                kwargs = dict(
+                    seed_method=seed_method,
+                    seed_data=r.sample(nodes, 5),
+                    expand_nodes=r.sample(nodes, 2),
+                    remove_nodes=r.sample(nodes, 3),
+                    filter_pathologies=r.choice([True, False]),
+                )
+
+                if r.random() < 0.5:
+                    kwargs['Species'] = '9606'
+
+                expected = get_subgraph_materialized(graph, **kwargs)
+                result = get_subgraph(graph, **kwargs)
+
+                msg = 'seed {}: {}'.format(seed, kwargs)
+                self.assertEqual(set(expected.nodes()), set(result.nodes()), msg=msg)
+                self.assertEqual(get_edges(expected), get_edges(result), msg=msg)
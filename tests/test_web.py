@@ -1,9 +1,17 @@
 import os
 import tempfile
 import unittest
+from unittest import mock
 
-from pybel.constants import PYBEL_CONNECTION
+import flask
+
+from pybel import BELGraph
+from pybel.constants import *
+from pybel_tools.analysis.mechanism_cache import MechanismCache
+from pybel_tools.api import DatabaseService
 from pybel_tools.web.application import create_application
+from pybel_tools.web.extension import _FlaskPybelState
+from pybel_tools.web.main_service import build_api_admin
 from pybel_tools.web.security import build_security_service
 
 TEST_USER_USERNAME = 'test@example.com'
@@ -52,5 +60,53 @@ class WebTest(unittest.TestCase):
         self.login(TEST_USER_USERNAME, TEST_USER_PASSWORD)
 
 
+def build_network(name, node_name):
+    graph = BELGraph()
+    graph.graph[GRAPH_METADATA] = {METADATA_NAME: name, METADATA_VERSION: '1.0.0'}
+
+    u, v = (PROTEIN, 'HGNC', 'A'), (PROTEIN, 'HGNC', node_name)
+    graph.add_simple_node(*u)
+    graph.add_simple_node(*v)
+    graph.add_edge(u, v, **{RELATION: INCREASES})
+
+    return graph
+
+
+class TestAdmin(unittest.TestCase):
+    """Calls the admin views without logging in, by going around their role checks"""
+
+    def setUp(self):
+        self.api = DatabaseService(manager=None)
+        self.api.add_network(1, build_network('first', 'B'))
+        self.api.add_network(2, build_network('second', 'C'))
+
+        self.manager = mock.Mock()
+        self.mechanism_cache = mock.Mock(spec=MechanismCache)
+
+        self.app = flask.Flask(__name__)
+        self.app.extensions['pybel'] = _FlaskPybelState(self.manager, mechanism_cache=self.mechanism_cache,
+                                                        api=self.api)
+        build_api_admin(self.app)
+
+    def call(self, endpoint, **kwargs):
+        with self.app.test_request_context():
+            return self.app.view_functions[endpoint].__wrapped__(**kwargs)
+
+    def test_drop_graph(self):
+        self.call('drop_graph', network_id=1)
+
+        self.manager.drop_graph.assert_called_once_with(1)
+        self.mechanism_cache.invalidate.assert_called_once_with(1)
+        self.assertNotIn(1, self.api.store)
+        self.assertIn(2, self.api.store)
+
+    def test_drop_graphs(self):
+        self.call('drop_graphs')
+
+        self.manager.drop_graphs.assert_called_once_with()
+        self.mechanism_cache.clear.assert_called_once_with()
+        self.assertEqual(0, self.api.universe.number_of_nodes())
+
+
 if __name__ == '__main__':
     unittest.main()